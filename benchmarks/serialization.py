@@ -0,0 +1,106 @@
+"""
+Rows/sec of turning fetched rows into a list response body, with the default
+validated path and with the trusted fast path (Config.fast_path):
+
+    python -m benchmarks.serialization --rows 1000 --repeat 50
+
+The default path validates every row into the entity, lets FastAPI validate
+the page again for the response model and renders it with JSONResponse. The
+fast path constructs the entities without validation and serializes the page
+straight to JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable
+
+from dyapi import Config, ConfigField
+from dyapi.entities.pagination import PaginationContainer, PaginationEntity
+from dyapi.implementations.builders.endpoint import json_response
+from dyapi.implementations.builders.model import ModelBuilder
+from dyapi.implementations.storages.rows import row_mapper
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+config = Config(
+    name="bench_serialization",
+    api_tags=[],
+    fields=[
+        ConfigField(name="id", type=int, location="path"),
+        ConfigField(name="name", type=str),
+        ConfigField(name="price", type=float),
+        ConfigField(name="stock", type=int),
+    ],
+)
+
+
+def measure(
+    rows: int, repeat: int, render: Callable[[list[Any]], Awaitable[bytes]]
+) -> float:
+    page = [(i, f"name {i}", i / 100, i % 7) for i in range(rows)]
+
+    async def run() -> float:
+        await render(page)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            await render(page)
+        return rows * repeat / (time.perf_counter() - started)
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    entity = ModelBuilder(config).entity
+    container = PaginationContainer[entity]  # type: ignore
+    field = create_response_field(name="response", type_=container)
+    pagination = PaginationEntity(offset=0, limit=args.rows)
+
+    async def validated(rows: list[Any]) -> bytes:
+        mapper = row_mapper(entity)
+        page = PaginationContainer.page(
+            data=[mapper(row) for row in rows],
+            total=len(rows),
+            pagination=pagination,
+            keys=["id"],
+        )
+        content = await serialize_response(field=field, response_content=page)
+        return JSONResponse(content).body
+
+    async def trusted(rows: list[Any]) -> bytes:
+        mapper = row_mapper(entity, True)
+        page = container.page(
+            data=[mapper(row) for row in rows],
+            total=len(rows),
+            pagination=pagination,
+            keys=["id"],
+        )
+        return json_response(page).body
+
+    assert json.loads(asyncio.run(validated([(1, "a", 1.0, 1)]))) == json.loads(
+        asyncio.run(trusted([(1, "a", 1.0, 1)]))
+    )
+    before = measure(args.rows, args.repeat, validated)
+    after = measure(args.rows, args.repeat, trusted)
+    print(
+        json.dumps(
+            {
+                "rows": args.rows,
+                "validated_rows_per_sec": before,
+                "fast_path_rows_per_sec": after,
+                "speedup": after / before,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Startup time and memory of an API with many resources, per build mode:
+
+    python -m benchmarks.startup --configs 1000
+
+Every mode runs in a fresh interpreter, so the RSS it reports only contains
+that mode's API. The time of the first request to a resource includes
+building it in the lazy modes.
+
+The "cold" and "warm" modes boot lazily with an OpenAPI snapshot, which the
+cold boot has to write and the warm one loads, so the time of the first
+request to /openapi.json compares generating the document with loading it.
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from dyapi import APIBuilder
+from dyapi.implementations.builders.model import ModelBuilder, SharedModelBuilder
+from fastapi import FastAPI
+
+from .suite import NoopStorageManager, build_configs
+
+MODES = {
+    "eager": {"lazy": False, "model_builder": ModelBuilder},
+    "shared": {"lazy": False, "model_builder": SharedModelBuilder},
+    "lazy": {"lazy": True, "model_builder": ModelBuilder},
+    "lazy_shared": {"lazy": True, "model_builder": SharedModelBuilder},
+    "cold": {"lazy": True, "model_builder": ModelBuilder},
+    "warm": {"lazy": True, "model_builder": ModelBuilder},
+}
+
+
+def rss() -> int:
+    """
+    Resident memory of the process in bytes.
+    """
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize()
+
+
+def measure(mode: str, count: int, snapshot: Path | None) -> dict[str, float]:
+    configs = build_configs(count)
+    before = rss()
+    started = time.perf_counter()
+    app = FastAPI()
+    api_builder = APIBuilder(
+        configs=configs,
+        storage_manager=NoopStorageManager(),
+        snapshot=snapshot,
+        **MODES[mode],
+    )
+    app.include_router(api_builder.router)
+    if api_builder.lazy or snapshot is not None:
+        api_builder.extend_openapi(app)
+    startup = time.perf_counter() - started
+    memory = rss() - before
+
+    first, second, openapi = asyncio.run(request(app))
+    return {
+        "startup": startup,
+        "rss_mb": memory / 2**20,
+        "first_request": first,
+        "next_request": second,
+        "openapi": openapi,
+    }
+
+
+async def request(app: FastAPI) -> tuple[float, ...]:
+    """
+    Times two requests to a resource, then one to the OpenAPI document.
+    """
+    transport = httpx.ASGITransport(app=app)  # type: ignore
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        timings = []
+        for url in ["/resource0/1", "/resource0/1", "/openapi.json"]:
+            started = time.perf_counter()
+            response = await client.get(url)
+            response.raise_for_status()
+            timings.append(time.perf_counter() - started)
+    return tuple(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--configs", type=int, default=1000)
+    parser.add_argument("--mode", choices=MODES)
+    parser.add_argument("--snapshot", type=Path)
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        print(json.dumps(measure(args.mode, args.configs, args.snapshot)))
+        return
+
+    report = {}
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot = Path(directory) / "openapi.json"
+        for mode in MODES:
+            command = [
+                sys.executable,
+                "-m",
+                "benchmarks.startup",
+                "--configs",
+                str(args.configs),
+                "--mode",
+                mode,
+            ]
+            if mode in ("cold", "warm"):
+                command += ["--snapshot", str(snapshot)]
+            output = subprocess.run(
+                command, check=True, capture_output=True, text=True
+            ).stdout
+            report[mode] = json.loads(output)
+    print(json.dumps({"configs": args.configs, "modes": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
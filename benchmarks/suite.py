@@ -0,0 +1,297 @@
+"""
+Microbenchmarks of building the API and of the per-request overhead of every
+generated CRUD route, compared against the committed baseline:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --update-baseline
+
+Route overhead is measured through an in-process ASGI client against a
+storage that does no work, so it covers routing, validation, the endpoint and
+serialization only.
+
+Exits with status 1 if the median of any benchmark is more than `--tolerance`
+slower than in the baseline. Medians depend on the machine, so the baseline
+should be recorded where the suite is compared, e.g. on CI.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Type
+
+import httpx
+from dyapi import APIBuilder, Config, ConfigField
+from dyapi.entities.pagination import CursorPaginationEntity, PaginationEntity
+from dyapi.implementations.builders.model import SQLAlchemyModelSchemaBuilder
+from dyapi.interfaces.storages import IStorage, IStorageManager
+from fastapi import FastAPI
+from pydantic import BaseModel
+from sqlalchemy import Float, Integer, String
+from sqlalchemy.orm import DeclarativeBase, mapped_column
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+ROW = {"id": 1, "name": "name", "price": 1.0}
+
+
+def build_configs(count: int) -> list[Config]:
+    return [
+        Config(
+            name=f"resource{i}",
+            api_tags=[],
+            fields=[
+                ConfigField(name="id", type=int, location="path"),
+                ConfigField(name="name", type=str),
+                ConfigField(name="price", type=float),
+            ],
+        )
+        for i in range(count)
+    ]
+
+
+class NoopStorage(IStorage):
+    """
+    Answers every call with the same entity without doing any work.
+    """
+
+    def __init__(self) -> None:
+        self.entities: dict[Type[BaseModel], BaseModel] = {}
+
+    def entity(self, response_model: Type[BaseModel]) -> BaseModel:
+        entity = self.entities.get(response_model)
+        if entity is None:
+            entity = self.entities[response_model] = response_model(**ROW)
+        return entity
+
+    async def get(
+        self, filter_: BaseModel, response_model: Type[BaseModel]
+    ) -> BaseModel:
+        return self.entity(response_model)
+
+    async def get_many(
+        self, filters: list[BaseModel], response_model: Type[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        return [self.entity(response_model) for _ in filters], []
+
+    async def create(self, entity: BaseModel) -> BaseModel:
+        return entity
+
+    async def update(
+        self, filter_: BaseModel, entity: BaseModel, response_model: Type[BaseModel]
+    ) -> BaseModel:
+        return self.entity(response_model)
+
+    async def delete(self, filter_: BaseModel) -> bool:
+        return True
+
+    async def create_many(
+        self, entities: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        return entities, []
+
+    async def upsert_many(self, entities: list[BaseModel]) -> list[BaseModel]:
+        return entities
+
+    async def delete_many(
+        self, filters: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        return filters, []
+
+    async def list(
+        self,
+        filter_: BaseModel,
+        pagination: PaginationEntity | CursorPaginationEntity,
+        response_model: Type[BaseModel],
+    ) -> tuple[list[BaseModel], int | None]:
+        return [self.entity(response_model)] * 10, 10
+
+    async def stream(
+        self, filter_: BaseModel, response_model: Type[BaseModel]
+    ) -> AsyncIterator[Any]:
+        for _ in range(10):
+            yield self.entity(response_model)
+
+
+class NoopStorageManager(IStorageManager):
+    def storage(self, config: Config) -> IStorage:
+        return NoopStorage()
+
+
+def sample(run: Callable[[], Any], repeat: int, warmup: bool = True) -> list[float]:
+    if warmup:
+        run()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def sample_async(run: Callable[[], Awaitable[Any]], repeat: int) -> list[float]:
+    await run()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "runs": len(timings),
+    }
+
+
+def bench_router(count: int, repeat: int) -> list[float]:
+    configs = build_configs(count)
+    return sample(
+        lambda: APIBuilder(
+            configs=configs, storage_manager=NoopStorageManager()
+        ).router,
+        repeat,
+        # Every run builds a new API, a large one takes seconds.
+        warmup=False,
+    )
+
+
+def bench_schema(repeat: int) -> list[float]:
+    def run() -> None:
+        class Base(DeclarativeBase):
+            pass
+
+        model = type(
+            "Item",
+            (Base,),
+            {
+                "__tablename__": "items",
+                "id": mapped_column(Integer, primary_key=True),
+                "name": mapped_column(String),
+                "price": mapped_column(Float, nullable=True),
+                "stock": mapped_column(Integer, nullable=True),
+            },
+        )
+        builder = SQLAlchemyModelSchemaBuilder(model=model)
+        builder.base, builder.path, builder.filter, builder.update
+
+    return sample(run, repeat)
+
+
+ROUTES: list[tuple[str, str, str, Any]] = [
+    ("create", "POST", "/resource0/", ROW),
+    ("list", "GET", "/resource0/", None),
+    ("export", "GET", "/resource0/_export", None),
+    ("get", "GET", "/resource0/1", None),
+    ("update", "PUT", "/resource0/1", {"name": "other", "price": 2.0}),
+    ("delete", "DELETE", "/resource0/1", None),
+    ("create_many", "POST", "/resource0/create_many", [ROW] * 10),
+    ("upsert_many", "POST", "/resource0/upsert_many", [ROW] * 10),
+    ("delete_many", "POST", "/resource0/delete_many", [{"id": 1}] * 10),
+    ("get_many", "POST", "/resource0/get_many", [{"id": 1}] * 10),
+]
+
+
+async def bench_routes(repeat: int) -> dict[str, list[float]]:
+    app = FastAPI()
+    app.include_router(
+        APIBuilder(
+            configs=build_configs(1), storage_manager=NoopStorageManager()
+        ).router
+    )
+    results = {}
+    transport = httpx.ASGITransport(app=app)  # type: ignore
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for name, method, url, body in ROUTES:
+
+            async def request() -> None:
+                response = await client.request(method, url, json=body)
+                response.raise_for_status()
+
+            results[name] = await sample_async(request, repeat)
+    return results
+
+
+def run_suite(repeat: int, sizes: list[int]) -> dict[str, dict[str, float]]:
+    results = {}
+    for count in sizes:
+        runs = max(1, repeat // count)
+        results[f"router_build_{count}"] = summarize(bench_router(count, runs))
+    results["schema_build"] = summarize(bench_schema(repeat))
+    for name, timings in asyncio.run(bench_routes(repeat * 10)).items():
+        results[f"request_{name}"] = summarize(timings)
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """
+    Returns a message for every benchmark that ran slower than the baseline
+    allows.
+    """
+    regressions = []
+    for name, expected in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+        ratio = current["median"] / expected["median"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{name}: median {current['median'] * 1e6:.1f}us is "
+                f"{ratio:.2f}x the baseline {expected['median'] * 1e6:.1f}us"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[10, 100, 1000],
+        help="numbers of configs to build the router for",
+    )
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": run_suite(args.repeat, args.sizes),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    print(text)
+
+    if args.update_baseline:
+        args.baseline.write_text(text + "\n")
+        return
+    if not args.baseline.exists():
+        return
+    baseline = json.loads(args.baseline.read_text())["benchmarks"]
+    regressions = compare(report["benchmarks"], baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from .entities.config import Config, ConfigField
 from .implementations.builders.api import APIBuilder
 from .implementations.builders.crud import SQLAlchemyCRUDBuilder
+from .implementations.storages.memory import MemoryStorageManager
 from .implementations.storages.postgres.manager import (
     PostgresEngineStorageManager,
     PostgresSessionStorageManager,
@@ -10,6 +11,7 @@ __all__ = [
     "Config",
     "ConfigField",
     "APIBuilder",
+    "MemoryStorageManager",
     "PostgresEngineStorageManager",
     "PostgresSessionStorageManager",
     "SQLAlchemyCRUDBuilder",
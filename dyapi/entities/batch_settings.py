@@ -0,0 +1,8 @@
+from pydantic import BaseModel, Field
+
+
+class BatchSettings(BaseModel):
+    # Seconds to wait for more keys, 0 batches the keys requested within
+    # one event loop iteration.
+    window: float = Field(0.0, ge=0)
+    max_size: int = Field(100, ge=1)
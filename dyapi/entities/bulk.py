@@ -0,0 +1,12 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T", bound=BaseModel)
+K = TypeVar("K", bound=BaseModel)
+
+
+class BulkContainer(BaseModel, Generic[T, K]):
+    data: list[T]
+    conflicts: list[K] = []
+    missing: list[K] = []
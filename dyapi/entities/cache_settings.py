@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+
+
+class CacheSettings(BaseModel):
+    maxsize: int = Field(10_000, ge=1)
+    ttl: float = Field(60.0, gt=0)
@@ -1,23 +1,94 @@
 from typing import Any, Literal, Type
 
-from pydantic import BaseModel
+from dyapi.entities.batch_settings import BatchSettings
+from dyapi.entities.cache_settings import CacheSettings
+from dyapi.entities.index_settings import IndexMethod, IndexSettings
+from pydantic import BaseModel, Field, model_validator
+
+CountStrategyName = Literal["exact", "estimated", "cached", "window", "none"]
+IngestMode = Literal["insert", "copy", "auto"]
+# Filters beyond equality, accepted as `<field>__<operator>` query parameters.
+FilterOperator = Literal["gt", "gte", "lt", "lte", "in", "prefix", "is_null"]
 
 
 class ConfigField(BaseModel):
     name: str
     type: Type[Any]
     location: Literal["path", "body"] = "body"
+    # Body fields that can be filtered on in list and export. Storages may
+    # index them.
+    filterable: bool = False
+    # Shorthand for an index on this field alone.
+    index: IndexMethod | None = None
+    operators: list[FilterOperator] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def validate_operators(self) -> "ConfigField":
+        if "prefix" in self.operators and self.type is not str:
+            raise ValueError("Prefix filters only apply to str fields")
+        return self
 
 
 class Config(BaseModel):
     name: str
     api_tags: list[str]
     fields: list[ConfigField]
+    pagination: Literal["offset", "cursor"] = "offset"
+    count_strategy: CountStrategyName = "exact"
+    count_cache_ttl: float = Field(60.0, gt=0)
+    bulk_chunk_size: int = Field(1000, ge=1)
+    ingest: IngestMode = "insert"
+    copy_threshold: int = Field(10_000, ge=1)
+    cache: CacheSettings | None = None
+    batching: BatchSettings | None = None
+    fast_path: bool = False
+    indexes: list[IndexSettings] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def validate_pagination(self) -> "Config":
+        if self.pagination == "cursor" and not self.path_fields:
+            raise ValueError("Cursor pagination requires at least one path field")
+        return self
+
+    @model_validator(mode="after")
+    def validate_indexes(self) -> "Config":
+        names = {field.name for field in self.fields}
+        for index in self.indexes:
+            unknown = set(index.fields) - names
+            if unknown:
+                raise ValueError(f"Index on unknown fields {sorted(unknown)}")
+        return self
+
+    @property
+    def declared_indexes(self) -> list[IndexSettings]:
+        """
+        The indexes of the config followed by those declared on its fields.
+        """
+        return [
+            *self.indexes,
+            *[
+                IndexSettings(fields=[field.name], method=field.index)
+                for field in self.fields
+                if field.index is not None
+            ],
+        ]
 
     @property
     def path_fields(self) -> list[ConfigField]:
         return [field for field in self.fields if field.location == "path"]
 
+    @property
+    def filter_fields(self) -> list[ConfigField]:
+        return [
+            field
+            for field in self.fields
+            if field.location == "path" or field.filterable
+        ]
+
+    @property
+    def operator_fields(self) -> list[ConfigField]:
+        return [field for field in self.fields if field.operators]
+
     @property
     def body_fields(self) -> list[ConfigField]:
         return [field for field in self.fields if field.location == "body"]
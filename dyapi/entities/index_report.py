@@ -0,0 +1,21 @@
+from dyapi.entities.index_settings import IndexSettings
+from pydantic import BaseModel
+
+
+class FilterShapeReport(BaseModel):
+    """
+    How often and how fast a resource was read filtering on a combination of
+    fields, with what the last sampled plan made of it.
+    """
+
+    resource: str
+    operation: str
+    fields: list[str]
+    count: int
+    mean_seconds: float
+    max_seconds: float
+    # Set once the shape was explained.
+    plan_cost: float | None = None
+    seq_scan: bool | None = None
+    recommendation: IndexSettings | None = None
+    created: str | None = None
@@ -0,0 +1,22 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+IndexMethod = Literal["btree", "hash", "brin"]
+
+
+class IndexSettings(BaseModel):
+    fields: list[str] = Field(min_length=1)
+    # "brin" suits append-only columns correlated with insertion order, such
+    # as creation timestamps.
+    method: IndexMethod = "btree"
+    # SQL predicate of a partial index, e.g. "deleted_at IS NULL". It is
+    # part of the server's definitions and never comes from a request.
+    where: str | None = None
+    name: str | None = None
+
+    @model_validator(mode="after")
+    def validate_method(self) -> "IndexSettings":
+        if self.method == "hash" and len(self.fields) > 1:
+            raise ValueError("Hash indexes cover a single field")
+        return self
@@ -1,16 +1,109 @@
-from typing import Generic, TypeVar
+import base64
+import json
+from typing import Annotated, Any, Generic, Sequence, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, BaseModel, Field, TypeAdapter, ValidationError
+from pydantic_core import to_jsonable_python
 
 T = TypeVar("T", bound=BaseModel)
 
 
+class InvalidCursorError(ValueError):
+    pass
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    if (
+        not isinstance(values, list)
+        or not values
+        or not all(isinstance(value, (str, int, float)) for value in values)
+    ):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def validate_cursor(cursor: str | None) -> str | None:
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except (ValueError, TypeError) as exc:
+            raise ValueError("Invalid cursor") from exc
+    return cursor
+
+
 class PaginationEntity(BaseModel):
     offset: int = Field(0, ge=0)
     limit: int = Field(10, ge=1)
 
 
+class CursorPaginationEntity(BaseModel):
+    # The validator is part of the annotation so FastAPI rejects a malformed
+    # cursor with 422 while resolving the dependency.
+    cursor: Annotated[str | None, AfterValidator(validate_cursor)] = None
+    limit: int = Field(10, ge=1)
+
+    @staticmethod
+    def encode(values: list[Any]) -> str:
+        """
+        Encodes the key values of the last returned row into an opaque cursor.
+        Values JSON has no type for, e.g. UUIDs and datetimes, are encoded as
+        strings, which `key_values` decodes again.
+        """
+        encoded = json.dumps(values, default=to_jsonable_python)
+        return base64.urlsafe_b64encode(encoded.encode()).decode()
+
+    @property
+    def values(self) -> list[Any] | None:
+        return decode_cursor(self.cursor) if self.cursor is not None else None
+
+    def key_values(self, types: Sequence[Any]) -> list[Any] | None:
+        """
+        Returns the cursor's values converted to the types of the key they
+        continue from, or None on the first page.
+
+        :raises InvalidCursorError: if the cursor does not match the key.
+        """
+        values = self.values
+        if values is None:
+            return None
+        key: Any = tuple.__class_getitem__(tuple(types))
+        try:
+            return list(TypeAdapter(key).validate_python(values))
+        except ValidationError as exc:
+            raise InvalidCursorError("Cursor does not match the key") from exc
+
+
 class PaginationContainer(BaseModel, Generic[T]):
-    pagination: PaginationEntity
+    pagination: PaginationEntity | CursorPaginationEntity
     data: list[T]
-    total: int
+    total: int | None
+    has_more: bool = False
+    next_cursor: str | None = None
+
+    @classmethod
+    def page(
+        cls,
+        data: list[Any],
+        total: int | None,
+        pagination: PaginationEntity | CursorPaginationEntity,
+        keys: list[str],
+    ) -> "PaginationContainer[T]":
+        """
+        Trims the extra row fetched by the storage and, in cursor mode, points
+        the next cursor at the last returned row.
+        """
+        has_more = len(data) > pagination.limit
+        next_cursor = None
+        if isinstance(pagination, CursorPaginationEntity) and has_more:
+            last = data[pagination.limit - 1]
+            next_cursor = CursorPaginationEntity.encode(
+                [getattr(last, key) for key in keys]
+            )
+        return cls(
+            data=data[: pagination.limit],
+            total=total,
+            has_more=has_more,
+            pagination=pagination,
+            next_cursor=next_cursor,
+        )
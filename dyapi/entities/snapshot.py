@@ -0,0 +1,20 @@
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class OpenAPIFragment(BaseModel):
+    """
+    The paths and component schemas one resource adds to the OpenAPI
+    document, with the key of the definition they were generated from.
+    """
+
+    key: str
+    paths: dict[str, Any] = Field(default_factory=dict)
+    schemas: dict[str, Any] = Field(default_factory=dict)
+
+
+class Snapshot(BaseModel):
+    version: int
+    environment: str
+    resources: dict[str, OpenAPIFragment] = Field(default_factory=dict)
@@ -0,0 +1,35 @@
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class Span(BaseModel):
+    """
+    A timed step of a request. Times are in seconds from `time.perf_counter`.
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    start: float
+    end: float | None = None
+    attributes: dict[str, Any] = Field(default_factory=dict)
+    error: str | None = None
+    children: list["Span"] = Field(default_factory=list)
+
+    @property
+    def duration(self) -> float | None:
+        return None if self.end is None else self.end - self.start
+
+    def find(self, name: str) -> "Span | None":
+        """
+        Returns the first span with the name in this span's subtree.
+        """
+        if self.name == name:
+            return self
+        for child in self.children:
+            found = child.find(name)
+            if found is not None:
+                return found
+        return None
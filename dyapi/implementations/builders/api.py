@@ -1,19 +1,35 @@
-from functools import cached_property
-from typing import Dict, Type
+from functools import cached_property, partial
+from pathlib import Path
+from typing import Callable, Dict, Literal, Type
 
-from dyapi.entities.config import Config
+from dyapi.entities.config import (
+    Config,
+    CountStrategyName,
+    FilterOperator,
+    IngestMode,
+)
+from dyapi.entities.snapshot import OpenAPIFragment
 from dyapi.implementations.builders.crud import CRUDBuilder, SQLAlchemyCRUDBuilder
 from dyapi.implementations.builders.endpoint import EndpointBuilder
+from dyapi.implementations.builders.lazy import LazyResource, ResourceRoutes, lazy_route
 from dyapi.implementations.builders.model import (
     ModelBuilder,
     SQLAlchemyModelSchemaBuilder,
 )
+from dyapi.implementations.builders.snapshot import (
+    OpenAPIExtension,
+    OpenAPISnapshot,
+    digest,
+)
+from dyapi.implementations.metrics.route import metrics_endpoint
 from dyapi.interfaces.builders.api import IAPIBuilder
 from dyapi.interfaces.builders.crud import ICRUDBuilder
 from dyapi.interfaces.builders.endpoint import IEndpointBuilder
 from dyapi.interfaces.builders.model import IModelBuilder
+from dyapi.interfaces.metrics import IMetrics
 from dyapi.interfaces.storages import IStorageManager
-from fastapi import APIRouter, Depends
+from dyapi.interfaces.tracing import ITracer
+from fastapi import APIRouter, Depends, FastAPI
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
@@ -26,24 +42,66 @@ class APIBuilder(IAPIBuilder):
         crud_builder: Type[ICRUDBuilder] = CRUDBuilder,
         endpoint_builder: Type[IEndpointBuilder] = EndpointBuilder,
         model_builder: Type[IModelBuilder] = ModelBuilder,
+        metrics: IMetrics | None = None,
+        metrics_path: str = "/metrics",
+        tracer: ITracer | None = None,
+        lazy: bool = False,
+        snapshot: str | Path | None = None,
     ):
+        """
+
+        :param metrics: records the duration and errors of each endpoint and
+            is served in the Prometheus text format at metrics_path.
+        :param tracer: traces each request, with spans for its validation,
+            endpoint and serialization.
+        :param lazy: build the models, storage and routes of each resource on
+            the first request to it instead of with the router. Lazy resources
+            are left out of the OpenAPI document, and their tables are only
+            added to the storage manager's metadata once built, so they must
+            already exist.
+            Pass `model_builder=SharedModelBuilder` to also share the models of
+            structurally identical configs, cached per API builder.
+        :param snapshot: file keeping the OpenAPI fragment of each resource,
+            keyed by a hash of its config. The resources are then left out
+            of the document FastAPI generates, `extend_openapi` adds them
+            from the snapshot, generating only missing or outdated fragments.
+        """
         self.configs = configs
         self.storage_manager = storage_manager
         self.crud_builder = crud_builder
         self.endpoint_builder = endpoint_builder
-        self.model_builder = model_builder
+        self.model_builder = model_builder.scoped()
+        self.metrics = metrics
+        self.metrics_path = metrics_path
+        self.tracer = tracer
+        self.lazy = lazy
+        self.snapshot = OpenAPISnapshot(snapshot)
+        self.built: Dict[str, ICRUDBuilder] = {}
+        self.resources = {
+            config.name: LazyResource(partial(self.include, config))
+            for config in configs
+        }
+        self.extensions: list[OpenAPIExtension] = []
 
-    @cached_property
-    def cruds(self) -> Dict[str, ICRUDBuilder]:
-        return {
-            config.name: self.crud_builder(
+    def crud(self, config: Config) -> ICRUDBuilder:
+        """
+        Returns the CRUD builder of the config, creating it on the first call.
+        """
+        crud = self.built.get(config.name)
+        if crud is None:
+            crud = self.built[config.name] = self.crud_builder(
                 config=config,
                 storage_manager=self.storage_manager,
                 endpoint_builder=self.endpoint_builder,
                 model_builder=self.model_builder,
+                metrics=self.metrics,
+                tracer=self.tracer,
             )
-            for config in self.configs
-        }
+        return crud
+
+    @cached_property
+    def cruds(self) -> Dict[str, ICRUDBuilder]:
+        return {config.name: self.crud(config) for config in self.configs}
 
     @cached_property
     def models(self) -> Dict[str, IModelBuilder]:
@@ -51,15 +109,155 @@ class APIBuilder(IAPIBuilder):
             config.name: self.model_builder(config=config) for config in self.configs
         }
 
+    def include(
+        self,
+        config: Config,
+        router: APIRouter | None = None,
+        include_in_schema: bool = True,
+    ) -> APIRouter:
+        """
+        Adds the routes of the resource under its prefix to the router, a new
+        one by default.
+        """
+        if router is None:
+            router = APIRouter()
+        router.include_router(
+            router=self.crud(config).router,
+            prefix=f"/{config.name}",
+            tags=config.api_tags,
+            include_in_schema=include_in_schema,
+        )
+        return router
+
+    def resource_key(self, config: Config) -> str:
+        return digest(
+            self.crud_builder,
+            self.endpoint_builder,
+            self.model_builder,
+            config.model_dump(),
+        )
+
+    def fragment(self, config: Config) -> OpenAPIFragment:
+        return self.snapshot.fragment(
+            config.name, self.resource_key(config), partial(self.include, config)
+        )
+
+    def openapi(self) -> dict[str, OpenAPIFragment]:
+        """
+        Returns the OpenAPI fragment of every resource, from the snapshot when
+        it is up to date. Generating a fragment builds the resource.
+        """
+        fragments = {config.name: self.fragment(config) for config in self.configs}
+        self.snapshot.retain(fragments)
+        self.snapshot.save()
+        return fragments
+
+    def extend_openapi(self, app: FastAPI, prefix: str = "") -> None:
+        """
+        Adds the resources to the app's OpenAPI document. Needed for lazy
+        resources and with a snapshot, which are not in the generated one.
+
+        :param prefix: the prefix the router was included under.
+        """
+        self.extensions.append(OpenAPIExtension(app, self.openapi, prefix))
+
+    def mount(self, app: FastAPI, prefix: str = "") -> None:
+        """
+        Serves the resources from the app through a single route looking
+        them up by name, so `add` and `remove` change the live app. Use it
+        instead of including `router`; the OpenAPI document is extended with
+        the resources.
+        """
+        if not self.lazy:
+            for resource in self.resources.values():
+                resource.load()
+        app.router.routes.append(ResourceRoutes(self.resources, prefix))
+        if self.metrics is not None:
+            app.add_api_route(
+                prefix + self.metrics_path,
+                metrics_endpoint(self.metrics),
+                methods=["GET"],
+                include_in_schema=False,
+            )
+        self.extend_openapi(app, prefix)
+
+    def add(self, config: Config) -> None:
+        """
+        Adds the resource, or replaces the one with the same name, while the
+        app is serving. Only this resource's models, storage and routes are
+        built, before they are swapped in unless the builder is lazy.
+        Requests in flight finish on the previous routes. Only the resource's
+        part of the OpenAPI document is regenerated.
+
+        Added resources are served by apps the builder was mounted into.
+        Replacements also apply to routers of a lazy builder.
+        """
+        build = partial(self.include, config)
+        previous = self.built.pop(config.name, None)
+        # The previous routes keep the models they were built with.
+        self.model_builder.discard(config.name)
+        try:
+            router = None if self.lazy else build()
+        except Exception:
+            # The previous resource keeps serving.
+            if previous is not None:
+                self.built[config.name] = previous
+            raise
+
+        resource = self.resources.get(config.name)
+        if resource is None:
+            self.resources[config.name] = LazyResource(build, router)
+            self.configs = [*self.configs, config]
+        else:
+            resource.swap(build, router)
+            self.configs = [
+                config if item.name == config.name else item for item in self.configs
+            ]
+        self.storage_manager.discard(config.name, keep_latest=router is not None)
+        self.refresh(config.name, partial(self.fragment, config))
+
+    def remove(self, name: str) -> None:
+        """
+        Removes the resource while the app is serving; its paths answer 404
+        once requests in flight finish.
+        """
+        self.resources.pop(name).remove()
+        self.built.pop(name, None)
+        self.model_builder.discard(name)
+        self.storage_manager.discard(name)
+        self.configs = [config for config in self.configs if config.name != name]
+        self.snapshot.discard(name)
+        self.refresh(name, None)
+
+    def refresh(
+        self, name: str, fragment: Callable[[], OpenAPIFragment] | None
+    ) -> None:
+        for attribute in ("cruds", "models"):
+            self.__dict__.pop(attribute, None)
+        for extension in self.extensions:
+            extension.update(name, fragment)
+        self.snapshot.save()
+
     @cached_property
     def router(self) -> APIRouter:
         router = APIRouter()
 
-        for builder in self.cruds.values():
-            router.include_router(
-                router=builder.router,
-                prefix=f"/{builder.config.name}",
-                tags=builder.config.api_tags,
+        for config in self.configs:
+            if self.lazy:
+                router.routes.append(
+                    lazy_route(config.name, self.resources[config.name])
+                )
+            else:
+                self.include(
+                    config, router, include_in_schema=self.snapshot.path is None
+                )
+
+        if self.metrics is not None:
+            router.add_api_route(
+                self.metrics_path,
+                metrics_endpoint(self.metrics),
+                methods=["GET"],
+                include_in_schema=False,
             )
 
         return router
@@ -73,16 +271,47 @@ class ModelAPIBuilder:
         api_prefix: str = "",
         api_tags: list[str] | None = None,
         dependencies: list[Depends] | None = None,
+        pagination: Literal["offset", "cursor"] = "offset",
+        count_strategy: CountStrategyName = "exact",
+        count_cache_ttl: float = 60.0,
+        ingest: IngestMode = "insert",
+        copy_threshold: int = 10_000,
+        fast_path: bool = False,
+        metrics: IMetrics | None = None,
+        tracer: ITracer | None = None,
+        snapshot: str | Path | None = None,
+        filter_operators: dict[str, list[FilterOperator]] | None = None,
     ):
+        """
+
+        :param filter_operators: operator filters list and export accept per
+            column, e.g. {"price": ["gte", "lte"]}.
+        :param snapshot: file keeping the OpenAPI fragment of the model, keyed
+            by a hash of its table. The routes are then left out of the
+            document FastAPI generates, `extend_openapi` adds them from the
+            snapshot.
+        """
         self.model = model
-        self.models = SQLAlchemyModelSchemaBuilder(model=model)
+        self.filter_operators = filter_operators or {}
+        self.models = SQLAlchemyModelSchemaBuilder(
+            model=model, operators=self.filter_operators
+        )
         self.api_prefix = api_prefix
         self.api_tags = api_tags or []
         self.db_session = db_session
         self.dependencies = dependencies or []
+        self.pagination = pagination
+        self.count_strategy = count_strategy
+        self.count_cache_ttl = count_cache_ttl
+        self.ingest = ingest
+        self.copy_threshold = copy_threshold
+        self.fast_path = fast_path
+        self.metrics = metrics
+        self.tracer = tracer
+        self.snapshot = OpenAPISnapshot(snapshot)
 
     @cached_property
-    def router(self) -> APIRouter:
+    def crud_router(self) -> APIRouter:
         return SQLAlchemyCRUDBuilder(
             api_prefix=self.api_prefix,
             api_tags=self.api_tags,
@@ -93,4 +322,54 @@ class ModelAPIBuilder:
             db_model=self.model,
             db_session=self.db_session,
             dependencies=self.dependencies,
+            pagination=self.pagination,
+            count_strategy=self.count_strategy,
+            count_cache_ttl=self.count_cache_ttl,
+            ingest=self.ingest,
+            copy_threshold=self.copy_threshold,
+            fast_path=self.fast_path,
+            metrics=self.metrics,
+            tracer=self.tracer,
         ).router
+
+    @cached_property
+    def router(self) -> APIRouter:
+        if self.snapshot.path is None:
+            return self.crud_router
+        router = APIRouter()
+        router.include_router(self.crud_router, include_in_schema=False)
+        return router
+
+    @property
+    def resource_key(self) -> str:
+        return digest(
+            [
+                (column.name, repr(column.type), column.nullable, column.primary_key)
+                for column in self.model.__table__.columns
+            ],
+            self.api_prefix,
+            self.api_tags,
+            self.pagination,
+            self.fast_path,
+            sorted(self.filter_operators.items()),
+        )
+
+    def openapi(self) -> dict[str, OpenAPIFragment]:
+        """
+        Returns the OpenAPI fragment of the model, from the snapshot when it
+        is up to date.
+        """
+        name = self.model.__tablename__
+        fragment = self.snapshot.fragment(
+            name, self.resource_key, lambda: self.crud_router
+        )
+        self.snapshot.save()
+        return {name: fragment}
+
+    def extend_openapi(self, app: FastAPI, prefix: str = "") -> None:
+        """
+        Adds the routes to the app's OpenAPI document, needed with a snapshot.
+
+        :param prefix: the prefix the router was included under.
+        """
+        OpenAPIExtension(app, self.openapi, prefix)
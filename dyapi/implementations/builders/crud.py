@@ -1,12 +1,15 @@
 from functools import cached_property
-from typing import Any, AsyncGenerator, Callable, Type
+from typing import Any, AsyncGenerator, Callable, Literal, Type
 
-from dyapi.entities.config import Config
+from dyapi.entities.config import Config, CountStrategyName, IngestMode
 from dyapi.implementations.builders.endpoint import SQLAlchemyEndpointBuilder
+from dyapi.implementations.tracing.route import traced_route
 from dyapi.interfaces.builders.crud import ICRUDBuilder
 from dyapi.interfaces.builders.endpoint import IEndpointBuilder
 from dyapi.interfaces.builders.model import IModelBuilder
+from dyapi.interfaces.metrics import IMetrics
 from dyapi.interfaces.storages import IStorageManager
+from dyapi.interfaces.tracing import ITracer
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from sqlalchemy.orm import DeclarativeBase
@@ -19,12 +22,17 @@ class CRUDBuilder(ICRUDBuilder):
         storage_manager: IStorageManager,
         endpoint_builder: Type[IEndpointBuilder],
         model_builder: Type[IModelBuilder],
+        metrics: IMetrics | None = None,
+        tracer: ITracer | None = None,
     ):
         self._config = config
+        self.tracer = tracer
         self._model = model_builder(config=config)
         self._endpoint = endpoint_builder(
             model=self.model,
             storage=storage_manager.storage(config=config),
+            metrics=metrics,
+            tracer=tracer,
         )
 
     @staticmethod
@@ -46,6 +54,8 @@ class CRUDBuilder(ICRUDBuilder):
     @cached_property
     def router(self) -> APIRouter:
         router = APIRouter()
+        if self.tracer is not None:
+            router.route_class = traced_route(self.tracer)
 
         path: str = self.generate_path_from_fields(
             [field.name for field in self.config.path_fields]
@@ -54,12 +64,30 @@ class CRUDBuilder(ICRUDBuilder):
 
         router.add_api_route("/", self.endpoint.list, methods=["GET"])
 
+        # Registered ahead of the key routes, so "_export" is a reserved key
+        # for resources with a single string path field.
+        router.add_api_route("/_export", self.endpoint.export, methods=["GET"])
+
         router.add_api_route(f"/{path}", self.endpoint.get, methods=["GET"])
 
         router.add_api_route(f"/{path}", self.endpoint.update, methods=["PUT"])
 
         router.add_api_route(f"/{path}", self.endpoint.delete, methods=["DELETE"])
 
+        router.add_api_route(
+            "/create_many", self.endpoint.create_many, methods=["POST"]
+        )
+
+        router.add_api_route(
+            "/upsert_many", self.endpoint.upsert_many, methods=["POST"]
+        )
+
+        router.add_api_route(
+            "/delete_many", self.endpoint.delete_many, methods=["POST"]
+        )
+
+        router.add_api_route("/get_many", self.endpoint.get_many, methods=["POST"])
+
         return router
 
 
@@ -75,16 +103,36 @@ class SQLAlchemyCRUDBuilder:
         api_tags: list[str] | None = None,
         api_prefix: str = "",
         dependencies: list[Depends] | None = None,
+        pagination: Literal["offset", "cursor"] = "offset",
+        count_strategy: CountStrategyName = "exact",
+        count_cache_ttl: float = 60.0,
+        ingest: IngestMode = "insert",
+        copy_threshold: int = 10_000,
+        fast_path: bool = False,
+        metrics: IMetrics | None = None,
+        tracer: ITracer | None = None,
     ):
         """
 
         :param db_model:
         :param db_session:
         :param update_schema:
+        :param pagination: "cursor" switches the list route to keyset pagination.
+        :param count_strategy: how the list route computes the total count.
+        :param count_cache_ttl: lifetime of counts cached by the "cached" strategy.
+        :param ingest: "copy" streams upserts through COPY, "auto" does so for
+            batches of at least copy_threshold rows.
+        :param fast_path: build responses from rows without validating them and
+            serialize them directly, skipping FastAPI's response validation.
+        :param metrics: records the duration, errors and rows of each endpoint
+            and its storage call.
+        :param tracer: traces each request, with spans for its validation,
+            storage call, statements, row mapping and serialization.
         """
         self.api_tags = api_tags
         self.api_prefix = api_prefix
         self.dependencies = dependencies
+        self.tracer = tracer
         self.endpoint = SQLAlchemyEndpointBuilder(
             db_model=db_model,
             db_session=db_session,
@@ -92,6 +140,14 @@ class SQLAlchemyCRUDBuilder:
             path_schema=path_schema,
             filter_schema=filter_schema,
             update_schema=update_schema,
+            pagination=pagination,
+            count_strategy=count_strategy,
+            count_cache_ttl=count_cache_ttl,
+            ingest=ingest,
+            copy_threshold=copy_threshold,
+            fast_path=fast_path,
+            metrics=metrics,
+            tracer=tracer,
         )
 
     @cached_property
@@ -101,6 +157,8 @@ class SQLAlchemyCRUDBuilder:
             prefix=self.api_prefix,
             dependencies=self.dependencies,
         )
+        if self.tracer is not None:
+            router.route_class = traced_route(self.tracer)
 
         path: str = "/".join(
             [
@@ -115,8 +173,14 @@ class SQLAlchemyCRUDBuilder:
             "/upsert_many", self.endpoint.upsert_many, methods=["POST"]
         )
 
+        router.add_api_route("/get_many", self.endpoint.get_many, methods=["POST"])
+
         router.add_api_route("/", self.endpoint.list, methods=["GET"])
 
+        # Registered ahead of the key routes, so "_export" is a reserved key
+        # for resources with a single string path field.
+        router.add_api_route("/_export", self.endpoint.export, methods=["GET"])
+
         router.add_api_route(f"/{path}", self.endpoint.get, methods=["GET"])
 
         router.add_api_route(f"/{path}", self.endpoint.update, methods=["PUT"])
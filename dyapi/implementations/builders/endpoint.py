@@ -1,13 +1,32 @@
 from functools import cached_property
-from typing import Any, AsyncGenerator, Callable, Type
-
-from dyapi.entities.pagination import PaginationContainer, PaginationEntity
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Literal, Type
+
+from dyapi.entities.bulk import BulkContainer
+from dyapi.entities.config import CountStrategyName, IngestMode
+from dyapi.entities.pagination import (
+    CursorPaginationEntity,
+    InvalidCursorError,
+    PaginationContainer,
+    PaginationEntity,
+)
+from dyapi.implementations.builders.export import (
+    MEDIA_TYPES,
+    ExportFormat,
+    encode_export,
+)
+from dyapi.implementations.metrics.timing import instrumented, timed
 from dyapi.implementations.storages.exceptions import AlreadyExistsError, NotFoundError
 from dyapi.implementations.storages.postgres.base import SQLAlchemyStorage
+from dyapi.implementations.storages.postgres.count import build_count_strategy
+from dyapi.implementations.storages.rows import object_mapper
+from dyapi.implementations.tracing.tracer import span
 from dyapi.interfaces.builders.endpoint import IEndpointBuilder
 from dyapi.interfaces.builders.model import IModelBuilder
+from dyapi.interfaces.metrics import IMetrics
 from dyapi.interfaces.storages import IStorage
+from dyapi.interfaces.tracing import ITracer
 from fastapi import Body, Depends, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
@@ -23,10 +42,38 @@ class AlreadyExistsException(HTTPException):
         super().__init__(status_code=400, detail=message)
 
 
+class InvalidCursorException(HTTPException):
+    def __init__(self, message: str):
+        super().__init__(status_code=422, detail=message)
+
+
+def json_response(model: BaseModel) -> Response:
+    """
+    Serializes the model directly, skipping FastAPI's response validation.
+    """
+    with span("serialization"):
+        return Response(model.model_dump_json(), media_type="application/json")
+
+
 class EndpointBuilder(IEndpointBuilder):
-    def __init__(self, model: IModelBuilder, storage: IStorage):
+    def __init__(
+        self,
+        model: IModelBuilder,
+        storage: IStorage,
+        metrics: IMetrics | None = None,
+        tracer: ITracer | None = None,
+    ):
         self.model = model
         self.storage = storage
+        self.metrics = metrics
+        self.tracer = tracer
+
+    def instrument(
+        self, operation: str, endpoint: Callable[..., Any]
+    ) -> Callable[..., Any]:
+        return instrumented(
+            endpoint, self.metrics, self.model.config.name, operation, self.tracer
+        )
 
     @cached_property
     def create(self) -> Callable[[Any], Any]:
@@ -40,15 +87,17 @@ class EndpointBuilder(IEndpointBuilder):
                     message="Entity already exists",
                 )
 
-        return endpoint
+        return self.instrument("create", endpoint)
 
     @cached_property
     def get(self) -> Callable[[Any], Any]:
+        fast_path = self.model.config.fast_path
+
         async def endpoint(
             path: self.model.path = Depends(self.model.path),  # type: ignore
         ) -> self.model.entity:  # type: ignore
             try:
-                return await self.storage.get(
+                entity = await self.storage.get(
                     path,
                     response_model=self.model.entity,
                 )
@@ -56,8 +105,9 @@ class EndpointBuilder(IEndpointBuilder):
                 raise NotFoundException(
                     message="Entity not found",
                 )
+            return json_response(entity) if fast_path else entity
 
-        return endpoint
+        return self.instrument("get", endpoint)
 
     @cached_property
     def update(self) -> Callable[[Any], Any]:
@@ -76,7 +126,7 @@ class EndpointBuilder(IEndpointBuilder):
                     message="Entity not found",
                 )
 
-        return endpoint
+        return self.instrument("update", endpoint)
 
     @cached_property
     def delete(self) -> Callable[[Any], Any]:
@@ -91,26 +141,112 @@ class EndpointBuilder(IEndpointBuilder):
                 )
             return True
 
-        return endpoint
+        return self.instrument("delete", endpoint)
+
+    @cached_property
+    def get_many(self) -> Callable[[Any], Any]:
+        async def endpoint(
+            paths: list[self.model.path] = Body(...),  # type: ignore
+        ) -> BulkContainer[self.model.entity, self.model.path]:  # type: ignore
+            found, missing = await self.storage.get_many(
+                filters=paths, response_model=self.model.entity
+            )
+            return BulkContainer(data=found, missing=missing)
+
+        return self.instrument("get_many", endpoint)
+
+    @cached_property
+    def create_many(self) -> Callable[[Any], Any]:
+        keys = set(self.model.path.model_fields)
+
+        async def endpoint(
+            entities: list[self.model.entity] = Body(...),  # type: ignore
+        ) -> BulkContainer[self.model.entity, self.model.path]:  # type: ignore
+            created, conflicts = await self.storage.create_many(entities=entities)
+            return BulkContainer(
+                data=created,
+                conflicts=[
+                    self.model.path(**entity.model_dump(include=keys))
+                    for entity in conflicts
+                ],
+            )
+
+        return self.instrument("create_many", endpoint)
+
+    @cached_property
+    def upsert_many(self) -> Callable[[Any], Any]:
+        async def endpoint(
+            entities: list[self.model.entity] = Body(...),  # type: ignore
+        ) -> BulkContainer[self.model.entity, self.model.path]:  # type: ignore
+            return BulkContainer(
+                data=await self.storage.upsert_many(entities=entities),
+            )
+
+        return self.instrument("upsert_many", endpoint)
+
+    @cached_property
+    def delete_many(self) -> Callable[[Any], Any]:
+        async def endpoint(
+            paths: list[self.model.path] = Body(...),  # type: ignore
+        ) -> BulkContainer[self.model.path, self.model.path]:  # type: ignore
+            deleted, missing = await self.storage.delete_many(filters=paths)
+            return BulkContainer(data=deleted, missing=missing)
+
+        return self.instrument("delete_many", endpoint)
 
     @cached_property
     def list(self) -> Callable[[Any], Any]:
+        pagination_model = (
+            CursorPaginationEntity
+            if self.model.config.pagination == "cursor"
+            else PaginationEntity
+        )
+        keys = [*self.model.path.model_fields]
+        fast_path = self.model.config.fast_path
+        # Documents the page for FastAPI; the fast path returns it serialized.
+        container: Any = PaginationContainer[self.model.entity]  # type: ignore
+        # Only the parametrized container knows how to serialize the entities.
+        page_model: type[PaginationContainer[Any]] = (
+            container if fast_path else PaginationContainer
+        )
+
         async def endpoint(
             path: self.model.query = Depends(self.model.query),  # type: ignore
-            pagination: PaginationEntity = Depends(PaginationEntity),
-        ) -> PaginationContainer[self.model.entity]:  # type: ignore
-            result, total = await self.storage.list(
-                filter_=path,
-                pagination=pagination,
-                response_model=self.model.entity,
-            )
-            return PaginationContainer(
+            pagination: pagination_model = Depends(pagination_model),  # type: ignore
+        ) -> container:
+            try:
+                result, total = await self.storage.list(
+                    filter_=path,
+                    pagination=pagination,
+                    response_model=self.model.entity,
+                )
+            except InvalidCursorError as exc:
+                raise InvalidCursorException(str(exc)) from exc
+            page = page_model.page(
                 data=result,
                 total=total,
                 pagination=pagination,
+                keys=keys,
+            )
+            return json_response(page) if fast_path else page
+
+        return self.instrument("list", endpoint)
+
+    @cached_property
+    def export(self) -> Callable[[Any], Any]:
+        fields = [*self.model.entity.model_fields]
+
+        async def endpoint(
+            path: self.model.query = Depends(self.model.query),  # type: ignore
+            format: ExportFormat = "ndjson",
+        ) -> StreamingResponse:
+            rows = self.storage.stream(filter_=path, response_model=self.model.entity)
+            return StreamingResponse(
+                encode_export(rows, fields, format),
+                media_type=MEDIA_TYPES[format],
             )
 
-        return endpoint
+        return self.instrument("export", endpoint)
 
 
 class SQLAlchemyEndpointBuilder:
@@ -122,6 +258,14 @@ class SQLAlchemyEndpointBuilder:
         path_schema: Type[BaseModel],
         filter_schema: Type[BaseModel],
         update_schema: Type[BaseModel],
+        pagination: Literal["offset", "cursor"] = "offset",
+        count_strategy: CountStrategyName = "exact",
+        count_cache_ttl: float = 60.0,
+        ingest: IngestMode = "insert",
+        copy_threshold: int = 10_000,
+        fast_path: bool = False,
+        metrics: IMetrics | None = None,
+        tracer: ITracer | None = None,
     ):
         self.db_model = db_model
         self.db_session = db_session
@@ -129,7 +273,33 @@ class SQLAlchemyEndpointBuilder:
         self.path_schema = path_schema
         self.filter_schema = filter_schema
         self.update_schema = update_schema
+        self.pagination = pagination
+        self.count_strategy = build_count_strategy(count_strategy, ttl=count_cache_ttl)
+        self.ingest = ingest
+        self.copy_threshold = copy_threshold
+        self.fast_path = fast_path
+        self.to_schema = object_mapper(schema, fast_path)
         self.storage = SQLAlchemyStorage
+        self.metrics = metrics
+        self.tracer = tracer
+        self.resource = str(db_model.__tablename__)
+
+    def instrument(
+        self, operation: str, endpoint: Callable[..., Any]
+    ) -> Callable[..., Any]:
+        return instrumented(
+            endpoint, self.metrics, self.resource, operation, self.tracer
+        )
+
+    def timed(self, operation: str) -> Any:
+        """
+        Times the storage call of an endpoint.
+        """
+        return timed(self.metrics, "storage", self.resource, operation, self.tracer)
+
+    def rows(self, operation: str, count: int) -> None:
+        if self.metrics is not None:
+            self.metrics.rows(self.resource, operation, count)
 
     @cached_property
     def create(self) -> Callable[[Any], Any]:
@@ -140,16 +310,18 @@ class SQLAlchemyEndpointBuilder:
             session: AsyncSession = Depends(self.db_session),
         ) -> schema:  # type: ignore
             try:
-                model = await self.storage.create(
-                    session=session,
-                    model=self.db_model(**entity.model_dump()),  # type: ignore
-                )
+                with self.timed("create"):
+                    model = await self.storage.create(
+                        session=session,
+                        model=self.db_model(**entity.model_dump()),  # type: ignore
+                    )
             except AlreadyExistsError:
                 raise AlreadyExistsException(message="Entity already exists")
+            self.rows("create", 1)
 
             return schema(**model.__dict__)
 
-        return endpoint
+        return self.instrument("create", endpoint)
 
     @cached_property
     def upsert_many(self) -> Callable[[Any], Any]:
@@ -159,11 +331,40 @@ class SQLAlchemyEndpointBuilder:
             entities: list[schema] = Body(...),  # type: ignore
             session: AsyncSession = Depends(self.db_session),
         ) -> list[schema]:  # type: ignore
-            return await self.storage.upsert_many(
-                session=session, model_type=self.db_model, entities=entities
-            )
+            with self.timed("upsert_many"):
+                upserted = await self.storage.upsert_many(
+                    session=session,
+                    model_type=self.db_model,
+                    entities=entities,
+                    ingest=self.ingest,
+                    copy_threshold=self.copy_threshold,
+                )
+            self.rows("upsert_many", len(upserted))
+            return upserted
+
+        return self.instrument("upsert_many", endpoint)
+
+    @cached_property
+    def get_many(self) -> Callable[[Any], Any]:
+        schema = self.schema
+        path_schema = self.path_schema
 
-        return endpoint
+        async def endpoint(
+            paths: list[path_schema] = Body(...),  # type: ignore
+            session: AsyncSession = Depends(self.db_session),
+        ) -> BulkContainer[schema, path_schema]:  # type: ignore
+            with self.timed("get_many"):
+                found, missing = await self.storage.get_many(
+                    session=session,
+                    model_type=self.db_model,
+                    filters=paths,
+                )
+            self.rows("get_many", len(found))
+            with span("row_mapping", rows=len(found)):
+                data = [self.to_schema(model) for model in found]
+            return BulkContainer(data=data, missing=missing)
+
+        return self.instrument("get_many", endpoint)
 
     @cached_property
     def get(self) -> Callable[[Any], Any]:
@@ -174,16 +375,19 @@ class SQLAlchemyEndpointBuilder:
             session: AsyncSession = Depends(self.db_session),
         ) -> schema:  # type: ignore
             try:
-                model = await self.storage.get(
-                    session=session,
-                    model_type=self.db_model,
-                    filter_=path,
-                )
+                with self.timed("get"):
+                    model = await self.storage.get(
+                        session=session,
+                        model_type=self.db_model,
+                        filter_=path,
+                    )
             except NotFoundError:
                 raise NotFoundException(message="Entity not found")
-            return schema(**model.__dict__)
+            self.rows("get", 1)
+            entity = self.to_schema(model)
+            return json_response(entity) if self.fast_path else entity
 
-        return endpoint
+        return self.instrument("get", endpoint)
 
     @cached_property
     def update(self) -> Callable[[Any], Any]:
@@ -195,17 +399,19 @@ class SQLAlchemyEndpointBuilder:
             session: AsyncSession = Depends(self.db_session),
         ) -> schema:  # type: ignore
             try:
-                model = await self.storage.update(
-                    session=session,
-                    model_type=self.db_model,
-                    filter_=path,
-                    body=body,
-                )
+                with self.timed("update"):
+                    model = await self.storage.update(
+                        session=session,
+                        model_type=self.db_model,
+                        filter_=path,
+                        body=body,
+                    )
             except NotFoundError:
                 raise NotFoundException(message="Entity not found")
+            self.rows("update", 1)
             return schema(**model.__dict__)
 
-        return endpoint
+        return self.instrument("update", endpoint)
 
     @cached_property
     def delete(self) -> Callable[[Any], Any]:
@@ -214,35 +420,90 @@ class SQLAlchemyEndpointBuilder:
             session: AsyncSession = Depends(self.db_session),
         ) -> bool:
             try:
-                return await self.storage.delete(
-                    session=session,
-                    model_type=self.db_model,
-                    filter_=path,
-                )
+                with self.timed("delete"):
+                    deleted = await self.storage.delete(
+                        session=session,
+                        model_type=self.db_model,
+                        filter_=path,
+                    )
             except NotFoundError:
                 raise NotFoundException(message="Entity not found")
+            self.rows("delete", 1)
+            return deleted
 
-        return endpoint
+        return self.instrument("delete", endpoint)
 
     @cached_property
     def list(self) -> Callable[[Any], Any]:
         schema = self.schema
+        pagination_model = (
+            CursorPaginationEntity if self.pagination == "cursor" else PaginationEntity
+        )
+        keys = [*self.path_schema.model_fields]
+        # Documents the page for FastAPI; the fast path returns it serialized.
+        container: Any = PaginationContainer[schema]  # type: ignore
+        page_model: type[PaginationContainer[Any]] = (
+            container if self.fast_path else PaginationContainer
+        )
 
         async def endpoint(
             filter_: self.filter_schema = Depends(self.filter_schema),  # type: ignore
-            pagination: PaginationEntity = Depends(PaginationEntity),
+            pagination: pagination_model = Depends(pagination_model),  # type: ignore
             session: AsyncSession = Depends(self.db_session),
-        ) -> PaginationContainer[schema]:  # type: ignore
-            data, total = await self.storage.list(
-                session=session,
-                model_type=self.db_model,
-                filter_=filter_,
-                pagination=pagination,
-            )
-            return PaginationContainer(
-                data=[schema(**item.__dict__) for item in data],
+        ) -> container:
+            try:
+                with self.timed("list"):
+                    data, total = await self.storage.list(
+                        session=session,
+                        model_type=self.db_model,
+                        filter_=filter_,
+                        pagination=pagination,
+                        count_strategy=self.count_strategy,
+                    )
+            except InvalidCursorError as exc:
+                raise InvalidCursorException(str(exc)) from exc
+            self.rows("list", len(data))
+            with span("row_mapping", rows=len(data)):
+                entities = [self.to_schema(item) for item in data]
+            page = page_model.page(
+                data=entities,
                 total=total,
                 pagination=pagination,
+                keys=keys,
+            )
+            return json_response(page) if self.fast_path else page
+
+        return self.instrument("list", endpoint)
+
+    @cached_property
+    def export(self) -> Callable[[Any], Any]:
+        fields = [*self.schema.model_fields]
+
+        async def endpoint(
+            filter_: self.filter_schema = Depends(self.filter_schema),  # type: ignore
+            format: ExportFormat = "ndjson",
+            session: AsyncSession = Depends(self.db_session),
+        ) -> StreamingResponse:
+            # Dependencies are torn down before the body is streamed, so the
+            # session is reopened by the stream and closed once it is done.
+            async def rows() -> AsyncIterator[Any]:
+                count = 0
+                try:
+                    with self.timed("export"):
+                        async for row in self.storage.stream(
+                            session=session,
+                            model_type=self.db_model,
+                            filter_=filter_,
+                        ):
+                            count += 1
+                            yield row
+                finally:
+                    self.rows("export", count)
+                    await session.close()
+
+            return StreamingResponse(
+                encode_export(rows(), fields, format),
+                media_type=MEDIA_TYPES[format],
             )
 
-        return endpoint
+        return self.instrument("export", endpoint)
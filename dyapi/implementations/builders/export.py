@@ -0,0 +1,47 @@
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Literal
+
+__all__ = ["ExportFormat", "MEDIA_TYPES", "encode_export"]
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Rows are buffered up to this many bytes before a chunk is sent.
+CHUNK_SIZE = 64 * 1024
+
+
+async def encode_export(
+    rows: AsyncIterator[Any],
+    fields: list[str],
+    export_format: ExportFormat,
+) -> AsyncIterator[str]:
+    """
+    Encodes rows (any objects exposing the fields as attributes) as NDJSON or
+    CSV, yielding chunks of roughly CHUNK_SIZE bytes.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(fields)
+
+    async for row in rows:
+        values = [getattr(row, field) for field in fields]
+        if export_format == "csv":
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(fields, values)), default=str))
+            buffer.write("\n")
+
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,127 @@
+from typing import Callable
+
+from fastapi import APIRouter
+from starlette.exceptions import HTTPException
+from starlette.routing import BaseRoute, Match, Route
+from starlette.types import Receive, Scope, Send
+
+__all__ = ["LazyResource", "ResourceRoutes", "lazy_route"]
+
+# Methods of the routes generated for a resource.
+METHODS = ["GET", "POST", "PUT", "DELETE"]
+
+# Path parameter of the placeholder route, dropped before dispatching.
+REST = "dyapi_path"
+
+
+def route_path(scope: Scope) -> str:
+    """
+    The path of the request below the root path the app or the routes
+    enclosing the current one were served under.
+    """
+    path: str = scope["path"]
+    root_path: str = scope.get("root_path", "")
+    return path[len(root_path) :] if path.startswith(root_path) else path
+
+
+class LazyResource:
+    """
+    ASGI app building the router of a resource on its first request and
+    dispatching every request of the resource to it.
+
+    Building does not await, so concurrent first requests build it once.
+    The router can be swapped or removed at runtime; requests already
+    dispatched finish on the router they started on.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[], APIRouter] | None,
+        router: APIRouter | None = None,
+    ):
+        self.build = build
+        self.router = router
+
+    def load(self) -> APIRouter:
+        if self.router is None:
+            if self.build is None:
+                raise HTTPException(status_code=404)
+            self.router = self.build()
+        return self.router
+
+    def swap(self, build: Callable[[], APIRouter], router: APIRouter | None) -> None:
+        self.build, self.router = build, router
+
+    def remove(self) -> None:
+        self.build, self.router = None, None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        router = self.load()
+        path_params = scope.get("path_params", {})
+        if REST in path_params:
+            # The router's paths start at the resource name, so whatever the
+            # lazy route was included under, e.g. "/api", moves to the root
+            # path the router matches below.
+            path = route_path(scope)
+            matched = path[: len(path) - len(path_params[REST])]
+            prefix = matched[:-1].rpartition("/")[0]
+            root_path = scope.get("root_path", "")
+            scope["app_root_path"] = scope.get("app_root_path", root_path)
+            scope["root_path"] = root_path + prefix
+        scope["path_params"] = {
+            name: value for name, value in path_params.items() if name != REST
+        }
+        await router(scope, receive, send)
+
+
+def lazy_route(name: str, resource: LazyResource) -> Route:
+    """
+    Returns a route taking every path under `/{name}/` and dispatching it to
+    the resource, whose router must include the `/{name}` prefix.
+
+    The route is a plain starlette route, so it survives `include_router`. It
+    is left out of the OpenAPI document, as are the routes it builds.
+    """
+    return Route(
+        f"/{name}/{{{REST}:path}}",
+        resource,
+        methods=METHODS,
+        name=name,
+        include_in_schema=False,
+    )
+
+
+class ResourceRoutes(BaseRoute):
+    """
+    Route dispatching every request under `{prefix}/{name}/` to the resource
+    of that name, looked up in `resources` on each request. Adding, replacing
+    or removing an entry changes the routes of the live app at once, and the
+    lookup costs the same however many resources there are.
+
+    Paths of unknown resources do not match, so the app's other routes still
+    get them.
+    """
+
+    def __init__(self, resources: dict[str, LazyResource], prefix: str = ""):
+        self.resources = resources
+        self.prefix = prefix
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if scope["type"] != "http":
+            return Match.NONE, {}
+        path = route_path(scope)
+        if not path.startswith(f"{self.prefix}/"):
+            return Match.NONE, {}
+        name, slash, _ = path[len(self.prefix) + 1 :].partition("/")
+        resource = self.resources.get(name)
+        if resource is None or not slash:
+            return Match.NONE, {}
+        root_path = scope.get("root_path", "")
+        return Match.FULL, {
+            "app_root_path": scope.get("app_root_path", root_path),
+            "root_path": root_path + self.prefix,
+            "endpoint": resource,
+        }
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await scope["endpoint"](scope, receive, send)
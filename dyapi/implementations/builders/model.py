@@ -1,12 +1,55 @@
+import hashlib
+import inspect
 from functools import cached_property
-from typing import Type
+from typing import Any, Iterable, Type, cast
 
-from dyapi.entities.config import Config, ConfigField
+from dyapi.entities.config import Config, ConfigField, FilterOperator
 from dyapi.interfaces.builders.model import IModelBuilder
+from fastapi import Query
 from pydantic import BaseModel, create_model
 from sqlalchemy.orm import DeclarativeBase
 
 
+def operator_fields(
+    name: str, type_: Type[Any], operators: Iterable[FilterOperator]
+) -> dict[str, Any]:
+    """
+    Optional `<name>__<operator>` fields of a filter model.
+    """
+    types: dict[str, Any] = {
+        "gt": type_,
+        "gte": type_,
+        "lt": type_,
+        "lte": type_,
+        "in": list[type_],  # type: ignore
+        "prefix": str,
+        "is_null": bool,
+    }
+    return {
+        f"{name}__{operator}": (types[operator] | None, None) for operator in operators
+    }
+
+
+def query_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """
+    Marks the list fields of a model used as a dependency as query
+    parameters, which FastAPI otherwise reads from the body, so `in` filters
+    are passed as repeated parameters, e.g. `?id__in=1&id__in=2`.
+    """
+    signature = inspect.signature(model)
+    model.__signature__ = signature.replace(
+        parameters=[
+            (
+                parameter.replace(default=Query(None))
+                if parameter.name.endswith("__in")
+                else parameter
+            )
+            for parameter in signature.parameters.values()
+        ]
+    )
+    return model
+
+
 class ModelBuilder(IModelBuilder):
     def __init__(self, config: Config):
         self.config = config
@@ -16,46 +59,137 @@ class ModelBuilder(IModelBuilder):
         name: str,
         fields: list[ConfigField],
         optional: bool = False,
+        operators: list[ConfigField] | None = None,
     ) -> Type[BaseModel]:
-        return create_model(  # type: ignore
-            name,
-            **{
-                field.name: (field.type | None, None) if optional else (field.type, ...)
-                for field in fields
-            },
+        """
+
+        :param operators: fields whose operator filters the model also has.
+        """
+        definitions = {
+            field.name: (field.type | None, None) if optional else (field.type, ...)
+            for field in fields
+        }
+        for field in operators or []:
+            definitions.update(operator_fields(field.name, field.type, field.operators))
+        model = create_model(name, **definitions)  # type: ignore
+        return query_model(model) if operators else model
+
+    def build(
+        self,
+        kind: str,
+        fields: list[ConfigField],
+        optional: bool = False,
+        operators: list[ConfigField] | None = None,
+    ) -> Type[BaseModel]:
+        return self.create_model(
+            f"{kind}{self.config.name}", fields, optional, operators
         )
 
     @cached_property
     def path(self) -> Type[BaseModel]:
-        return self.create_model(
-            f"PathModel{self.config.name}", self.config.path_fields
-        )
+        return self.build("PathModel", self.config.path_fields)
 
     @cached_property
     def query(self) -> Type[BaseModel]:
-        return self.create_model(
-            f"QueryModel{self.config.name}",
-            self.config.path_fields,
+        return self.build(
+            "QueryModel",
+            self.config.filter_fields,
             optional=True,
+            operators=self.config.operator_fields,
         )
 
     @cached_property
     def body(self) -> Type[BaseModel]:
-        return self.create_model(
-            f"BodyModel{self.config.name}", self.config.body_fields
-        )
+        return self.build("BodyModel", self.config.body_fields)
 
     @cached_property
     def entity(self) -> Type[BaseModel]:
-        return self.create_model(f"EntityModel{self.config.name}", self.config.fields)
+        return self.build("EntityModel", self.config.fields)
+
+
+class SharedModelBuilder(ModelBuilder):
+    """
+    Model builder reusing the models of structurally identical configs, i.e.
+    with the same field names, types and locations, instead of generating
+    them per config. Shared models are named after a digest of their fields
+    rather than a config.
+
+    The models are cached on the class, `scoped` returns a subclass with a
+    cache of its own, which `APIBuilder` uses.
+    """
+
+    models: dict[tuple[Any, ...], Type[BaseModel]] = {}
+    # Names of the configs using each model.
+    users: dict[tuple[Any, ...], set[str]] = {}
+
+    @classmethod
+    def scoped(cls) -> Type["SharedModelBuilder"]:
+        return cast(
+            Type[SharedModelBuilder],
+            type(
+                cls.__name__,
+                (cls,),
+                {
+                    # Keeps the repr, and so the resource keys, of the class.
+                    "__module__": cls.__module__,
+                    "__qualname__": cls.__qualname__,
+                    "models": {},
+                    "users": {},
+                },
+            ),
+        )
+
+    @classmethod
+    def discard(cls, name: str) -> None:
+        for key, users in list(cls.users.items()):
+            users.discard(name)
+            if not users:
+                del cls.users[key]
+                cls.models.pop(key, None)
+
+    def build(
+        self,
+        kind: str,
+        fields: list[ConfigField],
+        optional: bool = False,
+        operators: list[ConfigField] | None = None,
+    ) -> Type[BaseModel]:
+        key = (
+            kind,
+            optional,
+            *[(field.name, field.type) for field in fields],
+            *[(field.name, field.type, *field.operators) for field in operators or []],
+        )
+        model = self.models.get(key)
+        if model is None:
+            digest = hashlib.sha1(repr(key).encode()).hexdigest()[:12]
+            model = self.models[key] = self.create_model(
+                f"{kind}{digest}", fields, optional, operators
+            )
+        self.users.setdefault(key, set()).add(self.config.name)
+        return model
 
 
 class SQLAlchemyModelSchemaBuilder:
     def __init__(
         self,
         model: Type[DeclarativeBase],
+        operators: dict[str, list[FilterOperator]] | None = None,
     ):
+        """
+
+        :param operators: operator filters accepted per column, besides
+            equality on every column.
+        """
         self.model = model
+        self.operators = operators or {}
+        columns = model.__table__.columns
+        for key, column_operators in self.operators.items():
+            if (
+                "prefix" in column_operators
+                and columns[key].type.python_type is not str
+            ):
+                raise ValueError(f"Prefix filters only apply to str columns, not {key}")
 
     @cached_property
     def base(self) -> Type[BaseModel]:
@@ -88,13 +222,18 @@ class SQLAlchemyModelSchemaBuilder:
 
     @cached_property
     def filter(self) -> Type[BaseModel]:
-        return create_model(  # type: ignore
-            self.model.__name__ + "FilterSchemaIdentifier",
-            **{
-                key: (value.type.python_type | None, None)
-                for key, value in self.model.__table__.columns.items()
-            },
+        columns = self.model.__table__.columns
+        definitions = {
+            key: (value.type.python_type | None, None) for key, value in columns.items()
+        }
+        for key, operators in self.operators.items():
+            definitions.update(
+                operator_fields(key, columns[key].type.python_type, operators)
+            )
+        model = create_model(  # type: ignore
+            self.model.__name__ + "FilterSchemaIdentifier", **definitions
         )
+        return query_model(model) if self.operators else model
 
     @cached_property
     def update(self) -> Type[BaseModel]:
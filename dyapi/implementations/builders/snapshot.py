@@ -0,0 +1,177 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+
+import fastapi
+import pydantic
+from dyapi.entities.snapshot import OpenAPIFragment, Snapshot
+from fastapi import APIRouter, FastAPI
+from fastapi.openapi.utils import get_openapi
+from pydantic import ValidationError
+from starlette.routing import BaseRoute
+
+__all__ = ["OpenAPISnapshot", "OpenAPIExtension", "digest", "openapi_fragment"]
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the generated fragments change shape.
+SNAPSHOT_VERSION = 1
+
+# The document depends on how FastAPI and pydantic render the models.
+ENVIRONMENT = f"fastapi={fastapi.__version__};pydantic={pydantic.VERSION}"
+
+
+def digest(*parts: Any) -> str:
+    """
+    Hashes the parts by their repr, which is stable across processes for
+    configs, column definitions and classes.
+    """
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def openapi_fragment(key: str, routes: Sequence[BaseRoute]) -> OpenAPIFragment:
+    document = get_openapi(title="", version="", routes=routes)
+    return OpenAPIFragment(
+        key=key,
+        paths=document.get("paths", {}),
+        schemas=document.get("components", {}).get("schemas", {}),
+    )
+
+
+class OpenAPISnapshot:
+    """
+    OpenAPI fragments of the resources of a builder, kept per resource under
+    the key of its definition and persisted to `path` as JSON.
+
+    A fragment is generated only when the snapshot has none for the resource
+    or its key changed, so workers booting with an up-to-date file skip
+    generating the document. The file is loaded on first use and replaced
+    atomically, so workers sharing it never read a partial one.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path is not None else None
+        self.fragments: dict[str, OpenAPIFragment] | None = None
+        self.changed = False
+
+    def load(self) -> dict[str, OpenAPIFragment]:
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            snapshot = Snapshot.model_validate_json(self.path.read_bytes())
+        except (OSError, ValidationError):
+            logger.warning("Ignoring unreadable OpenAPI snapshot %s", self.path)
+            return {}
+        if snapshot.version != SNAPSHOT_VERSION or snapshot.environment != ENVIRONMENT:
+            logger.info("Ignoring OpenAPI snapshot %s of another version", self.path)
+            return {}
+        return snapshot.resources
+
+    def fragment(
+        self, name: str, key: str, router: Callable[[], APIRouter]
+    ) -> OpenAPIFragment:
+        """
+        Returns the fragment of the resource, generated from the routes of
+        `router()` if the snapshot has none under the key.
+        """
+        if self.fragments is None:
+            self.fragments = self.load()
+        fragment = self.fragments.get(name)
+        if fragment is None or fragment.key != key:
+            fragment = self.fragments[name] = openapi_fragment(key, router().routes)
+            self.changed = True
+        return fragment
+
+    def discard(self, name: str) -> None:
+        if self.fragments is not None and name in self.fragments:
+            del self.fragments[name]
+            self.changed = True
+
+    def retain(self, names: Iterable[str]) -> None:
+        """
+        Drops the fragments of resources other than `names`.
+        """
+        for name in set(self.fragments or {}) - set(names):
+            self.discard(name)
+
+    def save(self) -> None:
+        if self.path is None or not self.changed:
+            return
+        snapshot = Snapshot(
+            version=SNAPSHOT_VERSION,
+            environment=ENVIRONMENT,
+            resources=self.fragments or {},
+        )
+        temporary = self.path.with_name(f".{self.path.name}.{os.getpid()}")
+        try:
+            temporary.write_text(snapshot.model_dump_json())
+            os.replace(temporary, self.path)
+        except OSError:
+            logger.exception("Failed to write OpenAPI snapshot %s", self.path)
+            return
+        self.changed = False
+
+
+class OpenAPIExtension:
+    """
+    Adds the fragments of resources to the document FastAPI generates for
+    the app's own routes, once, when the document is first requested.
+    Afterwards the fragment of a single resource can be replaced or removed
+    in the cached document without generating it again.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        fragments: Callable[[], dict[str, OpenAPIFragment]],
+        prefix: str = "",
+    ):
+        self.app = app
+        self.fragments = fragments
+        self.prefix = prefix
+        self.applied: dict[str, OpenAPIFragment] = {}
+        self.generate = app.openapi
+        app.openapi = self.openapi  # type: ignore
+
+    def openapi(self) -> dict[str, Any]:
+        if self.app.openapi_schema:
+            return self.app.openapi_schema
+        document = self.generate()
+        self.applied = {}
+        for name, fragment in self.fragments().items():
+            self.apply(document, name, fragment)
+        return document
+
+    def apply(
+        self, document: dict[str, Any], name: str, fragment: OpenAPIFragment
+    ) -> None:
+        paths = document.setdefault("paths", {})
+        schemas = document.setdefault("components", {}).setdefault("schemas", {})
+        paths.update(
+            {self.prefix + path: item for path, item in fragment.paths.items()}
+        )
+        schemas.update(fragment.schemas)
+        self.applied[name] = fragment
+
+    def update(self, name: str, fragment: Callable[[], OpenAPIFragment] | None) -> None:
+        """
+        Replaces the fragment of the resource in the cached document, or
+        removes it if `fragment` is None. Schemas other resources also use
+        are kept. Without a cached document there is nothing to update.
+        """
+        document = self.app.openapi_schema
+        if not document:
+            return
+        previous = self.applied.pop(name, None)
+        if previous is not None:
+            for path in previous.paths:
+                document["paths"].pop(self.prefix + path, None)
+            shared = {
+                schema for other in self.applied.values() for schema in other.schemas
+            }
+            for schema in set(previous.schemas) - shared:
+                document["components"]["schemas"].pop(schema, None)
+        if fragment is not None:
+            self.apply(document, name, fragment())
@@ -0,0 +1,55 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+from dyapi.interfaces.caches import ICacheBackend
+
+__all__ = ["MemoryCacheBackend"]
+
+
+class MemoryCacheBackend(ICacheBackend):
+    """
+    In-process LRU cache keeping at most `maxsize` values for `ttl` seconds.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.values: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Any | None:
+        cached = self.values.get(key)
+        if cached is None or cached[0] <= time.monotonic():
+            if cached is not None:
+                del self.values[key]
+            self.misses += 1
+            return None
+
+        self.values.move_to_end(key)
+        self.hits += 1
+        return cached[1]
+
+    async def set(self, key: str, value: Any) -> None:
+        self.values[key] = (time.monotonic() + self.ttl, value)
+        self.values.move_to_end(key)
+        while len(self.values) > self.maxsize:
+            self.values.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.values.pop(key, None)
+
+    async def clear(self) -> None:
+        self.values.clear()
+
+    async def clear_namespace(self, namespace: str) -> None:
+        prefix = f"{namespace}:"
+        for key in [key for key in self.values if key.startswith(prefix)]:
+            del self.values[key]
+
+    def __len__(self) -> int:
+        return len(self.values)
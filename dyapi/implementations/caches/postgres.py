@@ -0,0 +1,167 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any
+
+from dyapi.interfaces.caches import Evict, IInvalidationBus
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = ["PostgresInvalidationBus"]
+
+logger = logging.getLogger(__name__)
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_PAYLOAD = 7900
+
+
+class PostgresInvalidationBus(IInvalidationBus):
+    """
+    Invalidation bus over Postgres LISTEN/NOTIFY.
+
+    Published keys are collected for `flush_interval` seconds, deduplicated
+    and sent in as few NOTIFY payloads as fit. Each process keeps one
+    connection listening on `channel` and skips its own notifications. If
+    that connection is lost, every subscriber is evicted entirely, since
+    notifications may have been missed, and the bus reconnects.
+    """
+
+    def __init__(
+        self,
+        pg_engine: AsyncEngine,
+        channel: str = "dyapi_invalidation",
+        flush_interval: float = 0.01,
+        reconnect_interval: float = 1.0,
+    ):
+        self.pg_engine = pg_engine
+        self.channel = channel
+        self.flush_interval = flush_interval
+        self.reconnect_interval = reconnect_interval
+        self.origin = uuid.uuid4().hex
+        self.subscribers: dict[str, list[Evict]] = {}
+        self.pending: dict[str, set[str]] = {}
+        self.flusher: asyncio.Task[None] | None = None
+        self.listener: asyncio.Task[None] | None = None
+        # The event loop only keeps weak references to running tasks.
+        self.dispatching: set[asyncio.Task[None]] = set()
+        self.closed: asyncio.Event = asyncio.Event()
+
+    def subscribe(self, namespace: str, evict: Evict) -> None:
+        self.subscribers.setdefault(namespace, []).append(evict)
+
+    def unsubscribe(self, namespace: str, evict: Evict) -> None:
+        subscribers = self.subscribers.get(namespace, [])
+        if evict in subscribers:
+            subscribers.remove(evict)
+
+    async def publish(self, namespace: str, keys: list[str]) -> None:
+        self.pending.setdefault(namespace, set()).update(keys)
+        if self.flusher is None or self.flusher.done():
+            self.flusher = asyncio.create_task(self.flush_later())
+
+    async def flush_later(self) -> None:
+        while self.pending:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to publish cache invalidations")
+
+    def payloads(self, pending: dict[str, set[str]]) -> list[str]:
+        payloads = []
+        for namespace, keys in pending.items():
+            batch: list[str] = []
+            for key in sorted(keys):
+                payload = self.encode(namespace, [*batch, key])
+                if batch and len(payload.encode()) > MAX_PAYLOAD:
+                    payloads.append(self.encode(namespace, batch))
+                    batch = []
+                batch.append(key)
+            if batch:
+                payloads.append(self.encode(namespace, batch))
+        return payloads
+
+    def encode(self, namespace: str, keys: list[str]) -> str:
+        return json.dumps({"origin": self.origin, "namespace": namespace, "keys": keys})
+
+    async def flush(self) -> None:
+        pending, self.pending = self.pending, {}
+        payloads = self.payloads(pending)
+        if not payloads:
+            return
+        async with self.pg_engine.begin() as conn:
+            for payload in payloads:
+                await conn.execute(select(func.pg_notify(self.channel, payload)))
+
+    async def dispatch(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            if message["origin"] == self.origin:
+                return
+            for evict in self.subscribers.get(message["namespace"], []):
+                await evict(message["keys"])
+        except Exception:
+            logger.exception("Failed to apply cache invalidation %s", payload)
+
+    async def evict_all(self) -> None:
+        for subscribers in self.subscribers.values():
+            for evict in subscribers:
+                await evict(None)
+
+    def on_notification(
+        self, connection: Any, pid: int, channel: str, payload: str
+    ) -> None:
+        task = asyncio.ensure_future(self.dispatch(payload))
+        self.dispatching.add(task)
+        task.add_done_callback(self.dispatching.discard)
+
+    def on_termination(self, connection: Any) -> None:
+        self.closed.set()
+
+    async def listen(self) -> None:
+        """
+        Keeps a LISTEN connection open until the bus is stopped.
+        """
+        while True:
+            try:
+                self.closed.clear()
+                async with self.pg_engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    await self.wait(raw.driver_connection)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Cache invalidation listener failed")
+
+            await self.evict_all()
+            await asyncio.sleep(self.reconnect_interval)
+
+    async def wait(self, driver_connection: Any) -> None:
+        driver_connection.add_termination_listener(self.on_termination)
+        await driver_connection.add_listener(self.channel, self.on_notification)
+        try:
+            await self.closed.wait()
+        finally:
+            driver_connection.remove_termination_listener(self.on_termination)
+            if not driver_connection.is_closed():
+                await driver_connection.remove_listener(
+                    self.channel, self.on_notification
+                )
+
+    async def start(self) -> None:
+        if self.listener is None:
+            self.listener = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        if self.flusher is not None:
+            await self.flusher
+        await self.flush()
+
+        if self.listener is not None:
+            self.listener.cancel()
+            try:
+                await self.listener
+            except asyncio.CancelledError:
+                pass
+            self.listener = None
@@ -0,0 +1,171 @@
+import bisect
+from typing import Callable, Iterable
+
+from dyapi.interfaces.metrics import IMetrics
+
+__all__ = ["PrometheusMetrics", "CONTENT_TYPE"]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def format_labels(labels: Labels) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return ",".join(f'{name}="{escape(value)}"' for name, value in labels)
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class PrometheusMetrics(IMetrics):
+    """
+    Keeps metrics in process and renders them in the Prometheus text format:
+    latency histograms and error counts per layer, resource and operation,
+    the rows returned or written per resource and operation, and the state
+    and checkout waits of the connection pools.
+    """
+
+    def __init__(self, prefix: str = "dyapi", buckets: Iterable[float] = BUCKETS):
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets))
+        self.durations: dict[Labels, Histogram] = {}
+        self.errors: dict[Labels, int] = {}
+        self.row_counts: dict[Labels, int] = {}
+        self.checkouts: dict[Labels, Histogram] = {}
+        self.checkout_timeouts: dict[Labels, int] = {}
+        self.pools: dict[str, Callable[[], dict[str, int]]] = {}
+
+    def observe(
+        self,
+        layer: str,
+        resource: str,
+        operation: str,
+        seconds: float,
+        error: bool = False,
+    ) -> None:
+        labels = (("layer", layer), ("resource", resource), ("operation", operation))
+        histogram = self.durations.get(labels)
+        if histogram is None:
+            histogram = self.durations[labels] = Histogram(self.buckets)
+        histogram.observe(seconds)
+        if error:
+            self.errors[labels] = self.errors.get(labels, 0) + 1
+
+    def rows(self, resource: str, operation: str, count: int) -> None:
+        labels = (("resource", resource), ("operation", operation))
+        self.row_counts[labels] = self.row_counts.get(labels, 0) + count
+
+    def observe_checkout(
+        self, engine: str, seconds: float, timeout: bool = False
+    ) -> None:
+        labels = (("engine", engine),)
+        histogram = self.checkouts.get(labels)
+        if histogram is None:
+            histogram = self.checkouts[labels] = Histogram(self.buckets)
+        histogram.observe(seconds)
+        if timeout:
+            self.checkout_timeouts[labels] = self.checkout_timeouts.get(labels, 0) + 1
+
+    def watch_pool(self, engine: str, stats: Callable[[], dict[str, int]]) -> None:
+        self.pools[engine] = stats
+
+    def render_histograms(
+        self, name: str, help_: str, histograms: dict[Labels, Histogram]
+    ) -> list[str]:
+        lines = [f"# HELP {name} {help_}", f"# TYPE {name} histogram"]
+        for labels, histogram in histograms.items():
+            cumulative = 0
+            for bound, count in zip(
+                (*histogram.buckets, float("inf")), histogram.counts
+            ):
+                cumulative += count
+                le = format_labels((*labels, ("le", format_value(bound))))
+                lines.append(f"{name}_bucket{{{le}}} {cumulative}")
+            lines.append(
+                f"{name}_sum{{{format_labels(labels)}}} {format_value(histogram.sum)}"
+            )
+            lines.append(f"{name}_count{{{format_labels(labels)}}} {histogram.count}")
+        return lines
+
+    def render_values(
+        self, name: str, help_: str, type_: str, values: dict[Labels, int]
+    ) -> list[str]:
+        lines = [f"# HELP {name} {help_}", f"# TYPE {name} {type_}"]
+        for labels, value in values.items():
+            lines.append(f"{name}{{{format_labels(labels)}}} {value}")
+        return lines
+
+    def render(self) -> str:
+        prefix = self.prefix
+        lines = [
+            *self.render_histograms(
+                f"{prefix}_operation_duration_seconds",
+                "Duration of operations.",
+                self.durations,
+            ),
+            *self.render_values(
+                f"{prefix}_operation_errors_total",
+                "Operations that raised.",
+                "counter",
+                self.errors,
+            ),
+            *self.render_values(
+                f"{prefix}_rows_total",
+                "Rows returned or written by operations.",
+                "counter",
+                self.row_counts,
+            ),
+            *self.render_histograms(
+                f"{prefix}_pool_checkout_seconds",
+                "Time spent waiting for a pooled connection.",
+                self.checkouts,
+            ),
+            *self.render_values(
+                f"{prefix}_pool_timeouts_total",
+                "Checkouts that timed out waiting for a connection.",
+                "counter",
+                self.checkout_timeouts,
+            ),
+        ]
+
+        pools = {engine: stats() for engine, stats in self.pools.items()}
+        for stat, help_ in (
+            ("size", "Connections the pool keeps open."),
+            ("checked_out", "Connections in use."),
+            ("overflow", "Connections open beyond the pool size."),
+            ("max_overflow", "Connections allowed beyond the pool size."),
+        ):
+            lines.extend(
+                self.render_values(
+                    f"{prefix}_pool_{stat}",
+                    help_,
+                    "gauge",
+                    {
+                        (("engine", engine),): stats[stat]
+                        for engine, stats in pools.items()
+                    },
+                )
+            )
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,18 @@
+from typing import Any, Callable
+
+from dyapi.implementations.metrics.prometheus import CONTENT_TYPE
+from dyapi.interfaces.metrics import IMetrics
+from fastapi.responses import Response
+
+__all__ = ["metrics_endpoint"]
+
+
+def metrics_endpoint(metrics: IMetrics) -> Callable[[], Any]:
+    """
+    Returns a FastAPI endpoint serving the metrics for Prometheus to scrape.
+    """
+
+    async def endpoint() -> Response:
+        return Response(metrics.render(), media_type=CONTENT_TYPE)
+
+    return endpoint
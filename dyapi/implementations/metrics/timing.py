@@ -0,0 +1,84 @@
+import functools
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from dyapi.entities.pagination import InvalidCursorError
+from dyapi.implementations.storages.exceptions import (
+    AlreadyExistsError,
+    NotFoundError,
+)
+from dyapi.interfaces.metrics import IMetrics
+from dyapi.interfaces.tracing import ITracer
+from starlette.exceptions import HTTPException
+
+__all__ = ["timed", "instrumented"]
+
+# Raised for requests the client got wrong; they surface as 4xx responses
+# and are not counted as errors of the operation.
+CLIENT_ERRORS = (NotFoundError, AlreadyExistsError, InvalidCursorError)
+
+
+def is_error(error: Exception) -> bool:
+    if isinstance(error, HTTPException):
+        return error.status_code >= 500
+    return not isinstance(error, CLIENT_ERRORS)
+
+
+@contextmanager
+def timed(
+    metrics: IMetrics | None,
+    layer: str,
+    resource: str,
+    operation: str,
+    tracer: ITracer | None = None,
+) -> Iterator[None]:
+    """
+    Records the duration of the block, and whether it failed, if metrics are
+    enabled, and traces it as a span named after the layer if a tracer is.
+    """
+    if tracer is not None:
+        with tracer.span(layer, resource=resource, operation=operation):
+            with timed(metrics, layer, resource, operation):
+                yield
+        return
+
+    if metrics is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as error:
+        metrics.observe(
+            layer,
+            resource,
+            operation,
+            time.perf_counter() - start,
+            error=is_error(error),
+        )
+        raise
+    metrics.observe(layer, resource, operation, time.perf_counter() - start)
+
+
+def instrumented(
+    endpoint: Callable[..., Any],
+    metrics: IMetrics | None,
+    resource: str,
+    operation: str,
+    tracer: ITracer | None = None,
+) -> Callable[..., Any]:
+    """
+    Times and traces every call of the endpoint. FastAPI reads the signature
+    of the wrapped endpoint, so its dependencies are kept.
+    """
+    if metrics is None and tracer is None:
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with timed(metrics, "endpoint", resource, operation, tracer):
+            return await endpoint(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,139 @@
+import asyncio
+from typing import Any, AsyncIterator, Hashable, Type
+
+from dyapi.entities.pagination import CursorPaginationEntity, PaginationEntity
+from dyapi.implementations.storages.exceptions import NotFoundError
+from dyapi.interfaces.storages import IStorage
+from pydantic import BaseModel
+
+__all__ = ["BatchingStorage"]
+
+Batch = dict[Hashable, tuple[BaseModel, "asyncio.Future[BaseModel]"]]
+
+
+class BatchingStorage(IStorage):
+    """
+    Coalesces concurrent `get` calls into `get_many` calls on the wrapped
+    storage. Keys requested within `window` seconds, or within one event loop
+    iteration if it is 0, are fetched together, at most `max_size` at a time.
+    Concurrent requests for the same key share a single lookup.
+    """
+
+    def __init__(
+        self,
+        storage: IStorage,
+        keys: list[str],
+        window: float = 0.0,
+        max_size: int = 100,
+    ):
+        self.storage = storage
+        self.keys = keys
+        self.window = window
+        self.max_size = max_size
+        self.batches: dict[Type[BaseModel], Batch] = {}
+        # The event loop only keeps weak references to running tasks.
+        self.loading: set[asyncio.Task[None]] = set()
+
+    def key(self, entity: BaseModel) -> tuple[Any, ...]:
+        return tuple(getattr(entity, key) for key in self.keys)
+
+    async def get(
+        self, filter_: BaseModel, response_model: Type[BaseModel]
+    ) -> BaseModel:
+        batch = self.batches.get(response_model)
+        if batch is None:
+            batch = self.batches[response_model] = {}
+            loop = asyncio.get_running_loop()
+            if self.window:
+                loop.call_later(self.window, self.dispatch, response_model, batch)
+            else:
+                loop.call_soon(self.dispatch, response_model, batch)
+
+        key = self.key(filter_)
+        if key not in batch:
+            batch[key] = (filter_, asyncio.get_running_loop().create_future())
+        future = batch[key][1]
+        if len(batch) >= self.max_size:
+            self.dispatch(response_model, batch)
+
+        # Other requests wait on the same future, so a cancelled request must
+        # not cancel it.
+        return await asyncio.shield(future)
+
+    def dispatch(self, response_model: Type[BaseModel], batch: Batch) -> None:
+        # The batch may already have been sent when it filled up.
+        if self.batches.get(response_model) is not batch:
+            return
+        del self.batches[response_model]
+        task = asyncio.ensure_future(self.load(response_model, batch))
+        self.loading.add(task)
+        task.add_done_callback(self.loading.discard)
+
+    async def load(self, response_model: Type[BaseModel], batch: Batch) -> None:
+        try:
+            found, _ = await self.storage.get_many(
+                filters=[filter_ for filter_, _ in batch.values()],
+                response_model=response_model,
+            )
+        except Exception as exc:
+            for _, future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        entities = {self.key(entity): entity for entity in found}
+        for key, (_, future) in batch.items():
+            if future.done():
+                continue
+            if key in entities:
+                future.set_result(entities[key])
+            else:
+                future.set_exception(NotFoundError())
+
+    async def get_many(
+        self, filters: list[BaseModel], response_model: Type[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        return await self.storage.get_many(
+            filters=filters, response_model=response_model
+        )
+
+    async def create(self, entity: BaseModel) -> BaseModel:
+        return await self.storage.create(entity)
+
+    async def update(
+        self, filter_: BaseModel, entity: BaseModel, response_model: Type[BaseModel]
+    ) -> BaseModel:
+        return await self.storage.update(
+            filter_=filter_, entity=entity, response_model=response_model
+        )
+
+    async def delete(self, filter_: BaseModel) -> bool:
+        return await self.storage.delete(filter_)
+
+    async def create_many(
+        self, entities: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        return await self.storage.create_many(entities)
+
+    async def upsert_many(self, entities: list[BaseModel]) -> list[BaseModel]:
+        return await self.storage.upsert_many(entities)
+
+    async def delete_many(
+        self, filters: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        return await self.storage.delete_many(filters)
+
+    async def list(
+        self,
+        filter_: BaseModel,
+        pagination: PaginationEntity | CursorPaginationEntity,
+        response_model: Type[BaseModel],
+    ) -> tuple[list[BaseModel], int | None]:
+        return await self.storage.list(
+            filter_=filter_, pagination=pagination, response_model=response_model
+        )
+
+    def stream(
+        self, filter_: BaseModel, response_model: Type[BaseModel]
+    ) -> AsyncIterator[Any]:
+        return self.storage.stream(filter_=filter_, response_model=response_model)
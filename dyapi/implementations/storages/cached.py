@@ -0,0 +1,161 @@
+import json
+from typing import Any, AsyncIterator, Type
+
+from dyapi.entities.pagination import CursorPaginationEntity, PaginationEntity
+from dyapi.interfaces.caches import ICacheBackend, IInvalidationBus
+from dyapi.interfaces.storages import IStorage
+from pydantic import BaseModel
+
+__all__ = ["CachedStorage"]
+
+
+class CachedStorage(IStorage):
+    """
+    Read-through cache for `get` by key in front of another storage. Writes go
+    to the wrapped storage first and then refresh or invalidate the cached
+    entities with the same key. Lists and streams are not cached.
+    With a bus, written keys are also evicted from the caches of other
+    processes.
+    """
+
+    def __init__(
+        self,
+        storage: IStorage,
+        backend: ICacheBackend,
+        namespace: str,
+        keys: list[str],
+        bus: IInvalidationBus | None = None,
+    ):
+        self.storage = storage
+        self.backend = backend
+        self.namespace = namespace
+        self.keys = keys
+        self.bus = bus
+        # Bumped on every write, so that a read which raced with a write does
+        # not put the value it read before the write back into the cache.
+        self.version = 0
+
+    def cache_key(self, entity: BaseModel) -> str:
+        values = [getattr(entity, key) for key in self.keys]
+        return f"{self.namespace}:{json.dumps(values, default=str)}"
+
+    async def invalidate(self, entities: list[BaseModel]) -> None:
+        keys = [self.cache_key(entity) for entity in entities]
+        await self.evict(keys)
+        if self.bus is not None:
+            await self.bus.publish(self.namespace, keys)
+
+    async def evict(self, keys: list[str] | None) -> None:
+        """
+        Drops the keys from the cache, or every key of the namespace if None.
+        """
+        self.version += 1
+        if keys is None:
+            await self.backend.clear_namespace(self.namespace)
+        else:
+            await self.backend.delete(*keys)
+
+    async def get(
+        self, filter_: BaseModel, response_model: Type[BaseModel]
+    ) -> BaseModel:
+        key = self.cache_key(filter_)
+        cached = await self.backend.get(key)
+        if isinstance(cached, response_model):
+            return cached
+
+        version = self.version
+        entity = await self.storage.get(filter_=filter_, response_model=response_model)
+        if version == self.version:
+            await self.backend.set(key, entity)
+        return entity
+
+    async def get_many(
+        self, filters: list[BaseModel], response_model: Type[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        found: list[BaseModel] = []
+        pending: list[BaseModel] = []
+        for filter_ in filters:
+            cached = await self.backend.get(self.cache_key(filter_))
+            if isinstance(cached, response_model):
+                found.append(cached)
+            else:
+                pending.append(filter_)
+        if not pending:
+            return found, []
+
+        version = self.version
+        fetched, missing = await self.storage.get_many(
+            filters=pending, response_model=response_model
+        )
+        if version == self.version:
+            for entity in fetched:
+                await self.backend.set(self.cache_key(entity), entity)
+        return found + fetched, missing
+
+    async def create(self, entity: BaseModel) -> BaseModel:
+        try:
+            return await self.storage.create(entity)
+        finally:
+            await self.invalidate([entity])
+
+    async def update(
+        self, filter_: BaseModel, entity: BaseModel, response_model: Type[BaseModel]
+    ) -> BaseModel:
+        version = self.version
+        try:
+            updated = await self.storage.update(
+                filter_=filter_, entity=entity, response_model=response_model
+            )
+        finally:
+            await self.invalidate([filter_])
+        # The key itself may have been changed by the update.
+        if self.cache_key(updated) != self.cache_key(filter_):
+            await self.invalidate([updated])
+        elif self.version == version + 1:
+            # Only cached if no other write invalidated in the meantime, which
+            # may have written the row after this update.
+            await self.backend.set(self.cache_key(updated), updated)
+        return updated
+
+    async def delete(self, filter_: BaseModel) -> bool:
+        try:
+            return await self.storage.delete(filter_)
+        finally:
+            await self.invalidate([filter_])
+
+    async def create_many(
+        self, entities: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        try:
+            return await self.storage.create_many(entities)
+        finally:
+            await self.invalidate(entities)
+
+    async def upsert_many(self, entities: list[BaseModel]) -> list[BaseModel]:
+        try:
+            return await self.storage.upsert_many(entities)
+        finally:
+            await self.invalidate(entities)
+
+    async def delete_many(
+        self, filters: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        try:
+            return await self.storage.delete_many(filters)
+        finally:
+            await self.invalidate(filters)
+
+    async def list(
+        self,
+        filter_: BaseModel,
+        pagination: PaginationEntity | CursorPaginationEntity,
+        response_model: Type[BaseModel],
+    ) -> tuple[list[BaseModel], int | None]:
+        return await self.storage.list(
+            filter_=filter_, pagination=pagination, response_model=response_model
+        )
+
+    def stream(
+        self, filter_: BaseModel, response_model: Type[BaseModel]
+    ) -> AsyncIterator[Any]:
+        return self.storage.stream(filter_=filter_, response_model=response_model)
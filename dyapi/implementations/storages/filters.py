@@ -0,0 +1,18 @@
+from typing import get_args
+
+from dyapi.entities.config import FilterOperator
+
+__all__ = ["OPERATORS", "split_filter"]
+
+OPERATORS = get_args(FilterOperator)
+
+
+def split_filter(name: str) -> tuple[str, str]:
+    """
+    Splits a filter name into its field and operator, "eq" for plain
+    equality on a field.
+    """
+    field, separator, operator = name.rpartition("__")
+    if separator and operator in OPERATORS:
+        return field, operator
+    return name, "eq"
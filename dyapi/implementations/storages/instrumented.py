@@ -0,0 +1,125 @@
+from typing import Any, AsyncIterator, Type
+
+from dyapi.entities.pagination import CursorPaginationEntity, PaginationEntity
+from dyapi.implementations.metrics.timing import timed
+from dyapi.interfaces.metrics import IMetrics
+from dyapi.interfaces.storages import IStorage
+from dyapi.interfaces.tracing import ITracer
+from pydantic import BaseModel
+
+__all__ = ["InstrumentedStorage"]
+
+
+class InstrumentedStorage(IStorage):
+    """
+    Records the duration, errors and row counts of every call to the wrapped
+    storage under the "storage" layer, and traces it as a "storage" span.
+    """
+
+    def __init__(
+        self,
+        storage: IStorage,
+        resource: str,
+        metrics: IMetrics | None = None,
+        tracer: ITracer | None = None,
+    ):
+        self.storage = storage
+        self.resource = resource
+        self.metrics = metrics
+        self.tracer = tracer
+
+    def timed(self, operation: str) -> Any:
+        return timed(self.metrics, "storage", self.resource, operation, self.tracer)
+
+    def rows(self, operation: str, count: int) -> None:
+        if self.metrics is not None:
+            self.metrics.rows(self.resource, operation, count)
+
+    async def get(
+        self, filter_: BaseModel, response_model: Type[BaseModel]
+    ) -> BaseModel:
+        with self.timed("get"):
+            entity = await self.storage.get(
+                filter_=filter_, response_model=response_model
+            )
+        self.rows("get", 1)
+        return entity
+
+    async def get_many(
+        self, filters: list[BaseModel], response_model: Type[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        with self.timed("get_many"):
+            found, missing = await self.storage.get_many(
+                filters=filters, response_model=response_model
+            )
+        self.rows("get_many", len(found))
+        return found, missing
+
+    async def create(self, entity: BaseModel) -> BaseModel:
+        with self.timed("create"):
+            created = await self.storage.create(entity)
+        self.rows("create", 1)
+        return created
+
+    async def update(
+        self, filter_: BaseModel, entity: BaseModel, response_model: Type[BaseModel]
+    ) -> BaseModel:
+        with self.timed("update"):
+            updated = await self.storage.update(
+                filter_=filter_, entity=entity, response_model=response_model
+            )
+        self.rows("update", 1)
+        return updated
+
+    async def delete(self, filter_: BaseModel) -> bool:
+        with self.timed("delete"):
+            deleted = await self.storage.delete(filter_)
+        self.rows("delete", 1)
+        return deleted
+
+    async def create_many(
+        self, entities: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        with self.timed("create_many"):
+            created, conflicts = await self.storage.create_many(entities)
+        self.rows("create_many", len(created))
+        return created, conflicts
+
+    async def upsert_many(self, entities: list[BaseModel]) -> list[BaseModel]:
+        with self.timed("upsert_many"):
+            upserted = await self.storage.upsert_many(entities)
+        self.rows("upsert_many", len(upserted))
+        return upserted
+
+    async def delete_many(
+        self, filters: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        with self.timed("delete_many"):
+            deleted, missing = await self.storage.delete_many(filters)
+        self.rows("delete_many", len(deleted))
+        return deleted, missing
+
+    async def list(
+        self,
+        filter_: BaseModel,
+        pagination: PaginationEntity | CursorPaginationEntity,
+        response_model: Type[BaseModel],
+    ) -> tuple[list[BaseModel], int | None]:
+        with self.timed("list"):
+            data, total = await self.storage.list(
+                filter_=filter_, pagination=pagination, response_model=response_model
+            )
+        self.rows("list", len(data))
+        return data, total
+
+    async def stream(
+        self, filter_: BaseModel, response_model: Type[BaseModel]
+    ) -> AsyncIterator[Any]:
+        count = 0
+        with self.timed("export"):
+            async for row in self.storage.stream(
+                filter_=filter_, response_model=response_model
+            ):
+                count += 1
+                yield row
+        self.rows("export", count)
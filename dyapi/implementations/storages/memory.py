@@ -0,0 +1,398 @@
+import asyncio
+import itertools
+from bisect import bisect_right, insort
+from operator import eq, ge, gt, le, lt
+from typing import Any, AsyncIterator, Callable, Iterable, Type
+
+from dyapi.entities.config import Config
+from dyapi.entities.pagination import CursorPaginationEntity, PaginationEntity
+from dyapi.implementations.storages.exceptions import AlreadyExistsError, NotFoundError
+from dyapi.implementations.storages.filters import split_filter
+from dyapi.implementations.storages.instrumented import InstrumentedStorage
+from dyapi.implementations.storages.rows import row_mapper
+from dyapi.interfaces.metrics import IMetrics
+from dyapi.interfaces.storages import IStorage, IStorageManager
+from dyapi.interfaces.tracing import ITracer
+from pydantic import BaseModel
+
+__all__ = ["MemoryStorage", "MemoryStorageManager"]
+
+Key = tuple[Any, ...]
+Row = tuple[Any, ...]
+
+# Whether a row's value passes a filter, with SQL's handling of nulls.
+PREDICATES: dict[str, Callable[[Any, Any], bool]] = {
+    "eq": eq,
+    "gt": lambda value, bound: value is not None and gt(value, bound),
+    "gte": lambda value, bound: value is not None and ge(value, bound),
+    "lt": lambda value, bound: value is not None and lt(value, bound),
+    "lte": lambda value, bound: value is not None and le(value, bound),
+    "in": lambda value, values: value in values,
+    "prefix": lambda value, prefix: value is not None and value.startswith(prefix),
+    "is_null": lambda value, null: (value is None) == null,
+}
+
+
+class MemoryStorage(IStorage):
+    """
+    Keeps the rows of a resource in process memory.
+
+    Each row is a tuple of the field values in config order, held in a hash
+    index by key. The keys are also kept sorted, so pages are sliced out of
+    them without visiting the rows before the page. Bulk writes sort the
+    keys once per call rather than once per row. Equality and `in`
+    filters on `indexes` fields are answered from secondary hash indexes
+    from value to keys; other filters scan the rows.
+
+    Apart from `stream`, no method awaits, so every operation runs to
+    completion before another task can see the storage. `stream` iterates a
+    snapshot of the matching keys, skipping rows deleted in the meantime.
+    """
+
+    def __init__(
+        self,
+        fields: list[str],
+        keys: list[str],
+        key_types: list[Any] | None = None,
+        indexes: Iterable[str] = (),
+        count: bool = True,
+        trusted: bool = False,
+        stream_batch_size: int = 1000,
+    ):
+        """
+
+        :param keys: fields identifying a row. Without keys, rows are told
+            apart by the order they were inserted in.
+        :param key_types: types of the keys, which cursors are validated
+            against. Any type by default.
+        :param indexes: fields to keep secondary indexes on.
+        :param count: whether list returns the total number of matching rows.
+        """
+        self.fields = fields
+        self.keys = keys
+        self.count = count
+        self.trusted = trusted
+        self.stream_batch_size = stream_batch_size
+        self.positions = {name: position for position, name in enumerate(fields)}
+        self.key_positions = [self.positions[name] for name in keys]
+        # Without keys, rows are keyed by insertion number.
+        self.key_types = (key_types or [Any] * len(keys)) if keys else [int]
+        self.rows: dict[Key, Row] = {}
+        self.order: list[Key] = []
+        self.indexes: dict[str, dict[Any, set[Key]]] = {
+            name: {} for name in indexes if name not in keys
+        }
+        self.sequence = itertools.count()
+
+    def row(self, entity: BaseModel) -> Row:
+        values = entity.model_dump()
+        return tuple(values.get(name) for name in self.fields)
+
+    def row_key(self, row: Row) -> Key:
+        if not self.keys:
+            return (next(self.sequence),)
+        return tuple(row[position] for position in self.key_positions)
+
+    def filter_key(self, filter_: BaseModel) -> Key:
+        values = filter_.model_dump()
+        return tuple(values[name] for name in self.keys)
+
+    def to_entity(self, row: Row, response_model: Type[BaseModel]) -> BaseModel:
+        return row_mapper(response_model, self.trusted)(row)
+
+    def store(self, key: Key, row: Row) -> None:
+        """
+        Adds the row to the hash indexes, leaving the key order to the
+        caller.
+        """
+        self.rows[key] = row
+        for name, index in self.indexes.items():
+            index.setdefault(row[self.positions[name]], set()).add(key)
+
+    def unstore(self, key: Key) -> Row:
+        row = self.rows.pop(key)
+        for name, index in self.indexes.items():
+            self.unindex(index, row[self.positions[name]], key)
+        return row
+
+    def insert(self, key: Key, row: Row) -> None:
+        self.store(key, row)
+        insort(self.order, key)
+
+    def remove(self, key: Key) -> Row:
+        del self.order[bisect_right(self.order, key) - 1]
+        return self.unstore(key)
+
+    def extend(self, keys: list[Key]) -> None:
+        """
+        Adds the keys of rows stored in one go to the key order. The order
+        and the sorted keys are two runs, which one sort merges in linear
+        time.
+        """
+        if keys:
+            keys.sort()
+            self.order += keys
+            self.order.sort()
+
+    def replace(self, key: Key, old: Row, new: Row) -> None:
+        self.reindex(key, old, new)
+        self.rows[key] = new
+
+    def reindex(self, key: Key, old: Row, new: Row) -> None:
+        for name, index in self.indexes.items():
+            position = self.positions[name]
+            if old[position] != new[position]:
+                self.unindex(index, old[position], key)
+                index.setdefault(new[position], set()).add(key)
+
+    @staticmethod
+    def unindex(index: dict[Any, set[Key]], value: Any, key: Key) -> None:
+        keys = index[value]
+        keys.discard(key)
+        if not keys:
+            del index[value]
+
+    def find(self, filter_: BaseModel) -> Key:
+        """
+        Returns the key of the row matching the filter, the first row if the
+        storage has no keys.
+        """
+        if not self.keys:
+            if not self.order:
+                raise NotFoundError
+            return self.order[0]
+        key = self.filter_key(filter_)
+        if key not in self.rows:
+            raise NotFoundError
+        return key
+
+    def select(self, filters: dict[str, Any]) -> list[Key]:
+        """
+        Returns the keys of the rows matching the filters in order. The
+        result may be the storage's own key list and must not be changed.
+        """
+        if not filters:
+            return self.order
+
+        predicates = []
+        equal: dict[str, Any] = {}
+        indexed: list[set[Key]] = []
+        for name, value in filters.items():
+            field, operator = split_filter(name)
+            if operator == "in":
+                value = set(value)
+            predicates.append((self.positions[field], PREDICATES[operator], value))
+            if operator == "eq":
+                equal[field] = value
+            if field in self.indexes and operator == "eq":
+                indexed.append(self.indexes[field].get(value, set()))
+            elif field in self.indexes and operator == "in":
+                index = self.indexes[field]
+                indexed.append(set().union(*[index.get(item, ()) for item in value]))
+
+        if self.keys and all(name in equal for name in self.keys):
+            candidates: Iterable[Key] = [tuple(equal[name] for name in self.keys)]
+        elif indexed:
+            indexed.sort(key=len)
+            candidates = indexed[0].intersection(*indexed[1:])
+        else:
+            candidates = self.order
+
+        keys = []
+        for key in candidates:
+            row = self.rows.get(key)
+            if row is not None and all(
+                predicate(row[position], value)
+                for position, predicate, value in predicates
+            ):
+                keys.append(key)
+        if candidates is not self.order:
+            keys.sort()
+        return keys
+
+    async def get(
+        self, filter_: BaseModel, response_model: Type[BaseModel]
+    ) -> BaseModel:
+        return self.to_entity(self.rows[self.find(filter_)], response_model)
+
+    async def get_many(
+        self, filters: list[BaseModel], response_model: Type[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        found: dict[Key, BaseModel] = {}
+        missing = []
+        for filter_ in filters:
+            key = self.filter_key(filter_)
+            row = self.rows.get(key)
+            if row is None:
+                missing.append(filter_)
+            elif key not in found:
+                found[key] = self.to_entity(row, response_model)
+        return list(found.values()), missing
+
+    async def create(self, entity: BaseModel) -> BaseModel:
+        row = self.row(entity)
+        key = self.row_key(row)
+        if key in self.rows:
+            raise AlreadyExistsError
+        self.insert(key, row)
+        return entity
+
+    async def update(
+        self, filter_: BaseModel, entity: BaseModel, response_model: Type[BaseModel]
+    ) -> BaseModel:
+        key = self.find(filter_)
+        row = list(self.rows[key])
+        for name, value in entity.model_dump().items():
+            row[self.positions[name]] = value
+        updated = tuple(row)
+        new_key = self.row_key(updated) if self.keys else key
+        if new_key == key:
+            self.replace(key, self.rows[key], updated)
+        elif new_key in self.rows:
+            raise AlreadyExistsError
+        else:
+            self.remove(key)
+            self.insert(new_key, updated)
+        return self.to_entity(updated, response_model)
+
+    async def delete(self, filter_: BaseModel) -> bool:
+        self.remove(self.find(filter_))
+        return True
+
+    async def create_many(
+        self, entities: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        created: list[BaseModel] = []
+        conflicts: list[BaseModel] = []
+        keys: list[Key] = []
+        for entity in entities:
+            row = self.row(entity)
+            key = self.row_key(row)
+            if key in self.rows:
+                conflicts.append(entity)
+            else:
+                self.store(key, row)
+                keys.append(key)
+                created.append(entity)
+        self.extend(keys)
+        return created, conflicts
+
+    async def upsert_many(self, entities: list[BaseModel]) -> list[BaseModel]:
+        # As in the database, the last entity with a key wins.
+        unique: dict[Key, tuple[BaseModel, Row]] = {}
+        for entity in entities:
+            row = self.row(entity)
+            unique[self.row_key(row)] = (entity, row)
+        keys: list[Key] = []
+        for key, (_, row) in unique.items():
+            old = self.rows.get(key)
+            if old is not None:
+                # The key keeps its place in the order.
+                self.replace(key, old, row)
+            else:
+                self.store(key, row)
+                keys.append(key)
+        self.extend(keys)
+        return [entity for entity, _ in unique.values()]
+
+    async def delete_many(
+        self, filters: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        deleted: list[BaseModel] = []
+        missing: list[BaseModel] = []
+        removed: set[Key] = set()
+        for filter_ in filters:
+            key = self.filter_key(filter_)
+            if key in self.rows:
+                self.unstore(key)
+                removed.add(key)
+            (deleted if key in removed else missing).append(filter_)
+        if removed:
+            self.order = [key for key in self.order if key not in removed]
+        return deleted, missing
+
+    async def list(
+        self,
+        filter_: BaseModel,
+        pagination: PaginationEntity | CursorPaginationEntity,
+        response_model: Type[BaseModel],
+    ) -> tuple[list[BaseModel], int | None]:
+        keys = self.select(filter_.model_dump(exclude_none=True))
+        if isinstance(pagination, CursorPaginationEntity):
+            values = pagination.key_values(self.key_types)
+            start = bisect_right(keys, tuple(values)) if values is not None else 0
+        else:
+            start = pagination.offset
+        page = keys[start : start + pagination.limit + 1]
+        entities = [self.to_entity(self.rows[key], response_model) for key in page]
+        return entities, len(keys) if self.count else None
+
+    async def stream(
+        self, filter_: BaseModel, response_model: Type[BaseModel]
+    ) -> AsyncIterator[BaseModel]:
+        keys = list(self.select(filter_.model_dump(exclude_none=True)))
+        for start in range(0, len(keys), self.stream_batch_size):
+            rows = [
+                self.rows.get(key)
+                for key in keys[start : start + self.stream_batch_size]
+            ]
+            for row in rows:
+                if row is not None:
+                    yield self.to_entity(row, response_model)
+            # Lets other tasks run between batches of a large export.
+            await asyncio.sleep(0)
+
+
+class MemoryStorageManager(IStorageManager):
+    """
+    Storage manager keeping every resource in process memory, e.g. for tests
+    or small datasets. The storage of a resource is kept by name, so building
+    the API again from the same config sees the same rows. A changed config
+    gets a new storage, since it may lay the rows out differently.
+    """
+
+    def __init__(
+        self,
+        metrics: IMetrics | None = None,
+        tracer: ITracer | None = None,
+    ):
+        self.metrics = metrics
+        self.tracer = tracer
+        self.storages: dict[str, MemoryStorage] = {}
+        self.configs: dict[str, Config] = {}
+
+    def discard(self, name: str, keep_latest: bool = False) -> None:
+        """
+        Drops the rows of the resource, unless they are those of the
+        replacement.
+        """
+        if not keep_latest:
+            self.storages.pop(name, None)
+            self.configs.pop(name, None)
+
+    def storage(self, config: Config) -> IStorage:
+        storage = self.storages.get(config.name)
+        if storage is None or self.configs[config.name] != config:
+            self.configs[config.name] = config
+            storage = self.storages[config.name] = MemoryStorage(
+                fields=[field.name for field in config.fields],
+                keys=[field.name for field in config.path_fields],
+                key_types=[field.type for field in config.path_fields],
+                indexes=[
+                    field.name
+                    for field in config.fields
+                    if field.filterable
+                    or field.index is not None
+                    or "in" in field.operators
+                ],
+                count=config.count_strategy != "none",
+                trusted=config.fast_path,
+            )
+        if self.metrics is None and self.tracer is None:
+            return storage
+        return InstrumentedStorage(
+            storage=storage,
+            resource=config.name,
+            metrics=self.metrics,
+            tracer=self.tracer,
+        )
@@ -0,0 +1,313 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from dyapi.entities.index_report import FilterShapeReport
+from dyapi.entities.index_settings import IndexSettings
+from dyapi.implementations.storages.filters import split_filter
+from sqlalchemy import PrimaryKeyConstraint, Select, Table, UniqueConstraint
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from .indexes import autocommit, build_index, create_index_concurrently
+from .statements import filter_values
+
+__all__ = ["IndexAdvisor", "FilterShape", "advisor_endpoint"]
+
+logger = logging.getLogger(__name__)
+
+Shape = tuple[str, str, tuple[str, ...]]
+
+# Operators matching a range of an index rather than single values.
+RANGES = {"gt", "gte", "lt", "lte", "prefix"}
+
+
+class Explain(Executable, ClauseElement):
+    """
+    EXPLAIN (FORMAT JSON) of a query, compiled with the query's bind
+    parameters so the values read are sent as such rather than inlined.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, query: Select[Any]):
+        self.query = query
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element: Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.query, **kw)}"
+
+
+class FilterShape:
+    """
+    Reads of one table with one operation filtering on one combination of
+    fields and operators, e.g. ("owner", "price__gte"). The values of the
+    last read are kept to explain the shape with.
+    """
+
+    def __init__(self, table: Table, operation: str, fields: tuple[str, ...]):
+        self.table = table
+        self.operation = operation
+        self.fields = fields
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.values: dict[str, Any] = {}
+        self.plan_cost: float | None = None
+        self.seq_scan: bool | None = None
+        self.created: str | None = None
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def observe(self, values: dict[str, Any], seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.values = values
+
+    @property
+    def columns(self) -> list[str]:
+        """
+        The filtered columns in the order a btree index on them serves best:
+        those compared for equality before those in ranges, each in table
+        order.
+        """
+        operators: dict[str, set[str]] = {}
+        for name in self.fields:
+            column, operator = split_filter(name)
+            operators.setdefault(column, set()).add(operator)
+        names = [column.name for column in self.table.c if column.name in operators]
+        ranged = [name for name in names if operators[name] & RANGES]
+        return [name for name in names if name not in ranged] + ranged
+
+    def covered(self) -> bool:
+        """
+        Whether an index or unique constraint of the table leads with exactly
+        the shape's columns, in any order.
+        """
+        fields = set(self.columns)
+        for index in self.table.indexes:
+            if index.dialect_options["postgresql"]["where"] is not None:
+                continue
+            if {column.name for column in index.columns[: len(fields)]} == fields:
+                return True
+        for constraint in self.table.constraints:
+            # Foreign key and check constraints have no index of their own.
+            if not isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint)):
+                continue
+            names = [column.name for column in constraint.columns]
+            if set(names[: len(fields)]) == fields:
+                return True
+        return False
+
+    def recommendation(self) -> IndexSettings | None:
+        """
+        A btree index on the columns if the last plan scanned the whole table
+        and no index already covers the shape.
+        """
+        if not self.fields or not self.seq_scan or self.covered():
+            return None
+        return IndexSettings(fields=self.columns)
+
+    def report(self) -> FilterShapeReport:
+        return FilterShapeReport(
+            resource=self.table.name,
+            operation=self.operation,
+            fields=list(self.fields),
+            count=self.count,
+            mean_seconds=self.mean_seconds,
+            max_seconds=self.max_seconds,
+            plan_cost=self.plan_cost,
+            seq_scan=self.seq_scan,
+            recommendation=self.recommendation(),
+            created=self.created,
+        )
+
+
+def scans(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from scans(child)
+
+
+class IndexAdvisor:
+    """
+    Records the filter shapes storages read with, i.e. the combination of
+    fields a `list` or `get` filtered on, and how long they took.
+
+    Every `interval` seconds the `explain` slowest shapes read at least
+    `min_count` times are explained. A shape the planner answers with a
+    sequential scan of its table and that no index covers gets a btree index
+    recommended. With `auto_create` set, recommended indexes of shapes read
+    at least that many times are created concurrently, which is opt-in since
+    it changes the schema and loads the database while building.
+
+    Only field names and the last values are kept per shape, and the filter
+    fields of a resource are fixed by its config, so the shapes stay few.
+    """
+
+    def __init__(
+        self,
+        pg_engine: AsyncEngine,
+        min_count: int = 100,
+        explain: int = 5,
+        interval: float = 60.0,
+        auto_create: int | None = None,
+    ):
+        self.pg_engine = pg_engine
+        self.min_count = min_count
+        self.explain = explain
+        self.interval = interval
+        self.auto_create = auto_create
+        self.shapes: dict[Shape, FilterShape] = {}
+        self.task: asyncio.Task[None] | None = None
+
+    def record(
+        self, table: Table, operation: str, filters: dict[str, Any], seconds: float
+    ) -> None:
+        fields = tuple(sorted(filters))
+        shape = self.shapes.get((table.name, operation, fields))
+        if shape is None:
+            shape = self.shapes[(table.name, operation, fields)] = FilterShape(
+                table, operation, fields
+            )
+        shape.observe(filters, seconds)
+
+    @contextmanager
+    def observe(
+        self, table: Table, operation: str, filters: dict[str, Any]
+    ) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(table, operation, filters, time.perf_counter() - start)
+
+    def discard(self, name: str) -> None:
+        """
+        Forgets the shapes of a table, e.g. one replaced by another config.
+        """
+        for key in [key for key in self.shapes if key[0] == name]:
+            del self.shapes[key]
+
+    def slowest(self) -> list[FilterShape]:
+        shapes = [
+            shape
+            for shape in self.shapes.values()
+            if shape.count >= self.min_count and shape.fields
+        ]
+        shapes.sort(key=lambda shape: shape.mean_seconds, reverse=True)
+        return shapes[: self.explain]
+
+    async def explain_shape(self, shape: FilterShape) -> None:
+        table = shape.table
+        query = table.select().where(*filter_values(table, shape.values))
+        async with self.pg_engine.connect() as conn:
+            result = await conn.execute(Explain(query))
+            document: Any = result.scalar()
+        if isinstance(document, str):
+            document = json.loads(document)
+        plan = document[0]["Plan"]
+        shape.plan_cost = plan["Total Cost"]
+        shape.seq_scan = any(
+            node["Node Type"] == "Seq Scan" and node.get("Relation Name") == table.name
+            for node in scans(plan)
+        )
+
+    async def create(self, shapes: list[FilterShape]) -> list[str]:
+        created = []
+        async with autocommit(self.pg_engine) as conn:
+            for shape in shapes:
+                settings = shape.recommendation()
+                if settings is None:
+                    continue
+                index = build_index(shape.table, settings)
+                if await create_index_concurrently(conn, self.pg_engine, index):
+                    shape.created = str(index.name)
+                    created.append(shape.created)
+                else:
+                    shape.table.indexes.discard(index)
+        return created
+
+    async def analyze(self) -> list[FilterShapeReport]:
+        """
+        Explains the slowest shapes, creates the indexes due if `auto_create`
+        is set and returns the report.
+        """
+        shapes = self.slowest()
+        for shape in shapes:
+            try:
+                await self.explain_shape(shape)
+            except Exception:
+                logger.exception(
+                    "Failed to explain %s of %s", shape.fields, shape.table.name
+                )
+        if self.auto_create is not None:
+            due = [shape for shape in shapes if shape.count >= self.auto_create]
+            if due:
+                for name in await self.create(due):
+                    logger.info("Created index %s", name)
+        return self.report()
+
+    def report(self) -> list[FilterShapeReport]:
+        """
+        Shapes from the slowest on average.
+        """
+        shapes = sorted(
+            self.shapes.values(), key=lambda shape: shape.mean_seconds, reverse=True
+        )
+        return [shape.report() for shape in shapes]
+
+    def dump(self, path: str | Path) -> None:
+        """
+        Writes the report to `path` as JSON, replacing it atomically.
+        """
+        path = Path(path)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}")
+        temporary.write_text(
+            json.dumps([report.model_dump(mode="json") for report in self.report()])
+        )
+        os.replace(temporary, path)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.analyze()
+            except Exception:
+                logger.exception("Failed to analyze filter shapes")
+
+    async def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+
+def advisor_endpoint(advisor: IndexAdvisor) -> Callable[[], Any]:
+    """
+    Returns a FastAPI endpoint serving the advisor's report, e.g. on an
+    admin route.
+    """
+
+    async def endpoint() -> list[FilterShapeReport]:
+        return advisor.report()
+
+    return endpoint
@@ -1,22 +1,146 @@
-from typing import Any, Callable, Type
+from contextlib import asynccontextmanager, nullcontext
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    Iterator,
+    Sequence,
+    Type,
+    TypeVar,
+    cast,
+)
 
 from asyncpg import UniqueViolationError
-from dyapi.entities.pagination import PaginationEntity
+from dyapi.entities.config import IngestMode
+from dyapi.entities.pagination import CursorPaginationEntity, PaginationEntity
 from dyapi.implementations.storages.exceptions import AlreadyExistsError, NotFoundError
+from dyapi.implementations.storages.postgres.advisor import IndexAdvisor
+from dyapi.implementations.storages.postgres.count import CountStrategy, ExactCount
+from dyapi.implementations.storages.postgres.ingest import copy_upsert, use_copy
+from dyapi.implementations.storages.postgres.pool import PoolMonitor
+from dyapi.implementations.storages.postgres.replicas import ReplicaRouter
+from dyapi.implementations.storages.postgres.statements import (
+    StatementCache,
+    filter_criteria,
+    filter_params,
+    filter_shape,
+    filter_values,
+)
+from dyapi.implementations.storages.rows import row_mapper
+from dyapi.implementations.tracing.tracer import span
 from dyapi.interfaces.storages import IStorage
 from pydantic import BaseModel
-from sqlalchemy import Table, func, select
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Integer,
+    Select,
+    Table,
+    UniqueConstraint,
+    bindparam,
+    delete,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import CursorResult
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
 __all__ = ["PostgresEngineStorage"]
 
+T = TypeVar("T")
+
+# asyncpg refuses statements with more bind parameters than this.
+MAX_PARAMETERS = 32767
+
+
+def key_columns(table: Table) -> list[Column[Any]]:
+    """
+    Returns the columns identifying a row: the primary key if the table has one,
+    otherwise the first unique constraint.
+    """
+    if table.primary_key.columns:
+        return list(table.primary_key.columns)
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint):
+            return list(constraint.columns)
+    return []
+
+
+def paginate(
+    query: Select[Any],
+    columns: list[Column[Any]],
+    pagination: PaginationEntity | CursorPaginationEntity,
+) -> Select[Any]:
+    """
+    Orders the query by the key columns and applies either offset or keyset
+    pagination, fetching one extra row to detect whether another page exists.
+    The values are bound as parameters, see `pagination_params`, so the
+    statement only depends on the shape of the pagination.
+    """
+    query = query.order_by(*columns).limit(bindparam("limit", type_=Integer))
+    if isinstance(pagination, CursorPaginationEntity):
+        if pagination.values is None:
+            return query
+        values = [
+            bindparam(f"cursor_{column.name}", type_=column.type) for column in columns
+        ]
+        if len(columns) == 1:
+            return query.where(columns[0] > values[0])
+        return query.where(tuple_(*columns) > tuple_(*values))
+    return query.offset(bindparam("offset", type_=Integer))
+
+
+def pagination_shape(pagination: PaginationEntity | CursorPaginationEntity) -> str:
+    if isinstance(pagination, CursorPaginationEntity):
+        return "cursor" if pagination.values is not None else "first"
+    return "offset"
+
+
+def python_type(column: Column[Any]) -> Any:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return Any
+
+
+def pagination_params(
+    columns: list[Column[Any]],
+    pagination: PaginationEntity | CursorPaginationEntity,
+) -> dict[str, Any]:
+    params: dict[str, Any] = {"limit": pagination.limit + 1}
+    if isinstance(pagination, CursorPaginationEntity):
+        values = pagination.key_values([python_type(column) for column in columns])
+        for column, value in zip(columns, values or []):
+            params[f"cursor_{column.name}"] = value
+    else:
+        params["offset"] = pagination.offset
+    return params
+
+
+def match_keys(
+    columns: list[Column[Any]], keys: list[tuple[Any, ...]]
+) -> ColumnElement[bool]:
+    if len(columns) == 1:
+        return columns[0].in_([key[0] for key in keys])
+    return tuple_(*columns).in_(keys)
+
+
+def chunks(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
 
 class PostgresStorage:
+    # Rows of the storage's own table are built without validation.
+    trusted: bool = False
+
     def row_to_entity(self, row: tuple[Any], entity: Type[BaseModel]) -> BaseModel:
-        return entity(**{key: row[i] for i, key in enumerate(entity.__fields__.keys())})  # type: ignore
+        return row_mapper(entity, self.trusted)(row)
 
 
 class PostgresEngineStorage(IStorage, PostgresStorage):
@@ -24,20 +148,99 @@ class PostgresEngineStorage(IStorage, PostgresStorage):
         self,
         pg_engine: AsyncEngine,
         table: Table,
+        count_strategy: CountStrategy | None = None,
+        chunk_size: int = 1000,
+        ingest: IngestMode = "insert",
+        copy_threshold: int = 10_000,
+        stream_batch_size: int = 1000,
+        trusted: bool = False,
+        router: ReplicaRouter | None = None,
+        pools: PoolMonitor | None = None,
+        advisor: IndexAdvisor | None = None,
     ):
         self.pg_engine = pg_engine
         self.table = table
-
-    async def execute_query(self, query: Any) -> Any:
-        async with self.pg_engine.begin() as conn:
-            result = await conn.execute(query)
-            conn.commit()
-            return result
+        self.count_strategy = count_strategy or ExactCount()
+        self.chunk_size = chunk_size
+        self.ingest = ingest
+        self.copy_threshold = copy_threshold
+        self.stream_batch_size = stream_batch_size
+        self.trusted = trusted
+        self.statements = StatementCache()
+        self.router = router
+        self.pools = pools
+        self.advisor = advisor
+
+    def advised(self, operation: str, filters: dict[str, Any]) -> ContextManager[None]:
+        """
+        Times the read for the index advisor, if the storage has one.
+        """
+        if self.advisor is None:
+            return nullcontext()
+        return self.advisor.observe(self.table, operation, filters)
+
+    def begin(self, engine: AsyncEngine) -> Any:
+        if self.pools is None:
+            return engine.begin()
+        return self.pools.begin(engine)
+
+    def mark_write(self) -> None:
+        if self.router is not None:
+            self.router.mark_write(self.table.name)
+
+    async def execute_query(
+        self, query: Any, params: dict[str, Any] | None = None
+    ) -> Any:
+        async with self.begin(self.pg_engine) as conn:
+            result = await conn.execute(query, params)
+        self.mark_write()
+        self.statements.record(result)
+        return result
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncConnection]:
+        async with self.begin(self.pg_engine) as conn:
+            yield conn
+        self.mark_write()
+
+    @asynccontextmanager
+    async def read_transaction(self) -> AsyncIterator[AsyncConnection]:
+        """
+        Transaction for read-only queries, on a replica if the storage has
+        a router.
+        """
+        if self.router is None:
+            async with self.transaction() as conn:
+                yield conn
+            return
+        async with self.router.reading(self.table.name) as engine:
+            async with self.begin(engine) as conn:
+                yield conn
+
+    async def read_query(self, query: Any, params: dict[str, Any] | None = None) -> Any:
+        if self.router is None:
+            return await self.execute_query(query, params)
+        async with self.read_transaction() as conn:
+            result = await conn.execute(query, params)
+        self.statements.record(result)
+        return result
+
+    async def stream_query(self, query: Any) -> AsyncIterator[Sequence[Any]]:
+        """
+        Yields the result in batches of `stream_batch_size` rows read from a
+        server-side cursor.
+        """
+        async with self.read_transaction() as conn:
+            result = await conn.stream(
+                query.execution_options(yield_per=self.stream_batch_size)
+            )
+            async for partition in result.partitions():
+                yield partition
 
     async def create(self, entity: BaseModel) -> BaseModel:
-        query = self.table.insert().values(entity.dict())
+        query = self.statements.get(("create",), self.table.insert)
         try:
-            await self.execute_query(query)
+            await self.execute_query(query, entity.dict())
         except IntegrityError as exc:
             if exc.orig.sqlstate == UniqueViolationError.sqlstate:
                 raise AlreadyExistsError from exc
@@ -47,64 +250,204 @@ class PostgresEngineStorage(IStorage, PostgresStorage):
     async def get(
         self, filter_: BaseModel, response_model: Type[BaseModel]
     ) -> BaseModel:
-        filter_stmnts = [
-            getattr(self.table.c, key) == value for key, value in filter_.dict().items()
-        ]
-        query = self.table.select().where(*filter_stmnts)
-        result = await self.execute_query(query)
+        filters = filter_.dict()
+        query = self.statements.get(
+            ("get", *filters),
+            lambda: self.table.select().where(*filter_criteria(self.table, filters)),
+        )
+        with self.advised("get", filters):
+            result = await self.read_query(query, filter_params(filters))
         result = result.fetchone()
         if not result:
             raise NotFoundError
         return self.row_to_entity(result, response_model)
 
+    async def get_many(
+        self, filters: list[BaseModel], response_model: Type[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        columns = key_columns(self.table)
+        found: dict[tuple[Any, ...], BaseModel] = {}
+
+        for chunk in chunks(filters, self.batch_size):
+            keys = [self.entity_key(filter_.model_dump()) for filter_ in chunk]
+            query = self.table.select().where(match_keys(columns, keys))
+            rows = list(await self.read_query(query))
+            with span("row_mapping", rows=len(rows)):
+                for row in rows:
+                    entity = self.row_to_entity(row, response_model)
+                    found[self.entity_key(dict(entity))] = entity
+
+        missing = [
+            filter_
+            for filter_ in filters
+            if self.entity_key(filter_.model_dump()) not in found
+        ]
+        return list(found.values()), missing
+
     async def update(
         self, filter_: BaseModel, entity: BaseModel, response_model: Type[BaseModel]
     ) -> BaseModel:
-        filter_stmnts = [
-            getattr(self.table.c, key) == value for key, value in filter_.dict().items()
-        ]
-        query = self.table.update().where(*filter_stmnts).values(entity.dict())
-        await self.execute_query(query)
-        return await self.get(filter_, response_model)
+        filters = filter_.dict()
+        values = entity.dict()
+        if not values:
+            return await self.get(filter_, response_model)
+
+        query = self.statements.get(
+            ("update", tuple(filters), tuple(values)),
+            lambda: self.table.update()
+            .where(*filter_criteria(self.table, filters))
+            .values({name: bindparam(f"value_{name}") for name in values})
+            .returning(*self.table.c),
+        )
+        params = filter_params(filters)
+        params.update({f"value_{name}": value for name, value in values.items()})
+        result = (await self.execute_query(query, params)).fetchone()
+        if not result:
+            raise NotFoundError
+        return self.row_to_entity(result, response_model)
 
     async def delete(self, filter_: BaseModel) -> bool:
-        filter_stmnts = [
-            getattr(self.table.c, key) == value for key, value in filter_.dict().items()
-        ]
-        query = self.table.delete().where(*filter_stmnts)
-        result = await self.execute_query(query)
-        return bool(result.rowcount)
+        filters = filter_.dict()
+        query = self.statements.get(
+            ("delete", *filters),
+            lambda: self.table.delete().where(*filter_criteria(self.table, filters)),
+        )
+        result = await self.execute_query(query, filter_params(filters))
+        if not result.rowcount:
+            raise NotFoundError
+        return True
+
+    @property
+    def batch_size(self) -> int:
+        """
+        Rows per multi-row statement, capped by the bind parameter limit.
+        """
+        return max(1, min(self.chunk_size, MAX_PARAMETERS // len(self.table.c)))
+
+    def entity_key(self, values: dict[str, Any]) -> tuple[Any, ...]:
+        return tuple(values[column.name] for column in key_columns(self.table))
+
+    async def create_many(
+        self, entities: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        columns = key_columns(self.table)
+        created: list[BaseModel] = []
+        conflicts: list[BaseModel] = []
+
+        for chunk in chunks(entities, self.batch_size):
+            rows = [entity.model_dump() for entity in chunk]
+            query = insert(self.table).values(rows)
+            if not columns:
+                await self.execute_query(query)
+                created.extend(chunk)
+                continue
+
+            returning = query.on_conflict_do_nothing(
+                index_elements=[column.name for column in columns]
+            ).returning(*columns)
+            inserted = {tuple(row) for row in (await self.execute_query(returning))}
+            for entity, row in zip(chunk, rows):
+                key = self.entity_key(row)
+                if key in inserted:
+                    # A key repeated within the batch is only inserted once.
+                    inserted.discard(key)
+                    created.append(entity)
+                else:
+                    conflicts.append(entity)
+
+        return created, conflicts
+
+    async def upsert_many(self, entities: list[BaseModel]) -> list[BaseModel]:
+        columns = key_columns(self.table)
+        if columns:
+            # ON CONFLICT DO UPDATE cannot touch the same row twice, the last
+            # entity with a given key wins.
+            unique = {
+                self.entity_key(entity.model_dump()): entity for entity in entities
+            }
+            entities = list(unique.values())
+        if use_copy(self.ingest, len(entities), self.copy_threshold):
+            async with self.transaction() as conn:
+                await copy_upsert(conn, self.table, columns, entities)
+            return entities
+
+        names = [column.name for column in columns]
+        updated = [column.name for column in self.table.c if column.name not in names]
+
+        for chunk in chunks(entities, self.batch_size):
+            query = insert(self.table).values([entity.model_dump() for entity in chunk])
+            if columns and updated:
+                query = query.on_conflict_do_update(
+                    index_elements=names,
+                    set_={name: query.excluded[name] for name in updated},
+                )
+            elif columns:
+                query = query.on_conflict_do_nothing(index_elements=names)
+            await self.execute_query(query)
+
+        return entities
+
+    async def delete_many(
+        self, filters: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        columns = key_columns(self.table)
+        deleted: list[BaseModel] = []
+        missing: list[BaseModel] = []
+
+        for chunk in chunks(filters, self.batch_size):
+            keys = [self.entity_key(filter_.model_dump()) for filter_ in chunk]
+            query = (
+                self.table.delete().where(match_keys(columns, keys)).returning(*columns)
+            )
+            found = {tuple(row) for row in (await self.execute_query(query))}
+            for filter_, key in zip(chunk, keys):
+                (deleted if key in found else missing).append(filter_)
+
+        return deleted, missing
 
     async def list(
         self,
         filter_: BaseModel,
-        pagination: PaginationEntity,
+        pagination: PaginationEntity | CursorPaginationEntity,
         response_model: Type[BaseModel],
-    ) -> tuple[list[BaseModel], int]:
-        filter_stmnts = [
-            getattr(self.table.c, key) == value
-            for key, value in filter_.dict().items()
-            if value is not None
-        ]
-        query = (
-            self.table.select()
-            .where(*filter_stmnts)
-            .limit(pagination.limit)
-            .offset(pagination.offset)
-        )
-
-        total_count_query = (
-            select(func.count()).select_from(self.table).where(*filter_stmnts)
+    ) -> tuple[list[BaseModel], int | None]:
+        filters = filter_.dict(exclude_none=True)
+        columns = key_columns(self.table)
+        query = self.statements.get(
+            ("list", pagination_shape(pagination), *filter_shape(filters)),
+            lambda: paginate(
+                self.count_strategy.select(
+                    self.table.select().where(*filter_criteria(self.table, filters))
+                ),
+                columns,
+                pagination,
+            ),
         )
+        params = filter_params(filters)
+        params.update(pagination_params(columns, pagination))
 
-        result = await self.execute_query(query)
+        with self.advised("list", filters):
+            result = await self.read_query(query, params)
         result = result.fetchall()
 
-        total_count = await self.execute_query(total_count_query)
+        # Count strategies key and estimate on the filter values, so they get
+        # criteria with the values inlined.
+        total_count = await self.count_strategy.count(
+            self.read_query, self.table, filter_values(self.table, filters), result
+        )
 
-        return [
-            self.row_to_entity(row, response_model) for row in result
-        ], total_count.fetchone()[0]
+        with span("row_mapping", rows=len(result)):
+            entities = [self.row_to_entity(row, response_model) for row in result]
+        return entities, total_count
+
+    async def stream(
+        self, filter_: BaseModel, response_model: Type[BaseModel]
+    ) -> AsyncIterator[BaseModel]:
+        criteria = filter_values(self.table, filter_.dict(exclude_none=True))
+        query = self.table.select().where(*criteria).order_by(*key_columns(self.table))
+        async for partition in self.stream_query(query):
+            for row in partition:
+                yield self.row_to_entity(row, response_model)
 
 
 class PostgresSessionStorage(PostgresEngineStorage):
@@ -112,17 +455,48 @@ class PostgresSessionStorage(PostgresEngineStorage):
         self,
         get_session: Callable[[], AsyncSession],
         table: Table,
+        count_strategy: CountStrategy | None = None,
+        chunk_size: int = 1000,
+        ingest: IngestMode = "insert",
+        copy_threshold: int = 10_000,
+        stream_batch_size: int = 1000,
+        trusted: bool = False,
     ):
         self.get_session = get_session
         self.table = table
+        self.count_strategy = count_strategy or ExactCount()
+        self.chunk_size = chunk_size
+        self.ingest = ingest
+        self.copy_threshold = copy_threshold
+        self.stream_batch_size = stream_batch_size
+        self.trusted = trusted
+        self.statements = StatementCache()
+        # Sessions are bound by the application, reads are not rerouted and
+        # their pools are not monitored.
+        self.router = None
+        self.pools = None
+        self.advisor = None
+
+    async def execute_query(
+        self, query: Any, params: dict[str, Any] | None = None
+    ) -> Any:
+        session = self.get_session()
+        async with session.begin():
+            result = await session.execute(query, params)
+        self.statements.record(result)
+        return result
 
-    async def execute_query(self, query: Any) -> Any:
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncConnection]:
         session = self.get_session()
         async with session.begin():
-            return await session.execute(query)
+            yield await session.connection()
 
 
 class SQLAlchemyStorage:
+    # Shared by every model, the keys include the model type.
+    statements = StatementCache()
+
     @staticmethod
     async def create(
         model: DeclarativeBase,
@@ -142,7 +516,16 @@ class SQLAlchemyStorage:
         entities: list[BaseModel],
         model_type: Type[DeclarativeBase],
         session: AsyncSession,
+        ingest: IngestMode = "insert",
+        copy_threshold: int = 10_000,
     ) -> list[BaseModel]:
+        if use_copy(ingest, len(entities), copy_threshold):
+            table: Table = model_type.__table__  # type: ignore
+            await copy_upsert(
+                await session.connection(), table, key_columns(table), entities
+            )
+            return entities
+
         stmt = insert(model_type.__table__).values([e.model_dump() for e in entities])
         pk_fields: list[str] = [
             field_name
@@ -162,18 +545,50 @@ class SQLAlchemyStorage:
         await session.flush()
         return entities
 
-    @staticmethod
+    @classmethod
     async def get(
+        cls,
         model_type: Type[DeclarativeBase],
         session: AsyncSession,
         filter_: BaseModel,
     ) -> DeclarativeBase:
-        query = select(model_type).filter_by(**filter_.model_dump())
-        model = (await session.execute(query)).fetchone()
+        table: Table = model_type.__table__  # type: ignore
+        filters = filter_.model_dump()
+        query = cls.statements.get(
+            (model_type, "get", *filters),
+            lambda: select(model_type).where(*filter_criteria(table, filters)),
+        )
+        model = (await session.execute(query, filter_params(filters))).fetchone()
         if model is None:
             raise NotFoundError
         return model[0]
 
+    @staticmethod
+    async def get_many(
+        model_type: Type[DeclarativeBase],
+        session: AsyncSession,
+        filters: list[BaseModel],
+    ) -> tuple[list[DeclarativeBase], list[BaseModel]]:
+        if not filters:
+            return [], []
+        table: Table = model_type.__table__  # type: ignore
+        names = [*filters[0].model_dump()]
+        columns = [table.c[name] for name in names]
+        keys = list({tuple(filter_.model_dump().values()): None for filter_ in filters})
+
+        found: dict[tuple[Any, ...], DeclarativeBase] = {}
+        for chunk in chunks(keys, max(1, MAX_PARAMETERS // len(columns))):
+            query = select(model_type).where(match_keys(columns, list(chunk)))
+            for model in (await session.scalars(query)).all():
+                found[tuple(getattr(model, name) for name in names)] = model
+
+        missing = [
+            filter_
+            for filter_ in filters
+            if tuple(filter_.model_dump().values()) not in found
+        ]
+        return list(found.values()), missing
+
     @classmethod
     async def update(
         cls,
@@ -182,45 +597,110 @@ class SQLAlchemyStorage:
         filter_: BaseModel,
         body: BaseModel,
     ) -> DeclarativeBase:
-        model: model_type = await cls.get(  # type: ignore
-            model_type=model_type, session=session, filter_=filter_
+        values = body.model_dump()
+        if not values:
+            return await cls.get(
+                model_type=model_type, session=session, filter_=filter_
+            )
+
+        table: Table = model_type.__table__  # type: ignore
+        filters = filter_.model_dump()
+        # The values are only known at execution, so objects already in the
+        # session are refreshed from the returned row instead.
+        query = cls.statements.get(
+            (model_type, "update", tuple(filters), tuple(values)),
+            lambda: update(model_type)
+            .where(*filter_criteria(table, filters))
+            .values({name: bindparam(f"value_{name}") for name in values})
+            .returning(model_type)
+            .execution_options(populate_existing=True),
         )
-        for key, value in body.model_dump().items():
-            setattr(model, key, value)
-
-        await session.flush()
+        params = filter_params(filters)
+        params.update({f"value_{name}": value for name, value in values.items()})
+        model = (await session.execute(query, params)).scalar_one_or_none()
+        if model is None:
+            raise NotFoundError
         return model
 
-    @staticmethod
+    @classmethod
     async def delete(
+        cls,
         model_type: Type[DeclarativeBase],
         session: AsyncSession,
         filter_: BaseModel,
     ) -> bool:
-        model = await SQLAlchemyStorage.get(model_type, session, filter_)
-        await session.delete(model)
-        await session.flush()
+        table: Table = model_type.__table__  # type: ignore
+        filters = filter_.model_dump()
+        query = cls.statements.get(
+            (model_type, "delete", *filters),
+            lambda: delete(model_type).where(*filter_criteria(table, filters)),
+        )
+        result = cast(
+            CursorResult[Any],
+            await session.execute(query, filter_params(filters)),
+        )
+        if not result.rowcount:
+            raise NotFoundError
         return True
 
-    @staticmethod
+    @classmethod
     async def list(
+        cls,
         model_type: Type[DeclarativeBase],
         session: AsyncSession,
         filter_: BaseModel,
-        pagination: PaginationEntity,
-    ) -> tuple[list[DeclarativeBase], int]:
-        query = select(model_type)
-        total_count_query = select(func.count()).select_from(model_type)
-
-        filter_data = filter_.model_dump(exclude_none=True)
-
-        if filter_data:
-            query = query.filter_by(**filter_data)
-            total_count_query = total_count_query.filter_by(**filter_data)
-
-        query = query.limit(pagination.limit).offset(pagination.offset)
+        pagination: PaginationEntity | CursorPaginationEntity,
+        count_strategy: CountStrategy | None = None,
+    ) -> tuple[list[DeclarativeBase], int | None]:
+        count_strategy = count_strategy or ExactCount()
+        table: Table = model_type.__table__  # type: ignore
+        filters = filter_.model_dump(exclude_none=True)
+        columns = key_columns(table)
+        query = cls.statements.get(
+            (
+                model_type,
+                "list",
+                pagination_shape(pagination),
+                type(count_strategy),
+                *filter_shape(filters),
+            ),
+            lambda: paginate(
+                count_strategy.select(
+                    select(model_type).where(*filter_criteria(table, filters))
+                ),
+                columns,
+                pagination,
+            ),
+        )
+        params = filter_params(filters)
+        params.update(pagination_params(columns, pagination))
 
-        result = (await session.execute(query)).fetchall()
-        total_count = (await session.execute(total_count_query)).fetchone()[0]
+        result = (await session.execute(query, params)).fetchall()
+        total_count = await count_strategy.count(
+            session.execute, table, filter_values(table, filters), result
+        )
 
         return [row[0] for row in result], total_count
+
+    @staticmethod
+    async def stream(
+        model_type: Type[DeclarativeBase],
+        session: AsyncSession,
+        filter_: BaseModel,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Any]:
+        """
+        Yields plain rows rather than ORM objects so that nothing accumulates
+        in the session identity map while streaming.
+        """
+        table: Table = model_type.__table__  # type: ignore
+        query = (
+            select(*table.c)
+            .where(*filter_values(table, filter_.model_dump(exclude_none=True)))
+            .order_by(*key_columns(table))
+            .execution_options(yield_per=batch_size)
+        )
+        result = await session.stream(query)
+        async for partition in result.partitions():
+            for row in partition:
+                yield row
@@ -0,0 +1,173 @@
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Sequence
+
+from dyapi.entities.config import CountStrategyName
+from sqlalchemy import ColumnElement, Select, Table, func, select, text
+from sqlalchemy.dialects import postgresql
+
+__all__ = [
+    "CountStrategy",
+    "ExactCount",
+    "EstimatedCount",
+    "CachedCount",
+    "WindowCount",
+    "NoCount",
+    "build_count_strategy",
+]
+
+Executor = Callable[[Any], Awaitable[Any]]
+
+# Named parameters keep the compiled statement usable with text().
+dialect = postgresql.dialect(paramstyle="named")
+
+
+class CountStrategy(ABC):
+    def select(self, query: Select[Any]) -> Select[Any]:
+        """
+        Adjusts the page query before it is executed.
+        """
+        return query
+
+    @abstractmethod
+    async def count(
+        self,
+        execute: Executor,
+        table: Table,
+        criteria: list[ColumnElement[bool]],
+        rows: Sequence[Any],
+    ) -> int | None:
+        """
+        Returns the total number of rows matching the criteria, or None if
+        the strategy does not count.
+        """
+        ...
+
+
+class ExactCount(CountStrategy):
+    async def count(
+        self,
+        execute: Executor,
+        table: Table,
+        criteria: list[ColumnElement[bool]],
+        rows: Sequence[Any],
+    ) -> int | None:
+        query = select(func.count()).select_from(table).where(*criteria)
+        return (await execute(query)).fetchone()[0]
+
+
+class EstimatedCount(ExactCount):
+    """
+    Uses the planner statistics instead of counting: `pg_class.reltuples` for
+    unfiltered queries and the `EXPLAIN` row estimate otherwise. Falls back to
+    an exact count for tables that were never analyzed.
+    """
+
+    async def count(
+        self,
+        execute: Executor,
+        table: Table,
+        criteria: list[ColumnElement[bool]],
+        rows: Sequence[Any],
+    ) -> int | None:
+        if not criteria:
+            query = text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = CAST(:name AS regclass)"
+            ).bindparams(name=table.fullname)
+            estimate = (await execute(query)).fetchone()[0]
+        else:
+            compiled = select(table).where(*criteria).compile(dialect=dialect)
+            query = text(f"EXPLAIN (FORMAT JSON) {compiled}").bindparams(
+                **compiled.params
+            )
+            plan = (await execute(query)).fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"]
+
+        if estimate < 0:
+            return await super().count(execute, table, criteria, rows)
+        return int(estimate)
+
+
+class CachedCount(ExactCount):
+    """
+    Caches exact counts per filter for `ttl` seconds, keeping at most
+    `maxsize` filters.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.counts: OrderedDict[str, tuple[float, int | None]] = OrderedDict()
+
+    async def count(
+        self,
+        execute: Executor,
+        table: Table,
+        criteria: list[ColumnElement[bool]],
+        rows: Sequence[Any],
+    ) -> int | None:
+        compiled = select(table).where(*criteria).compile(dialect=dialect)
+        key = f"{compiled}{sorted(compiled.params.items())}"
+        now = time.monotonic()
+
+        cached = self.counts.get(key)
+        if cached is not None and cached[0] > now:
+            self.counts.move_to_end(key)
+            return cached[1]
+
+        total = await super().count(execute, table, criteria, rows)
+        self.counts[key] = (now + self.ttl, total)
+        self.counts.move_to_end(key)
+        if len(self.counts) > self.maxsize:
+            self.counts.popitem(last=False)
+        return total
+
+
+class WindowCount(ExactCount):
+    """
+    Counts in the page query itself with `count(*) OVER ()`. Only an empty
+    page needs a separate count. In cursor mode the total covers the rows
+    from the cursor onwards.
+    """
+
+    def select(self, query: Select[Any]) -> Select[Any]:
+        return query.add_columns(func.count().over().label("total_count"))
+
+    async def count(
+        self,
+        execute: Executor,
+        table: Table,
+        criteria: list[ColumnElement[bool]],
+        rows: Sequence[Any],
+    ) -> int | None:
+        if rows:
+            return rows[0][-1]
+        return await super().count(execute, table, criteria, rows)
+
+
+class NoCount(CountStrategy):
+    async def count(
+        self,
+        execute: Executor,
+        table: Table,
+        criteria: list[ColumnElement[bool]],
+        rows: Sequence[Any],
+    ) -> int | None:
+        return None
+
+
+def build_count_strategy(name: CountStrategyName, ttl: float = 60.0) -> CountStrategy:
+    if name == "estimated":
+        return EstimatedCount()
+    if name == "cached":
+        return CachedCount(ttl=ttl)
+    if name == "window":
+        return WindowCount()
+    if name == "none":
+        return NoCount()
+    return ExactCount()
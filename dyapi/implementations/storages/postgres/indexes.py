@@ -0,0 +1,122 @@
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable
+
+from dyapi.entities.index_settings import IndexSettings
+from sqlalchemy import Index, Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.schema import CreateIndex
+
+__all__ = ["build_index", "create_index_concurrently", "create_indexes_concurrently"]
+
+logger = logging.getLogger(__name__)
+
+# Postgres truncates longer identifiers.
+MAX_NAME = 63
+
+
+def index_name(table: str, settings: IndexSettings) -> str:
+    if settings.name is not None:
+        return settings.name
+    name = "_".join(["ix", table, *settings.fields])
+    if settings.method != "btree":
+        name += f"_{settings.method}"
+    if settings.where is not None:
+        name += "_partial"
+    if len(name) <= MAX_NAME:
+        return name
+    # Names cut to the same prefix must stay distinct.
+    digest = hashlib.sha1(name.encode()).hexdigest()[:8]
+    return f"{name[: MAX_NAME - 9]}_{digest}"
+
+
+def build_index(table: Table, settings: IndexSettings) -> Index:
+    """
+    Defines the index on the table, as part of it, so creating the table
+    creates the index.
+    """
+    return Index(
+        index_name(table.name, settings),
+        *[table.c[field] for field in settings.fields],
+        postgresql_using=settings.method,
+        postgresql_where=text(settings.where) if settings.where else None,
+    )
+
+
+def create_statement(index: Index, engine: AsyncEngine) -> str:
+    """
+    Compiles CREATE INDEX CONCURRENTLY IF NOT EXISTS for the index. The
+    option is only set while compiling: `metadata.create_all` creates the
+    indexes of new tables inside its transaction, where CONCURRENTLY fails.
+    """
+    options = index.dialect_options["postgresql"]
+    options["concurrently"] = True
+    try:
+        return str(
+            CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect)
+        )
+    finally:
+        options["concurrently"] = False
+
+
+def drop_statement(index: Index, engine: AsyncEngine) -> str:
+    """
+    Compiles DROP INDEX CONCURRENTLY IF EXISTS for the index, qualified with
+    the schema of its table since indexes live in the schema of their table.
+    """
+    preparer = engine.dialect.identifier_preparer
+    name = preparer.quote(str(index.name))
+    schema = index.table.schema if index.table is not None else None
+    if schema is not None:
+        name = f"{preparer.quote_schema(schema)}.{name}"
+    return f"DROP INDEX CONCURRENTLY IF EXISTS {name}"
+
+
+@asynccontextmanager
+async def autocommit(engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+    """
+    Connection running each statement outside a transaction, as CONCURRENTLY
+    requires.
+    """
+    async with engine.connect() as conn:
+        yield await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+
+async def create_index_concurrently(
+    conn: AsyncConnection, engine: AsyncEngine, index: Index
+) -> bool:
+    """
+    Creates the index on an autocommit connection without locking out
+    writes. An index failing to build is dropped again, since Postgres
+    leaves it behind invalid. Neither failure is raised, so the indexes
+    created after it are not held up.
+    """
+    try:
+        await conn.execute(text(create_statement(index, engine)))
+    except Exception:
+        logger.exception("Failed to create index %s", index.name)
+        try:
+            await conn.execute(text(drop_statement(index, engine)))
+        except Exception:
+            logger.exception("Failed to drop invalid index %s", index.name)
+        return False
+    return True
+
+
+async def create_indexes_concurrently(
+    engine: AsyncEngine, tables: Iterable[Table]
+) -> list[str]:
+    """
+    Creates the missing indexes of existing tables concurrently. An index
+    failing to build does not stop the others.
+
+    Returns the names of the indexes created or already present.
+    """
+    created = []
+    async with autocommit(engine) as conn:
+        for table in tables:
+            for index in table.indexes:
+                if await create_index_concurrently(conn, engine, index):
+                    created.append(str(index.name))
+    return created
@@ -0,0 +1,69 @@
+from typing import Any, Iterable
+
+from dyapi.entities.config import IngestMode
+from pydantic import BaseModel
+from sqlalchemy import Column, Table, column, literal_column, select, table, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+__all__ = ["use_copy", "copy_upsert"]
+
+preparer = postgresql.dialect().identifier_preparer
+
+
+def use_copy(mode: IngestMode, count: int, threshold: int) -> bool:
+    return mode == "copy" or (mode == "auto" and count >= threshold)
+
+
+async def copy_upsert(
+    connection: AsyncConnection,
+    target: Table,
+    keys: list[Column[Any]],
+    entities: Iterable[BaseModel],
+) -> None:
+    """
+    Streams the entities with binary COPY into a temporary staging table and
+    merges them into the target with a single INSERT ... SELECT ... ON CONFLICT.
+    The last entity with a given key wins, as with the multi-row INSERT path.
+    Must run inside a transaction on an asyncpg connection.
+    """
+    names = [item.name for item in target.c]
+    key_names = [item.name for item in keys]
+    staging = table(f"dyapi_staging_{target.name}", *[column(name) for name in names])
+
+    # Executing through SQLAlchemy first makes sure the transaction has begun
+    # on the driver connection before the COPY uses it directly.
+    await connection.execute(
+        text(
+            f"CREATE TEMP TABLE {preparer.quote(staging.name)} "
+            f"(LIKE {preparer.format_table(target)} INCLUDING DEFAULTS) "
+            "ON COMMIT DROP"
+        )
+    )
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(  # type: ignore
+        staging.name,
+        records=(tuple(getattr(entity, name) for name in names) for entity in entities),
+        columns=names,
+    )
+
+    rows = select(*staging.c)
+    if key_names:
+        rows = rows.distinct(*[staging.c[name] for name in key_names]).order_by(
+            *[staging.c[name] for name in key_names], literal_column("ctid").desc()
+        )
+    query = insert(target).from_select(names, rows)
+    updated = [name for name in names if name not in key_names]
+    if key_names and updated:
+        query = query.on_conflict_do_update(
+            index_elements=key_names,
+            set_={name: query.excluded[name] for name in updated},
+        )
+    elif key_names:
+        query = query.on_conflict_do_nothing(index_elements=key_names)
+    await connection.execute(query)
+
+    # The staging table would otherwise live until commit and clash with the
+    # next ingest in the same transaction.
+    await connection.execute(text(f"DROP TABLE {preparer.quote(staging.name)}"))
@@ -1,18 +1,48 @@
-from typing import Callable
+import asyncio
+import logging
+from typing import Any, Callable, Sequence
 
 from dyapi.entities.config import Config, ConfigField
+from dyapi.implementations.caches.memory import MemoryCacheBackend
+from dyapi.implementations.storages.batching import BatchingStorage
+from dyapi.implementations.storages.cached import CachedStorage
+from dyapi.implementations.storages.instrumented import InstrumentedStorage
+from dyapi.interfaces.caches import ICacheBackend, IInvalidationBus
+from dyapi.interfaces.metrics import IMetrics
 from dyapi.interfaces.storages import IStorage, IStorageManager
+from dyapi.interfaces.tracing import ITracer
 from sqlalchemy import Column, Float, Integer, MetaData, String, Table, UniqueConstraint
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
+from .advisor import IndexAdvisor
 from .base import PostgresEngineStorage, PostgresSessionStorage
+from .count import build_count_strategy
+from .indexes import build_index, create_indexes_concurrently
+from .pool import PoolController, PoolMonitor
+from .replicas import Balancing, ReplicaRouter
 
 __all__ = ["PostgresEngineStorageManager"]
 
+logger = logging.getLogger(__name__)
+
 
 class PostgresStorageManager:
+    cache_backend: ICacheBackend | None
+    invalidation_bus: IInvalidationBus | None
+    router: ReplicaRouter | None = None
+    metrics: IMetrics | None = None
+    tracer: ITracer | None = None
+    pools: PoolMonitor | None = None
+    advisor: IndexAdvisor | None = None
+    metadata: MetaData
+    controllers: Sequence[PoolController] = ()
+    # The caches built per resource, the latest last.
+    caches: dict[str, list[CachedStorage]]
+    # The event loop only keeps weak references to running tasks.
+    clearing: set[asyncio.Task[None]]
+
     @staticmethod
-    def generate_column(field: ConfigField) -> Column:
+    def generate_column(field: ConfigField) -> Column[Any]:
         if field.type == str:
             return Column(field.name, String)
         if field.type == int:
@@ -21,54 +51,293 @@ class PostgresStorageManager:
             return Column(field.name, Float)
         raise ValueError(f"Unknown type {field.type}")
 
+    def build_table(self, config: Config) -> Table:
+        """
+        Defines the resource's table in the metadata, replacing the table of
+        a config it replaces. Storages built before keep their own table.
+        """
+        previous = self.metadata.tables.get(config.name)
+        if previous is not None:
+            self.metadata.remove(previous)
+        table = Table(
+            config.name,
+            self.metadata,
+            *[self.generate_column(field) for field in config.fields],
+            UniqueConstraint(
+                *[field.name for field in config.path_fields],
+            ),
+        )
+        for index in config.declared_indexes:
+            build_index(table, index)
+        return table
+
+    def instrumented(self, storage: IStorage, config: Config) -> IStorage:
+        """
+        Records and traces the database operations of the resource if metrics
+        or tracing are enabled.
+        """
+        if self.metrics is None and self.tracer is None:
+            return storage
+        return InstrumentedStorage(
+            storage=storage,
+            resource=config.name,
+            metrics=self.metrics,
+            tracer=self.tracer,
+        )
+
+    def batched(self, storage: IStorage, config: Config) -> IStorage:
+        """
+        Coalesces concurrent gets by key if the config enables batching.
+        """
+        if config.batching is None:
+            return storage
+        return BatchingStorage(
+            storage=storage,
+            keys=[field.name for field in config.path_fields],
+            window=config.batching.window,
+            max_size=config.batching.max_size,
+        )
+
+    def cached(self, storage: IStorage, config: Config) -> IStorage:
+        """
+        Wraps the storage in a read-through cache if the config enables one.
+        Without a shared backend each resource gets its own in-memory cache.
+        """
+        if config.cache is None:
+            return storage
+        backend = self.cache_backend
+        if backend is None:
+            backend = MemoryCacheBackend(
+                maxsize=config.cache.maxsize, ttl=config.cache.ttl
+            )
+        cached = CachedStorage(
+            storage=storage,
+            backend=backend,
+            namespace=config.name,
+            keys=[field.name for field in config.path_fields],
+            bus=self.invalidation_bus,
+        )
+        if self.invalidation_bus is not None:
+            self.invalidation_bus.subscribe(config.name, cached.evict)
+        self.caches.setdefault(config.name, []).append(cached)
+        return cached
+
+    def discard(self, name: str, keep_latest: bool = False) -> None:
+        """
+        Removes the resource's table from the metadata, so a replacing config
+        can define it again, unless the replacement was built already. The
+        table itself is left in the database. The caches of the storages let
+        go of stop receiving invalidations and are cleared.
+        """
+        if not keep_latest:
+            table = self.metadata.tables.get(name)
+            if table is not None:
+                self.metadata.remove(table)
+        caches = self.caches.pop(name, [])
+        if keep_latest and caches:
+            self.caches[name] = [caches.pop()]
+        for cached in caches:
+            self.retire(cached)
+        if self.advisor is not None:
+            self.advisor.discard(name)
+
+    def retire(self, cached: CachedStorage) -> None:
+        if self.invalidation_bus is not None:
+            self.invalidation_bus.unsubscribe(cached.namespace, cached.evict)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Replaced outside the event loop, e.g. before serving.
+            asyncio.run(self.clear(cached))
+            return
+        task = loop.create_task(self.clear(cached))
+        self.clearing.add(task)
+        task.add_done_callback(self.clearing.discard)
+
+    async def clear(self, cached: CachedStorage) -> None:
+        try:
+            await cached.evict(None)
+        except Exception:
+            logger.exception("Failed to clear the cache of %s", cached.namespace)
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        """
+        Size, connections checked out, overflow and checkout counts of the
+        pool of each engine.
+        """
+        if self.pools is None:
+            return {}
+        return self.pools.stats()
+
+    async def start(self) -> None:
+        """
+        Starts listening for invalidations from other processes, probing
+        the replicas, sizing the pools and analyzing filter shapes.
+        """
+        if self.invalidation_bus is not None:
+            await self.invalidation_bus.start()
+        if self.router is not None:
+            await self.router.start()
+        for controller in self.controllers:
+            await controller.start()
+        if self.advisor is not None:
+            await self.advisor.start()
+
+    async def stop(self) -> None:
+        if self.invalidation_bus is not None:
+            await self.invalidation_bus.stop()
+        if self.router is not None:
+            await self.router.stop()
+        for controller in self.controllers:
+            await controller.stop()
+        if self.advisor is not None:
+            await self.advisor.stop()
+
 
 class PostgresEngineStorageManager(IStorageManager, PostgresStorageManager):
+    # IStorageManager's no-op comes first in the MRO.
+    discard = PostgresStorageManager.discard
+
     def __init__(
         self,
         pg_engine: AsyncEngine,
         metadata: MetaData,
+        cache_backend: ICacheBackend | None = None,
+        invalidation_bus: IInvalidationBus | None = None,
+        metrics: IMetrics | None = None,
+        tracer: ITracer | None = None,
+        replicas: list[AsyncEngine] | None = None,
+        balancing: Balancing = "round_robin",
+        read_your_writes: float = 0.0,
+        max_replica_lag: float | None = None,
+        pool_bounds: tuple[int, int] | None = None,
+        pool_target_wait: float = 0.01,
+        pool_max_latency: float | None = None,
+        advisor: IndexAdvisor | None = None,
     ):
+        """
+
+        :param pg_engine: the primary, which receives every write.
+        :param metrics: records the duration, errors and rows of each storage
+            operation per resource.
+        :param tracer: traces each storage operation as a "storage" span.
+        :param replicas: engines serving get, get_many, list and export.
+        :param balancing: "round_robin" or "least_connections" among replicas.
+        :param read_your_writes: seconds reads of a table stay on the primary
+            after this process wrote to it.
+        :param max_replica_lag: replicas lagging more seconds are skipped.
+        :param pool_bounds: (min, max) connections each engine's pool is sized
+            between, grown while checkouts wait more than pool_target_wait
+            seconds on average. Without bounds the pools keep their size.
+        :param pool_max_latency: pools are not grown while connections are held
+            longer than this on average.
+        :param advisor: records the filter shapes of gets and lists and
+            recommends indexes for them, see IndexAdvisor.
+        """
         self.pg_engine = pg_engine
         self.metadata = metadata
+        self.cache_backend = cache_backend
+        self.invalidation_bus = invalidation_bus
+        self.metrics = metrics
+        self.tracer = tracer
+        self.caches = {}
+        self.clearing = set()
+        self.advisor = advisor
+        self.router = (
+            ReplicaRouter(
+                primary=pg_engine,
+                replicas=replicas,
+                balancing=balancing,
+                read_your_writes=read_your_writes,
+                max_lag=max_replica_lag,
+            )
+            if replicas
+            else None
+        )
+        self.pools = PoolMonitor(metrics=metrics)
+        engines = [pg_engine, *(replicas or [])]
+        names = ["primary", *[f"replica{i}" for i in range(len(engines) - 1)]]
+        watched = [
+            self.pools.watch(engine, name) for engine, name in zip(engines, names)
+        ]
+        self.controllers = (
+            [
+                PoolController(
+                    pool=pool,
+                    min_size=pool_bounds[0],
+                    max_size=pool_bounds[1],
+                    target_wait=pool_target_wait,
+                    max_latency=pool_max_latency,
+                )
+                for pool in watched
+            ]
+            if pool_bounds
+            else []
+        )
 
-    def build_table(self, config: Config) -> Table:
-        return Table(
-            config.name,
-            self.metadata,
-            *[self.generate_column(field) for field in config.fields],
-            UniqueConstraint(
-                *[field.name for field in config.path_fields],
-            ),
+    async def create_indexes(self) -> list[str]:
+        """
+        Creates the declared indexes missing on tables that already exist,
+        concurrently. `metadata.create_all` only creates those of new tables.
+        """
+        return await create_indexes_concurrently(
+            self.pg_engine, self.metadata.sorted_tables
         )
 
     def storage(self, config: Config) -> IStorage:
-        return PostgresEngineStorage(
+        storage = PostgresEngineStorage(
             pg_engine=self.pg_engine,
             table=self.build_table(config),
+            count_strategy=build_count_strategy(
+                config.count_strategy, ttl=config.count_cache_ttl
+            ),
+            chunk_size=config.bulk_chunk_size,
+            ingest=config.ingest,
+            copy_threshold=config.copy_threshold,
+            trusted=config.fast_path,
+            router=self.router,
+            pools=self.pools,
+            advisor=self.advisor,
+        )
+        return self.cached(
+            self.batched(self.instrumented(storage, config), config), config
         )
 
 
 class PostgresSessionStorageManager(IStorageManager, PostgresStorageManager):
+    # IStorageManager's no-op comes first in the MRO.
+    discard = PostgresStorageManager.discard
+
     def __init__(
         self,
         get_session: Callable[[], AsyncSession],
         metadata: MetaData,
+        cache_backend: ICacheBackend | None = None,
+        invalidation_bus: IInvalidationBus | None = None,
+        metrics: IMetrics | None = None,
+        tracer: ITracer | None = None,
     ):
         self.get_session = get_session
         self.metadata = metadata
-
-    def build_table(self, config: Config) -> Table:
-        return Table(
-            config.name,
-            self.metadata,
-            *[self.generate_column(field) for field in config.fields],
-            UniqueConstraint(
-                *[field.name for field in config.path_fields],
-            ),
-        )
+        self.cache_backend = cache_backend
+        self.invalidation_bus = invalidation_bus
+        self.metrics = metrics
+        self.tracer = tracer
+        self.caches = {}
+        self.clearing = set()
 
     def storage(self, config: Config) -> IStorage:
-        return PostgresSessionStorage(
+        storage = PostgresSessionStorage(
             get_session=self.get_session,
             table=self.build_table(config),
+            count_strategy=build_count_strategy(
+                config.count_strategy, ttl=config.count_cache_ttl
+            ),
+            chunk_size=config.bulk_chunk_size,
+            ingest=config.ingest,
+            copy_threshold=config.copy_threshold,
+            trusted=config.fast_path,
+        )
+        return self.cached(
+            self.batched(self.instrumented(storage, config), config), config
         )
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from dyapi.interfaces.metrics import IMetrics
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+__all__ = ["PoolMonitor", "PoolController", "EnginePool"]
+
+logger = logging.getLogger(__name__)
+
+
+class EnginePool:
+    """
+    Checkout statistics of one engine's pool. Besides the totals it keeps a
+    window of waits and hold times, which the controller reads and resets.
+    """
+
+    def __init__(self, engine: AsyncEngine, name: str):
+        self.engine = engine
+        self.name = name
+        self.checkouts = 0
+        self.timeouts = 0
+        self.reset_window()
+
+    @property
+    def pool(self) -> object:
+        return self.engine.sync_engine.pool
+
+    def reset_window(self) -> None:
+        self.window_checkouts = 0
+        self.window_wait = 0.0
+        self.window_latency = 0.0
+        self.window_peak = 0
+
+    def checked_out(self) -> int:
+        checkedout = getattr(self.pool, "checkedout", None)
+        return checkedout() if checkedout is not None else 0
+
+    def on_checkout(self, wait: float) -> None:
+        self.checkouts += 1
+        self.window_checkouts += 1
+        self.window_wait += wait
+        self.window_peak = max(self.window_peak, self.checked_out())
+
+    def on_checkin(self, latency: float) -> None:
+        self.window_latency += latency
+
+    def stats(self) -> dict[str, int]:
+        pool = self.pool
+        size = getattr(pool, "size", None)
+        overflow = getattr(pool, "overflow", None)
+        return {
+            "size": size() if size is not None else 0,
+            "checked_out": self.checked_out(),
+            "overflow": max(overflow(), 0) if overflow is not None else 0,
+            "max_overflow": max(getattr(pool, "_max_overflow", 0), 0),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+        }
+
+
+class PoolMonitor:
+    """
+    Opens the transactions of the storages, timing how long each connection
+    took to check out of its engine's pool and how long it was held.
+    """
+
+    def __init__(self, metrics: IMetrics | None = None):
+        self.metrics = metrics
+        self.pools: dict[AsyncEngine, EnginePool] = {}
+
+    def watch(self, engine: AsyncEngine, name: str) -> EnginePool:
+        pool = self.pools[engine] = EnginePool(engine, name)
+        if self.metrics is not None:
+            self.metrics.watch_pool(name, pool.stats)
+        return pool
+
+    def observe(self, pool: EnginePool, wait: float, timeout: bool = False) -> None:
+        if self.metrics is not None:
+            self.metrics.observe_checkout(pool.name, wait, timeout=timeout)
+
+    @asynccontextmanager
+    async def begin(self, engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+        pool = self.pools.get(engine)
+        if pool is None:
+            async with engine.begin() as conn:
+                yield conn
+            return
+
+        start = time.perf_counter()
+        acquired: float | None = None
+        try:
+            # BEGIN is only sent with the first statement, so entering the
+            # block takes as long as the checkout.
+            async with engine.begin() as conn:
+                acquired = time.perf_counter()
+                pool.on_checkout(acquired - start)
+                self.observe(pool, acquired - start)
+                yield conn
+        except exc.TimeoutError:
+            if acquired is None:
+                pool.timeouts += 1
+                self.observe(pool, time.perf_counter() - start, timeout=True)
+            raise
+        finally:
+            if acquired is not None:
+                pool.on_checkin(time.perf_counter() - acquired)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {pool.name: pool.stats() for pool in self.pools.values()}
+
+
+class PoolController:
+    """
+    Adjusts the connection limit of a pool between `min_size` and `max_size`
+    every `interval` seconds.
+
+    The limit grows by `step` while checkouts wait longer than `target_wait`
+    on average, unless connections are held longer than `max_latency` on
+    average: a database slowing down under load does not get more
+    connections. It shrinks by `step` once waits are under half the target
+    and fewer connections than the limit minus `step` were in use.
+
+    The limit is moved through the pool's overflow allowance on top of its
+    `pool_size`, which SQLAlchemy cannot change on a live pool, so `min_size`
+    cannot be less than `pool_size`.
+    """
+
+    def __init__(
+        self,
+        pool: EnginePool,
+        min_size: int,
+        max_size: int,
+        target_wait: float = 0.01,
+        max_latency: float | None = None,
+        step: int = 1,
+        interval: float = 5.0,
+    ):
+        if not hasattr(pool.pool, "_max_overflow"):
+            raise ValueError(f"Pool {pool.name} has no connection limit to adjust")
+        size = pool.stats()["size"]
+        if not size <= min_size <= max_size:
+            raise ValueError(
+                f"Pool bounds must satisfy pool_size ({size}) <= min_size "
+                f"({min_size}) <= max_size ({max_size})"
+            )
+        self.pool = pool
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_wait = target_wait
+        self.max_latency = max_latency
+        self.step = step
+        self.interval = interval
+        self.task: asyncio.Task[None] | None = None
+        self.limit = min(max(self.current_limit(), min_size), max_size)
+        self.apply()
+
+    def current_limit(self) -> int:
+        stats = self.pool.stats()
+        return stats["size"] + stats["max_overflow"]
+
+    def apply(self) -> None:
+        """
+        Sets the overflow allowance of the pool. SQLAlchemy keeps it in the
+        private `_max_overflow` of its QueuePool, so should a release rename
+        it the controller fails loudly rather than set an attribute nothing
+        reads.
+        """
+        pool = self.pool.pool
+        if not hasattr(pool, "_max_overflow"):
+            raise RuntimeError(
+                f"Pool {self.pool.name} has no connection limit to adjust"
+            )
+        pool._max_overflow = self.limit - pool.size()  # type: ignore[attr-defined]
+
+    def adjust(self) -> int:
+        """
+        Moves the limit according to the window since the last adjustment.
+        """
+        pool = self.pool
+        checkouts = pool.window_checkouts
+        if checkouts:
+            wait = pool.window_wait / checkouts
+            latency = pool.window_latency / checkouts
+            overloaded = self.max_latency is not None and latency > self.max_latency
+            if wait > self.target_wait and not overloaded:
+                self.limit = min(self.limit + self.step, self.max_size)
+            elif (
+                wait < self.target_wait / 2
+                and pool.window_peak <= self.limit - self.step
+            ):
+                self.limit = max(self.limit - self.step, self.min_size)
+            self.apply()
+        pool.reset_window()
+        return self.limit
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.adjust()
+            except Exception:
+                logger.exception("Failed to adjust pool %s", self.pool.name)
+
+    async def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
@@ -0,0 +1,135 @@
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Literal
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = ["ReplicaRouter", "Balancing"]
+
+logger = logging.getLogger(__name__)
+
+Balancing = Literal["round_robin", "least_connections"]
+
+# Seconds the replica is behind the primary, 0 when it has replayed
+# everything it received.
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) "
+    "END"
+)
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.healthy = True
+        self.lag: float | None = None
+        self.in_flight = 0
+
+
+class ReplicaRouter:
+    """
+    Picks the engine for each query: writes go to the primary, reads to a
+    healthy replica chosen round-robin or by the fewest queries in flight.
+
+    After a write to a table, reads of that table stay on the primary for
+    `read_your_writes` seconds. The window is tracked per process.
+    Replicas failing the periodic probe, failing a read or lagging more than
+    `max_lag` seconds are left out until a probe succeeds again. Without
+    a healthy replica, reads go to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        balancing: Balancing = "round_robin",
+        read_your_writes: float = 0.0,
+        max_lag: float | None = None,
+        check_interval: float = 5.0,
+    ):
+        self.primary = primary
+        self.replicas = [Replica(engine) for engine in replicas]
+        self.balancing = balancing
+        self.read_your_writes = read_your_writes
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.writes: dict[str, float] = {}
+        self.rotation = itertools.cycle(self.replicas)
+        self.checker: asyncio.Task[None] | None = None
+
+    def mark_write(self, table: str) -> None:
+        if self.read_your_writes:
+            self.writes[table] = time.monotonic() + self.read_your_writes
+
+    def pick(self, table: str) -> Replica | None:
+        if self.writes.get(table, 0.0) > time.monotonic():
+            return None
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.balancing == "least_connections":
+            return min(healthy, key=lambda replica: replica.in_flight)
+        for replica in self.rotation:
+            if replica.healthy:
+                return replica
+        return None  # pragma: no cover
+
+    @asynccontextmanager
+    async def reading(self, table: str) -> AsyncIterator[AsyncEngine]:
+        """
+        Yields the engine to read the table from.
+        """
+        replica = self.pick(table)
+        if replica is None:
+            yield self.primary
+            return
+
+        replica.in_flight += 1
+        try:
+            yield replica.engine
+        except (OSError, DBAPIError) as exc:
+            if isinstance(exc, OSError) or exc.connection_invalidated:
+                logger.warning("Replica %s failed: %s", replica.engine.url, exc)
+                replica.healthy = False
+            raise
+        finally:
+            replica.in_flight -= 1
+
+    async def check(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                lag = (await conn.execute(LAG_QUERY)).scalar()
+        except Exception as exc:
+            logger.warning("Replica %s is unreachable: %s", replica.engine.url, exc)
+            replica.healthy = False
+            return
+
+        replica.lag = float(lag or 0.0)
+        replica.healthy = self.max_lag is None or replica.lag <= self.max_lag
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*[self.check(replica) for replica in self.replicas])
+
+    async def run_checks(self) -> None:
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.check_interval)
+
+    async def start(self) -> None:
+        if self.checker is None and self.replicas:
+            self.checker = asyncio.create_task(self.run_checks())
+
+    async def stop(self) -> None:
+        if self.checker is not None:
+            self.checker.cancel()
+            try:
+                await self.checker
+            except asyncio.CancelledError:
+                pass
+            self.checker = None
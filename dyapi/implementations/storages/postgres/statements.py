@@ -0,0 +1,174 @@
+from collections import OrderedDict
+from operator import eq, ge, gt, le, lt
+from typing import Any, Callable, Hashable, TypeVar
+
+from dyapi.implementations.storages.filters import split_filter
+from sqlalchemy import ColumnElement, Table, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.engine.interfaces import CacheStats
+
+__all__ = [
+    "StatementCache",
+    "filter_criteria",
+    "filter_params",
+    "filter_shape",
+    "filter_values",
+]
+
+T = TypeVar("T")
+
+COMPARISONS = {
+    "eq": eq,
+    "gt": gt,
+    "gte": ge,
+    "lt": lt,
+    "lte": le,
+}
+
+
+class StatementCache:
+    """
+    Keeps the parameterized statements of a storage by shape, e.g. operation
+    and filter fields, so they are built once. Reusing the statement object
+    also lets SQLAlchemy reuse its memoized cache key and compiled form, and
+    the identical SQL lets asyncpg reuse its prepared statement.
+
+    `hits`/`misses` count statement lookups, `compiled_hits`/`compiled_misses`
+    count executions served from SQLAlchemy's compiled cache or compiled anew.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.statements: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.compiled_hits = 0
+        self.compiled_misses = 0
+
+    def get(self, key: Hashable, build: Callable[[], T]) -> T:
+        statement = self.statements.get(key)
+        if statement is not None:
+            self.hits += 1
+            self.statements.move_to_end(key)
+            return statement
+
+        self.misses += 1
+        statement = self.statements[key] = build()
+        if len(self.statements) > self.maxsize:
+            self.statements.popitem(last=False)
+        return statement
+
+    def record(self, result: Any) -> None:
+        """
+        Counts whether the execution behind a Core result was compiled anew.
+        """
+        cache_hit = getattr(getattr(result, "context", None), "cache_hit", None)
+        if cache_hit == CacheStats.CACHE_HIT:
+            self.compiled_hits += 1
+        elif cache_hit == CacheStats.CACHE_MISS:
+            self.compiled_misses += 1
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "statements": len(self.statements),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "compiled_hits": self.compiled_hits,
+            "compiled_misses": self.compiled_misses,
+        }
+
+
+def filter_shape(filters: dict[str, Any]) -> tuple[str, ...]:
+    """
+    The names of the filters, keying the statement built for them. Null
+    checks are part of the statement rather than bound, so their value is
+    too.
+    """
+    return tuple(
+        f"{name}={value}" if split_filter(name)[1] == "is_null" else name
+        for name, value in filters.items()
+    )
+
+
+def like_prefix(value: str) -> str:
+    """
+    LIKE pattern matching strings starting with the value, escaped with
+    backslashes, Postgres's default LIKE escape. A pattern without a leading
+    wildcard can be answered from a btree index using the "C" collation or
+    text_pattern_ops.
+    """
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+def filter_criterion(
+    column: ColumnElement[Any], operator: str, value: Any
+) -> ColumnElement[bool]:
+    """
+    Criterion of the operator on the column, against a bound parameter or a
+    value, as passed to the statement, see `filter_value`.
+    """
+    if operator == "is_null":
+        return column.is_(None) if value else column.is_not(None)
+    if operator == "in":
+        # A single array parameter keeps one statement for any number of
+        # values, and the planner still uses an index for it.
+        return column == any_(value)
+    if operator == "prefix":
+        return column.like(value)
+    return COMPARISONS[operator](column, value)
+
+
+def filter_value(operator: str, value: Any) -> Any:
+    return like_prefix(value) if operator == "prefix" else value
+
+
+def filter_criteria(table: Table, filters: dict[str, Any]) -> list[ColumnElement[bool]]:
+    """
+    Criteria of the filters, bound as `filter_<name>` parameters, see
+    `filter_params`. Only the values of null checks are read.
+    """
+    criteria = []
+    for name in filters:
+        column_name, operator = split_filter(name)
+        column = table.c[column_name]
+        if operator == "is_null":
+            value = filters[name]
+        elif operator == "in":
+            value = bindparam(f"filter_{name}", type_=ARRAY(column.type))
+        else:
+            value = bindparam(f"filter_{name}", type_=column.type)
+        criteria.append(filter_criterion(column, operator, value))
+    return criteria
+
+
+def filter_values(table: Table, filters: dict[str, Any]) -> list[ColumnElement[bool]]:
+    """
+    Criteria of the filters with their values, e.g. for count strategies,
+    which key and estimate on them.
+    """
+    criteria = []
+    for name, value in filters.items():
+        column_name, operator = split_filter(name)
+        column = table.c[column_name]
+        if operator == "in":
+            value = array(value, type_=column.type)
+        criteria.append(
+            filter_criterion(column, operator, filter_value(operator, value))
+        )
+    return criteria
+
+
+def filter_params(values: dict[str, Any]) -> dict[str, Any]:
+    params = {}
+    for name, value in values.items():
+        operator = split_filter(name)[1]
+        if operator != "is_null":
+            params[f"filter_{name}"] = filter_value(operator, value)
+    return params
@@ -0,0 +1,69 @@
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Sequence, Type
+
+from pydantic import BaseModel
+
+__all__ = ["row_mapper", "object_mapper"]
+
+# Mappers kept per function. The cache holds its models, so it is bounded to
+# let models of replaced resources be collected.
+MAPPERS = 1024
+
+
+def constructor(model: Type[BaseModel]) -> Callable[[dict[str, Any]], BaseModel]:
+    """
+    Returns a function creating the model from a complete dict of field values
+    without validation. Cheaper than `model_construct`, which also resolves
+    defaults and aliases.
+    """
+    if model.__private_attributes__:
+        return lambda values: model.model_construct(**values)
+
+    new = model.__new__
+    set_attribute = object.__setattr__
+
+    def construct(values: dict[str, Any]) -> BaseModel:
+        instance = new(model)
+        set_attribute(instance, "__dict__", values)
+        set_attribute(instance, "__pydantic_fields_set__", set(values))
+        set_attribute(instance, "__pydantic_extra__", None)
+        set_attribute(instance, "__pydantic_private__", None)
+        return instance
+
+    return construct
+
+
+@lru_cache(maxsize=MAPPERS)
+def row_mapper(
+    entity: Type[BaseModel], trusted: bool = False
+) -> Callable[[Sequence[Any]], BaseModel]:
+    """
+    Returns a function building the entity from a row whose leading columns
+    are the entity fields in order. Trusted rows, read from a table generated
+    for the entity, skip validation.
+    """
+    fields = tuple(entity.model_fields)
+    if not trusted:
+        return lambda row: entity(**dict(zip(fields, row)))
+    construct = constructor(entity)
+    return lambda row: construct(dict(zip(fields, row)))
+
+
+@lru_cache(maxsize=MAPPERS)
+def object_mapper(
+    schema: Type[BaseModel], trusted: bool = False
+) -> Callable[[Any], BaseModel]:
+    """
+    Returns a function building the schema from an ORM object, skipping
+    validation for trusted objects.
+    """
+    if not trusted:
+        return lambda item: schema(**item.__dict__)
+
+    fields = tuple(schema.model_fields)
+    getter = attrgetter(*fields)
+    construct = constructor(schema)
+    if len(fields) == 1:
+        return lambda item: construct({fields[0]: getter(item)})
+    return lambda item: construct(dict(zip(fields, getter(item))))
@@ -0,0 +1,36 @@
+from collections import deque
+from pathlib import Path
+
+from dyapi.entities.span import Span
+from dyapi.interfaces.tracing import ISpanExporter
+
+__all__ = ["MemorySpanExporter", "JSONFileSpanExporter"]
+
+
+class MemorySpanExporter(ISpanExporter):
+    """
+    Keeps the last `maxlen` traces, e.g. to inspect them in tests.
+    """
+
+    def __init__(self, maxlen: int | None = 1000):
+        self.traces: deque[Span] = deque(maxlen=maxlen)
+
+    def export(self, trace: Span) -> None:
+        self.traces.append(trace)
+
+    def clear(self) -> None:
+        self.traces.clear()
+
+
+class JSONFileSpanExporter(ISpanExporter):
+    """
+    Appends each trace as a line of JSON to the file. Writes are blocking,
+    so this is meant for local debugging rather than production traffic.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def export(self, trace: Span) -> None:
+        with self.path.open("a") as file:
+            file.write(trace.model_dump_json() + "\n")
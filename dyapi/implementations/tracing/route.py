@@ -0,0 +1,59 @@
+import time
+from typing import Any, Callable, Coroutine, Type
+
+from dyapi.entities.span import Span
+from dyapi.interfaces.tracing import ITracer
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+__all__ = ["traced_route"]
+
+
+def split_request(request: Span, endpoint: Span, end: float) -> None:
+    """
+    Adds spans for what FastAPI does around the endpoint: resolving and
+    validating the parameters before it, validating and serializing the
+    response after it.
+    """
+    request.attributes.update(endpoint.attributes)
+    steps = [("validation", request.start, endpoint.start)]
+    # Responses serialized by the endpoint itself are passed through as is.
+    if endpoint.end is not None and endpoint.find("serialization") is None:
+        steps.append(("serialization", endpoint.end, end))
+    for name, start, stop in steps:
+        request.children.append(
+            Span(
+                name=name,
+                trace_id=request.trace_id,
+                span_id=f"{request.span_id}-{name}",
+                parent_id=request.span_id,
+                start=start,
+                end=stop,
+                attributes=endpoint.attributes,
+            )
+        )
+
+
+def traced_route(tracer: ITracer) -> Type[APIRoute]:
+    """
+    Route class tracing every request as a "request" span.
+    """
+
+    class TracedRoute(APIRoute):
+        def get_route_handler(
+            self,
+        ) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+            handler = super().get_route_handler()
+            path = self.path
+
+            async def traced(request: Request) -> Response:
+                with tracer.span("request", method=request.method, path=path) as span:
+                    response = await handler(request)
+                    endpoint = span.find("endpoint")
+                    if endpoint is not None and endpoint.end is not None:
+                        split_request(span, endpoint, time.perf_counter())
+                return response
+
+            return traced
+
+    return TracedRoute
@@ -0,0 +1,139 @@
+import hashlib
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Iterator
+
+from dyapi.entities.span import Span
+from dyapi.interfaces.tracing import ISpanExporter, ITracer
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+__all__ = ["Tracer", "span", "fingerprint"]
+
+# The tracer and span of the step running in the current task.
+current: ContextVar[tuple[ITracer, Span] | None] = ContextVar(
+    "dyapi_span", default=None
+)
+
+
+def new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """
+    Identifies the statement's SQL without its parameters.
+    """
+    return hashlib.sha1(statement.encode()).hexdigest()[:16]
+
+
+class Tracer(ITracer):
+    """
+    Builds the spans of each trace in process and hands the root span of
+    every finished trace to the exporter.
+
+    Statements executed within a span by any SQLAlchemy engine get an
+    "execute" child span tagged with their fingerprint.
+    """
+
+    def __init__(self, exporter: ISpanExporter):
+        self.exporter = exporter
+        listen_statements()
+
+    def start(self, name: str, **attributes: Any) -> Span:
+        active = current.get()
+        parent = active[1] if active is not None else None
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent is not None else new_id(),
+            span_id=new_id(),
+            parent_id=parent.span_id if parent is not None else None,
+            start=time.perf_counter(),
+            attributes=attributes,
+        )
+        if parent is not None:
+            parent.children.append(span)
+        return span
+
+    def finish(self, span: Span, error: BaseException | None = None) -> None:
+        span.end = time.perf_counter()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        if span.parent_id is None:
+            self.exporter.export(span)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        span = self.start(name, **attributes)
+        token = current.set((self, span))
+        try:
+            yield span
+        except BaseException as exc:
+            current.reset(token)
+            self.finish(span, exc)
+            raise
+        current.reset(token)
+        self.finish(span)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """
+    Opens a child of the current span, or does nothing outside of a trace.
+    """
+    active = current.get()
+    if active is None:
+        yield None
+        return
+    with active[0].span(name, **attributes) as child:
+        yield child
+
+
+def before_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    active = current.get()
+    if active is not None and context is not None:
+        tracer = active[0]
+        context.dyapi_span = (
+            tracer,
+            tracer.start("execute", statement=fingerprint(statement)),
+        )
+
+
+def after_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    traced = getattr(context, "dyapi_span", None)
+    if traced is not None:
+        traced[0].finish(traced[1])
+        context.dyapi_span = None
+
+
+def on_error(exception_context: Any) -> None:
+    context = exception_context.execution_context
+    traced = getattr(context, "dyapi_span", None)
+    if traced is not None:
+        traced[0].finish(traced[1], exception_context.original_exception)
+        context.dyapi_span = None
+
+
+def listen_statements() -> None:
+    if not event.contains(Engine, "before_cursor_execute", before_execute):
+        event.listen(Engine, "before_cursor_execute", before_execute)
+        event.listen(Engine, "after_cursor_execute", after_execute)
+        event.listen(Engine, "handle_error", on_error)
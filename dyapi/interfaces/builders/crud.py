@@ -5,7 +5,9 @@ from typing import Type
 from dyapi.entities.config import Config
 from dyapi.interfaces.builders.endpoint import IEndpointBuilder
 from dyapi.interfaces.builders.model import IModelBuilder
+from dyapi.interfaces.metrics import IMetrics
 from dyapi.interfaces.storages import IStorageManager
+from dyapi.interfaces.tracing import ITracer
 from fastapi import APIRouter
 
 
@@ -16,6 +18,8 @@ class ICRUDBuilder(ABC):
         storage_manager: IStorageManager,
         endpoint_builder: Type[IEndpointBuilder],
         model_builder: Type[IModelBuilder],
+        metrics: IMetrics | None = None,
+        tracer: ITracer | None = None,
     ): ...
 
     @cached_property
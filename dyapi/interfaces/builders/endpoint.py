@@ -3,12 +3,20 @@ from functools import cached_property
 from typing import Any, Callable
 
 from dyapi.interfaces.builders.model import IModelBuilder
+from dyapi.interfaces.metrics import IMetrics
 from dyapi.interfaces.storages import IStorage
+from dyapi.interfaces.tracing import ITracer
 
 
 class IEndpointBuilder(ABC):
     @abstractmethod
-    def __init__(self, model: IModelBuilder, storage: IStorage): ...
+    def __init__(
+        self,
+        model: IModelBuilder,
+        storage: IStorage,
+        metrics: IMetrics | None = None,
+        tracer: ITracer | None = None,
+    ): ...
 
     @cached_property
     @abstractmethod
@@ -54,3 +62,48 @@ class IEndpointBuilder(ABC):
         :return:
         """
         ...
+
+    @cached_property
+    @abstractmethod
+    def get_many(self) -> Callable[[Any], Any]:
+        """
+        Returns FastAPI endpoint for getting entities by many keys at once.
+        :return:
+        """
+        ...
+
+    @cached_property
+    @abstractmethod
+    def create_many(self) -> Callable[[Any], Any]:
+        """
+        Returns FastAPI endpoint for creating entities in bulk.
+        :return:
+        """
+        ...
+
+    @cached_property
+    @abstractmethod
+    def upsert_many(self) -> Callable[[Any], Any]:
+        """
+        Returns FastAPI endpoint for creating or replacing entities in bulk.
+        :return:
+        """
+        ...
+
+    @cached_property
+    @abstractmethod
+    def delete_many(self) -> Callable[[Any], Any]:
+        """
+        Returns FastAPI endpoint for deleting entities in bulk.
+        :return:
+        """
+        ...
+
+    @cached_property
+    @abstractmethod
+    def export(self) -> Callable[[Any], Any]:
+        """
+        Returns FastAPI endpoint streaming every matching entity.
+        :return:
+        """
+        ...
@@ -7,9 +7,26 @@ from pydantic import BaseModel
 
 
 class IModelBuilder(ABC):
+    config: Config
+
     @abstractmethod
     def __init__(self, config: Config): ...
 
+    @classmethod
+    def scoped(cls) -> Type["IModelBuilder"]:
+        """
+        Returns the builder an API builder instantiates its models with, which
+        keeps its own state if the builder keeps any across configs.
+        """
+        return cls
+
+    @classmethod
+    def discard(cls, name: str) -> None:
+        """
+        Forgets what the builder keeps for the resource, once it is replaced
+        or removed at runtime.
+        """
+
     @cached_property
     @abstractmethod
     def path(self) -> Type[BaseModel]:
@@ -0,0 +1,8 @@
+from .base import ICacheBackend
+from .bus import Evict, IInvalidationBus
+
+__all__ = [
+    "Evict",
+    "ICacheBackend",
+    "IInvalidationBus",
+]
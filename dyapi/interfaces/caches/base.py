@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+__all__ = ("ICacheBackend",)
+
+
+class ICacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """
+        Returns the cached value, or None if it is missing or expired.
+        """
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None: ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+    async def clear_namespace(self, namespace: str) -> None:
+        """
+        Drops the keys of the namespace, those starting with "{namespace}:".
+        Backends that cannot find them clear every key.
+        """
+        await self.clear()
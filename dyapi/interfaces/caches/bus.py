@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable
+
+__all__ = ("IInvalidationBus", "Evict")
+
+# Receives the evicted cache keys, or None if every key may be stale.
+Evict = Callable[[list[str] | None], Awaitable[None]]
+
+
+class IInvalidationBus(ABC):
+    @abstractmethod
+    async def publish(self, namespace: str, keys: list[str]) -> None:
+        """
+        Tells the other processes that the keys were written.
+        """
+        ...
+
+    @abstractmethod
+    def subscribe(self, namespace: str, evict: Evict) -> None:
+        """
+        Registers a callback for keys written by other processes.
+        """
+        ...
+
+    @abstractmethod
+    def unsubscribe(self, namespace: str, evict: Evict) -> None:
+        """
+        Removes a callback registered with `subscribe`, e.g. that of a
+        replaced resource.
+        """
+        ...
+
+    @abstractmethod
+    async def start(self) -> None: ...
+
+    @abstractmethod
+    async def stop(self) -> None: ...
@@ -0,0 +1,3 @@
+from .base import IMetrics
+
+__all__ = ["IMetrics"]
@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+from typing import Callable
+
+__all__ = ("IMetrics",)
+
+
+class IMetrics(ABC):
+    @abstractmethod
+    def observe(
+        self,
+        layer: str,
+        resource: str,
+        operation: str,
+        seconds: float,
+        error: bool = False,
+    ) -> None:
+        """
+        Records one call of an operation on a resource, e.g. the "get"
+        endpoint or storage method of "users", and whether it raised.
+        """
+        ...
+
+    @abstractmethod
+    def rows(self, resource: str, operation: str, count: int) -> None:
+        """
+        Records the number of rows an operation returned or wrote.
+        """
+        ...
+
+    @abstractmethod
+    def observe_checkout(
+        self, engine: str, seconds: float, timeout: bool = False
+    ) -> None:
+        """
+        Records the time spent waiting for a connection from the engine's
+        pool, and whether the wait timed out.
+        """
+        ...
+
+    @abstractmethod
+    def watch_pool(self, engine: str, stats: Callable[[], dict[str, int]]) -> None:
+        """
+        Registers a callback returning the current state of the engine's pool,
+        e.g. its size and the connections checked out.
+        """
+        ...
+
+    @abstractmethod
+    def render(self) -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        ...
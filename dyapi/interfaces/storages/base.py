@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Type
+from typing import AsyncIterator, Type
 
-from dyapi.entities.pagination import PaginationEntity
+from dyapi.entities.pagination import CursorPaginationEntity, PaginationEntity
 from pydantic import BaseModel
 
 __all__ = ("IStorage",)
@@ -13,6 +13,16 @@ class IStorage(ABC):
         self, filter_: BaseModel, response_model: Type[BaseModel]
     ) -> BaseModel: ...
 
+    @abstractmethod
+    async def get_many(
+        self, filters: list[BaseModel], response_model: Type[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        """
+        Fetches the rows matching the keys. Returns the found entities and the
+        keys that were not found.
+        """
+        ...
+
     @abstractmethod
     async def create(self, entity: BaseModel) -> BaseModel: ...
 
@@ -24,10 +34,54 @@ class IStorage(ABC):
     @abstractmethod
     async def delete(self, filter_: BaseModel) -> bool: ...
 
+    @abstractmethod
+    async def create_many(
+        self, entities: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        """
+        Inserts the entities, skipping those whose key already exists.
+        Returns the created entities and the conflicting ones.
+        """
+        ...
+
+    @abstractmethod
+    async def upsert_many(self, entities: list[BaseModel]) -> list[BaseModel]:
+        """
+        Inserts the entities, overwriting rows with the same key.
+        """
+        ...
+
+    @abstractmethod
+    async def delete_many(
+        self, filters: list[BaseModel]
+    ) -> tuple[list[BaseModel], list[BaseModel]]:
+        """
+        Deletes the rows matching the keys. Returns the deleted keys and the
+        keys that were not found.
+        """
+        ...
+
     @abstractmethod
     async def list(
         self,
         filter_: BaseModel,
-        pagination: PaginationEntity,
+        pagination: PaginationEntity | CursorPaginationEntity,
         response_model: Type[BaseModel],
-    ) -> tuple[list[BaseModel], int]: ...
+    ) -> tuple[list[BaseModel], int | None]:
+        """
+        Returns a page of entities ordered by their key and the total count,
+        which is None when the storage is configured not to count.
+        Up to `pagination.limit + 1` entities are returned, the extra one only
+        signals that another page exists.
+        """
+        ...
+
+    @abstractmethod
+    def stream(
+        self, filter_: BaseModel, response_model: Type[BaseModel]
+    ) -> AsyncIterator[BaseModel]:
+        """
+        Yields every entity matching the filter, ordered by key, without
+        loading the whole result into memory.
+        """
+        ...
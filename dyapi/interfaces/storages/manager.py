@@ -7,3 +7,12 @@ from dyapi.interfaces.storages.base import IStorage
 class IStorageManager(ABC):
     @abstractmethod
     def storage(self, config: Config) -> IStorage: ...
+
+    def discard(self, name: str, keep_latest: bool = False) -> None:
+        """
+        Forgets what the manager keeps for the resource, once it is replaced
+        or removed at runtime.
+
+        :param keep_latest: the replacing storage was built already, so only
+            what the manager keeps for the storages built before it goes.
+        """
@@ -0,0 +1,3 @@
+from .base import ISpanExporter, ITracer
+
+__all__ = ["ISpanExporter", "ITracer"]
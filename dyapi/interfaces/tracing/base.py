@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager
+from typing import Any
+
+from dyapi.entities.span import Span
+
+__all__ = ("ITracer", "ISpanExporter")
+
+
+class ISpanExporter(ABC):
+    @abstractmethod
+    def export(self, trace: Span) -> None:
+        """
+        Receives the root span of every finished trace, with its children.
+        """
+        ...
+
+
+class ITracer(ABC):
+    @abstractmethod
+    def start(self, name: str, **attributes: Any) -> Span:
+        """
+        Starts a span under the current one, or a new trace.
+        """
+        ...
+
+    @abstractmethod
+    def finish(self, span: Span, error: BaseException | None = None) -> None: ...
+
+    @abstractmethod
+    def span(self, name: str, **attributes: Any) -> AbstractContextManager[Span]:
+        """
+        Starts a span that is the current one until the block exits.
+        """
+        ...
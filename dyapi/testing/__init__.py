@@ -0,0 +1,21 @@
+from .budget import (
+    ENGINE_BUDGETS,
+    LIST_STATEMENTS,
+    SESSION_BUDGETS,
+    QueryBudget,
+    QueryBudgetExceeded,
+    QueryCounter,
+    engine_budgets,
+    session_budgets,
+)
+
+__all__ = [
+    "ENGINE_BUDGETS",
+    "LIST_STATEMENTS",
+    "SESSION_BUDGETS",
+    "QueryBudget",
+    "QueryBudgetExceeded",
+    "QueryCounter",
+    "engine_budgets",
+    "session_budgets",
+]
@@ -0,0 +1,194 @@
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from dyapi.entities.config import CountStrategyName
+from pydantic import BaseModel
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = [
+    "QueryBudget",
+    "QueryBudgetExceeded",
+    "QueryCounter",
+    "ENGINE_BUDGETS",
+    "SESSION_BUDGETS",
+    "LIST_STATEMENTS",
+    "engine_budgets",
+    "session_budgets",
+]
+
+
+class QueryBudget(BaseModel):
+    """
+    Most statements, transactions and pool checkouts a request may take.
+    None leaves a count unchecked.
+    """
+
+    statements: int | None = None
+    transactions: int | None = None
+    checkouts: int | None = None
+
+
+def budget(statements: int, transactions: int = 1, checkouts: int = 1) -> QueryBudget:
+    return QueryBudget(
+        statements=statements, transactions=transactions, checkouts=checkouts
+    )
+
+
+# Statements a list takes per count strategy: the page, plus a count unless
+# the strategy counts in the page query or not at all. "estimated" falls back
+# to an exact count for tables never analyzed, and "window" counts an empty
+# page separately, so those take one more.
+LIST_STATEMENTS: dict[CountStrategyName, int] = {
+    "exact": 2,
+    "estimated": 3,
+    "cached": 2,
+    "window": 1,
+    "none": 1,
+}
+
+
+def engine_budgets(
+    count_strategy: CountStrategyName = "exact",
+) -> dict[str, QueryBudget]:
+    """
+    Budgets of the routes generated by CRUDBuilder over PostgresEngineStorage
+    for resources with the count strategy, for up to `bulk_chunk_size` items.
+    Each query of the engine storage runs in its own transaction.
+    """
+    statements = LIST_STATEMENTS[count_strategy]
+    return {
+        "create": budget(1),
+        "get": budget(1),
+        "update": budget(1),
+        "delete": budget(1),
+        "list": budget(statements, transactions=statements, checkouts=statements),
+        "export": budget(1),
+        "get_many": budget(1),
+        "create_many": budget(1),
+        "upsert_many": budget(1),
+        "delete_many": budget(1),
+    }
+
+
+def session_budgets(
+    count_strategy: CountStrategyName = "exact",
+) -> dict[str, QueryBudget]:
+    """
+    Budgets of the routes generated by SQLAlchemyCRUDBuilder with the count
+    strategy, whose requests run in the single transaction of their session.
+    """
+    return {
+        "create": budget(1),
+        "get": budget(1),
+        "update": budget(1),
+        "delete": budget(1),
+        "list": budget(LIST_STATEMENTS[count_strategy]),
+        "export": budget(1),
+        "get_many": budget(1),
+        "upsert_many": budget(1),
+    }
+
+
+# Budgets with the default "exact" count strategy.
+ENGINE_BUDGETS = engine_budgets()
+SESSION_BUDGETS = session_budgets()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    """
+    Counts the statements, transactions and pool checkouts of an engine
+    through its events, to assert how many round-trips a request takes:
+
+        with QueryCounter(engine) as counter:
+            with counter.budget(ENGINE_BUDGETS["get"], route="GET /items/{id}"):
+                client.get("/items/1")
+    """
+
+    def __init__(self, engine: AsyncEngine | Engine):
+        self.engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        self.listening = False
+        self.reset()
+
+    def reset(self) -> None:
+        self.statements: list[str] = []
+        self.transactions = 0
+        self.checkouts = 0
+
+    def on_statement(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        self.statements.append(statement)
+
+    def on_begin(self, conn: Any) -> None:
+        self.transactions += 1
+
+    def on_checkout(self, *args: Any) -> None:
+        self.checkouts += 1
+
+    def events(self) -> list[tuple[str, Any]]:
+        return [
+            ("before_cursor_execute", self.on_statement),
+            ("begin", self.on_begin),
+            ("checkout", self.on_checkout),
+        ]
+
+    def start(self) -> None:
+        if not self.listening:
+            for name, listener in self.events():
+                event.listen(self.engine, name, listener)
+            self.listening = True
+
+    def stop(self) -> None:
+        if self.listening:
+            for name, listener in self.events():
+                event.remove(self.engine, name, listener)
+            self.listening = False
+
+    def __enter__(self) -> "QueryCounter":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def check(self, budget: QueryBudget, route: str = "") -> None:
+        exceeded = [
+            f"{name}: {count} > {limit}"
+            for name, count, limit in (
+                ("statements", len(self.statements), budget.statements),
+                ("transactions", self.transactions, budget.transactions),
+                ("checkouts", self.checkouts, budget.checkouts),
+            )
+            if limit is not None and count > limit
+        ]
+        if exceeded:
+            statements = "\n".join(f"  {statement}" for statement in self.statements)
+            raise QueryBudgetExceeded(
+                f"{route or 'Request'} exceeded its query budget "
+                f"({', '.join(exceeded)}), statements:\n{statements}"
+            )
+
+    @contextmanager
+    def budget(
+        self, budget: QueryBudget | None = None, route: str = "", **limits: int
+    ) -> Iterator["QueryCounter"]:
+        """
+        Fails if the block takes more than the budget, given as a QueryBudget
+        or as statements, transactions and checkouts keywords.
+        """
+        budget = (budget or QueryBudget()).model_copy(update=limits)
+        self.start()
+        self.reset()
+        yield self
+        self.check(budget, route)
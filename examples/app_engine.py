@@ -3,6 +3,10 @@ from typing import AsyncGenerator
 
 import uvicorn
 from dyapi import APIBuilder, PostgresEngineStorageManager
+from dyapi.implementations.storages.postgres.advisor import (
+    IndexAdvisor,
+    advisor_endpoint,
+)
 from fastapi import FastAPI
 from sqlalchemy import URL, MetaData
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
@@ -33,7 +37,10 @@ async def lifespan(
     app: FastAPI,
 ) -> AsyncGenerator[None, None]:
     engine = get_postgres_engine()
-    storage_manager = PostgresEngineStorageManager(pg_engine=engine, metadata=metadata)
+    advisor = IndexAdvisor(engine)
+    storage_manager = PostgresEngineStorageManager(
+        pg_engine=engine, metadata=metadata, advisor=advisor
+    )
 
     api_builder = APIBuilder(configs=configs, storage_manager=storage_manager)
     example_router = api_builder.router
@@ -41,12 +48,16 @@ async def lifespan(
     app.state.postgres_engine = engine
 
     app.include_router(example_router)
+    app.add_api_route("/admin/indexes", advisor_endpoint(advisor), methods=["GET"])
 
     async with engine.begin() as conn:
         await conn.run_sync(metadata.create_all)
+    await storage_manager.create_indexes()
+    await storage_manager.start()
 
     yield
 
+    await storage_manager.stop()
     await app.state.postgres_engine.dispose()
 
 
@@ -3,7 +3,7 @@ from tests.fixtures.config import configs
 from tests.fixtures.crud_builder import crud_builder
 from tests.fixtures.endpoint_builder import endpoint_builder
 from tests.fixtures.model_builder import model_builder
-from tests.fixtures.postgres_storage import postgres_storage
+from tests.fixtures.postgres_storage import postgres_storage, postgres_table_storage
 
 __all__ = [
     "configs",
@@ -12,4 +12,5 @@ __all__ = [
     "model_builder",
     "endpoint_builder",
     "postgres_storage",
+    "postgres_table_storage",
 ]
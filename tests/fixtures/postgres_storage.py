@@ -1,7 +1,11 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from dyapi.implementations.storages.postgres.base import PostgresEngineStorage
+from dyapi.implementations.storages.postgres.manager import (
+    PostgresEngineStorageManager,
+)
+from sqlalchemy import MetaData
 
 
 @pytest.fixture
@@ -10,3 +14,11 @@ def postgres_storage():
         pg_engine=MagicMock(),
         table=MagicMock(),
     )
+
+
+@pytest.fixture
+def postgres_table_storage(configs):
+    manager = PostgresEngineStorageManager(pg_engine=MagicMock(), metadata=MetaData())
+    storage = manager.storage(config=configs[0])
+    storage.execute_query = AsyncMock(return_value=MagicMock())
+    return storage
@@ -0,0 +1,79 @@
+import datetime
+import uuid
+
+import pytest
+from dyapi.entities.pagination import (
+    CursorPaginationEntity,
+    InvalidCursorError,
+    PaginationContainer,
+    PaginationEntity,
+)
+from pydantic import ValidationError, create_model
+
+Item = create_model("Item", field1=(int, ...))
+
+
+class TestCursorPaginationEntity:
+    def test_cursor_round_trip(self):
+        cursor = CursorPaginationEntity.encode([1, "a"])
+        assert CursorPaginationEntity(cursor=cursor).values == [1, "a"]
+
+    def test_no_cursor(self):
+        assert CursorPaginationEntity().values is None
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValidationError):
+            CursorPaginationEntity(cursor="not a cursor")
+
+    @pytest.mark.parametrize("values", [[], [[1]], [None], {"a": 1}])
+    def test_malformed_values(self, values):
+        with pytest.raises(ValidationError):
+            CursorPaginationEntity(cursor=CursorPaginationEntity.encode(values))
+
+    def test_key_values(self):
+        key = [uuid.uuid4(), datetime.datetime(2024, 1, 2, 3, 4, 5)]
+        pagination = CursorPaginationEntity(cursor=CursorPaginationEntity.encode(key))
+        assert pagination.key_values([uuid.UUID, datetime.datetime]) == key
+        assert CursorPaginationEntity().key_values([int]) is None
+
+    @pytest.mark.parametrize("values", [["x"], [1, 2]])
+    def test_key_mismatch(self, values):
+        pagination = CursorPaginationEntity(
+            cursor=CursorPaginationEntity.encode(values)
+        )
+        with pytest.raises(InvalidCursorError):
+            pagination.key_values([int])
+
+
+class TestPaginationContainer:
+    def test_page_next_cursor(self):
+        container = PaginationContainer.page(
+            data=[Item(field1=i) for i in range(3)],
+            total=3,
+            pagination=CursorPaginationEntity(limit=2),
+            keys=["field1"],
+        )
+        assert len(container.data) == 2
+        assert container.has_more
+        assert CursorPaginationEntity(cursor=container.next_cursor).values == [1]
+
+    def test_page_last(self):
+        container = PaginationContainer.page(
+            data=[Item(field1=i) for i in range(2)],
+            total=2,
+            pagination=CursorPaginationEntity(limit=2),
+            keys=["field1"],
+        )
+        assert len(container.data) == 2
+        assert not container.has_more
+        assert container.next_cursor is None
+
+    def test_page_offset(self):
+        container = PaginationContainer.page(
+            data=[Item(field1=i) for i in range(3)],
+            total=3,
+            pagination=PaginationEntity(limit=2),
+            keys=["field1"],
+        )
+        assert len(container.data) == 2
+        assert container.next_cursor is None
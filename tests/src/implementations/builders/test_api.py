@@ -1,5 +1,13 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from dyapi import APIBuilder, Config, ConfigField, MemoryStorageManager
+from dyapi.implementations.builders.crud import CRUDBuilder
 from dyapi.implementations.builders.model import ModelBuilder
+from dyapi.implementations.metrics.prometheus import PrometheusMetrics
 from dyapi.interfaces.builders.crud import ICRUDBuilder
+from dyapi.interfaces.storages import IStorageManager
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
 
 
 class TestAPIBuilder:
@@ -13,6 +21,109 @@ class TestAPIBuilder:
 
     def test_router(self, api_builder):
         router = api_builder.router
-        assert len(router.routes) == 10
+        assert len(router.routes) == 20
         assert router.routes[0].path == "/Test/"
         assert router.routes[0].tags == ["tag1"]
+
+    def test_metrics_route(self, configs):
+        metrics = PrometheusMetrics()
+        storage_manager = MagicMock(spec=IStorageManager)
+        storage_manager.storage.return_value.get = AsyncMock(return_value={"field1": 1})
+        api_builder = APIBuilder(
+            configs=configs, storage_manager=storage_manager, metrics=metrics
+        )
+        app = FastAPI()
+        app.include_router(api_builder.router)
+        client = TestClient(app)
+
+        assert len(api_builder.router.routes) == 21
+        client.get("/Test/1")
+        response = client.get("/metrics")
+        assert response.headers["content-type"].startswith("text/plain")
+        assert (
+            'dyapi_operation_duration_seconds_count{layer="endpoint",'
+            'resource="Test",operation="get"} 1' in response.text
+        )
+
+    def test_metrics_skip_not_found(self):
+        metrics = PrometheusMetrics()
+        config = Config(
+            name="items",
+            api_tags=[],
+            fields=[ConfigField(name="id", type=int, location="path")],
+        )
+        api_builder = APIBuilder(
+            configs=[config], storage_manager=MemoryStorageManager(), metrics=metrics
+        )
+        app = FastAPI()
+        app.include_router(api_builder.router)
+        client = TestClient(app)
+
+        assert client.get("/items/1").status_code == 404
+        labels = (("layer", "endpoint"), ("resource", "items"), ("operation", "get"))
+        assert metrics.durations[labels].count == 1
+        assert metrics.errors == {}
+
+    def test_lazy(self, configs):
+        crud_builder = MagicMock(wraps=CRUDBuilder)
+        storage_manager = MagicMock(spec=IStorageManager)
+        storage_manager.storage.return_value.get = AsyncMock(return_value={"field1": 1})
+        api_builder = APIBuilder(
+            configs=configs,
+            storage_manager=storage_manager,
+            crud_builder=crud_builder,
+            lazy=True,
+        )
+        app = FastAPI()
+        app.include_router(api_builder.router)
+        client = TestClient(app)
+
+        assert len(app.routes) == 4 + len(configs)
+        crud_builder.assert_not_called()
+
+        assert client.get("/Test/1").json() == {"field1": 1}
+        assert client.get("/Test/1").status_code == 200
+        assert crud_builder.call_count == 1
+        assert client.patch("/Test/1").status_code == 405
+        assert client.get("/Test/1/2").status_code == 404
+        assert client.get("/Other/1").status_code == 404
+        assert crud_builder.call_count == 1
+
+    def test_lazy_prefix(self, configs):
+        storage_manager = MagicMock(spec=IStorageManager)
+        storage_manager.storage.return_value.get = AsyncMock(return_value={"field1": 1})
+        api_builder = APIBuilder(
+            configs=configs, storage_manager=storage_manager, lazy=True
+        )
+        app = FastAPI()
+        app.include_router(api_builder.router, prefix="/api")
+        client = TestClient(app)
+
+        assert client.get("/api/Test/1").json() == {"field1": 1}
+        assert client.get("/api/Test/1/2").status_code == 404
+        assert client.get("/Test/1").status_code == 404
+
+    def test_export_does_not_shadow_key(self):
+        config = Config(
+            name="pages",
+            api_tags=[],
+            fields=[
+                ConfigField(name="slug", type=str, location="path"),
+                ConfigField(name="title", type=str),
+            ],
+        )
+        api_builder = APIBuilder(
+            configs=[config], storage_manager=MemoryStorageManager()
+        )
+        app = FastAPI()
+        app.include_router(api_builder.router)
+        client = TestClient(app)
+
+        client.post("/pages/", json={"slug": "export", "title": "Export"})
+        assert client.get("/pages/export").json() == {
+            "slug": "export",
+            "title": "Export",
+        }
+        response = client.get("/pages/_export")
+        assert response.status_code == 200
+        assert response.text == '{"slug": "export", "title": "Export"}\n'
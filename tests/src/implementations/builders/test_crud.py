@@ -24,14 +24,24 @@ class TestCRUDBuilder:
 
     def test_router(self, crud_builder):
         router = crud_builder.router
-        assert len(router.routes) == 5
+        assert len(router.routes) == 10
         assert router.routes[0].path == "/"
         assert router.routes[0].methods == {"POST"}
         assert router.routes[1].path == "/"
         assert router.routes[1].methods == {"GET"}
-        assert router.routes[2].path == "/{field1}"
+        assert router.routes[2].path == "/_export"
         assert router.routes[2].methods == {"GET"}
         assert router.routes[3].path == "/{field1}"
-        assert router.routes[3].methods == {"PUT"}
+        assert router.routes[3].methods == {"GET"}
         assert router.routes[4].path == "/{field1}"
-        assert router.routes[4].methods == {"DELETE"}
+        assert router.routes[4].methods == {"PUT"}
+        assert router.routes[5].path == "/{field1}"
+        assert router.routes[5].methods == {"DELETE"}
+        assert router.routes[6].path == "/create_many"
+        assert router.routes[6].methods == {"POST"}
+        assert router.routes[7].path == "/upsert_many"
+        assert router.routes[7].methods == {"POST"}
+        assert router.routes[8].path == "/delete_many"
+        assert router.routes[8].methods == {"POST"}
+        assert router.routes[9].path == "/get_many"
+        assert router.routes[9].methods == {"POST"}
@@ -1,11 +1,13 @@
 # Now continue with your test cases
+import json
 from typing import Callable
 from unittest.mock import MagicMock
 
 import pytest
-from dyapi.entities.pagination import PaginationEntity
+from dyapi.entities.pagination import InvalidCursorError, PaginationEntity
 from dyapi.implementations.builders.endpoint import (
     AlreadyExistsException,
+    InvalidCursorException,
     NotFoundException,
 )
 from dyapi.implementations.storages.exceptions import AlreadyExistsError, NotFoundError
@@ -78,3 +80,82 @@ class TestEndpointBuilder:
             ),
         )
         assert len(container.data) == 2
+
+        endpoint_builder.storage.list.side_effect = InvalidCursorError("mismatch")
+        with pytest.raises(InvalidCursorException):
+            await endpoint(path=MagicMock(), pagination=PaginationEntity())
+
+    async def test_list_endpoint_fast_path(self, endpoint_builder):
+        endpoint_builder.model.config.fast_path = True
+        entity = endpoint_builder.model.entity
+        endpoint_builder.storage.list.return_value = (
+            [entity.model_construct(field1=1), entity.model_construct(field1=2)],
+            2,
+        )
+        response = await endpoint_builder.list(
+            path=endpoint_builder.model.query(),
+            pagination=PaginationEntity(offset=0, limit=1),
+        )
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == {
+            "pagination": {"offset": 0, "limit": 1},
+            "data": [{"field1": 1}],
+            "total": 2,
+            "has_more": True,
+            "next_cursor": None,
+        }
+
+    async def test_get_many_endpoint(self, endpoint_builder):
+        endpoint = endpoint_builder.get_many
+        entity = endpoint_builder.model.entity
+        path = endpoint_builder.model.path
+        endpoint_builder.storage.get_many.return_value = (
+            [entity(field1=1)],
+            [path(field1=2)],
+        )
+        container = await endpoint(paths=[path(field1=1), path(field1=2)])
+        assert container.data == [entity(field1=1)]
+        assert container.missing == [path(field1=2)]
+
+    async def test_create_many_endpoint(self, endpoint_builder):
+        endpoint = endpoint_builder.create_many
+        entity = endpoint_builder.model.entity
+        endpoint_builder.storage.create_many.return_value = (
+            [entity(field1=1)],
+            [entity(field1=2)],
+        )
+        container = await endpoint(entities=[entity(field1=1), entity(field1=2)])
+        assert container.data == [entity(field1=1)]
+        assert container.conflicts == [endpoint_builder.model.path(field1=2)]
+
+    async def test_upsert_many_endpoint(self, endpoint_builder):
+        endpoint = endpoint_builder.upsert_many
+        entity = endpoint_builder.model.entity
+        endpoint_builder.storage.upsert_many.return_value = [entity(field1=1)]
+        container = await endpoint(entities=[entity(field1=1)])
+        assert container.data == [entity(field1=1)]
+
+    async def test_delete_many_endpoint(self, endpoint_builder):
+        endpoint = endpoint_builder.delete_many
+        path = endpoint_builder.model.path
+        endpoint_builder.storage.delete_many.return_value = (
+            [path(field1=1)],
+            [path(field1=2)],
+        )
+        container = await endpoint(paths=[path(field1=1), path(field1=2)])
+        assert container.data == [path(field1=1)]
+        assert container.missing == [path(field1=2)]
+
+    async def test_export_endpoint(self, endpoint_builder):
+        endpoint = endpoint_builder.export
+        entity = endpoint_builder.model.entity
+
+        async def stream(*args, **kwargs):
+            yield entity(field1=1)
+            yield entity(field1=2)
+
+        endpoint_builder.storage.stream = stream
+        response = await endpoint(path=endpoint_builder.model.query(), format="csv")
+        assert response.media_type == "text/csv"
+        body = "".join([chunk async for chunk in response.body_iterator])
+        assert body == "field1\r\n1\r\n2\r\n"
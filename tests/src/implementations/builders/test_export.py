@@ -0,0 +1,39 @@
+from dyapi.implementations.builders import export
+from dyapi.implementations.builders.export import encode_export
+from pydantic import BaseModel
+
+
+class Row(BaseModel):
+    id: int
+    name: str
+
+
+async def rows(count: int):
+    for i in range(count):
+        yield Row(id=i, name=f"name {i}")
+
+
+async def collect(chunks) -> str:
+    return "".join([chunk async for chunk in chunks])
+
+
+class TestEncodeExport:
+    async def test_ndjson(self):
+        body = await collect(encode_export(rows(2), ["id", "name"], "ndjson"))
+        assert body == '{"id": 0, "name": "name 0"}\n{"id": 1, "name": "name 1"}\n'
+
+    async def test_csv(self):
+        body = await collect(encode_export(rows(2), ["id", "name"], "csv"))
+        assert body == "id,name\r\n0,name 0\r\n1,name 1\r\n"
+
+    async def test_empty_csv_has_header(self):
+        body = await collect(encode_export(rows(0), ["id", "name"], "csv"))
+        assert body == "id,name\r\n"
+
+    async def test_chunks(self, monkeypatch):
+        monkeypatch.setattr(export, "CHUNK_SIZE", 64)
+        chunks = [
+            chunk async for chunk in encode_export(rows(10), ["id", "name"], "ndjson")
+        ]
+        assert len(chunks) > 1
+        assert "".join(chunks).count("\n") == 10
@@ -1,5 +1,16 @@
+import inspect
+
+import pytest
 from dyapi import ConfigField
-from pydantic import BaseModel
+from dyapi.implementations.builders.model import (
+    ModelBuilder,
+    SharedModelBuilder,
+    SQLAlchemyModelSchemaBuilder,
+)
+from fastapi import Query
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.orm import DeclarativeBase
 
 
 class TestModelBuilder:
@@ -35,8 +46,102 @@ class TestModelBuilder:
         assert model.__name__.startswith("QueryModel")
         assert model.model_fields["field1"].annotation == int | None
 
+    def test_query_operators(self, configs):
+        config = configs[0].model_copy(
+            update={
+                "fields": [
+                    ConfigField(
+                        name="field1",
+                        type=int,
+                        location="path",
+                        operators=["gte", "in", "is_null"],
+                    ),
+                    ConfigField(name="name", type=str, operators=["prefix"]),
+                ]
+            }
+        )
+        model = ModelBuilder(config).query
+        assert model(field1__gte="2", field1__in=["1"]).model_dump(
+            exclude_none=True
+        ) == {"field1__gte": 2, "field1__in": [1]}
+        assert model.model_fields["name__prefix"].annotation == str | None
+        assert [*model.model_fields] == [
+            "field1",
+            "field1__gte",
+            "field1__in",
+            "field1__is_null",
+            "name__prefix",
+        ]
+        with pytest.raises(ValidationError):
+            model(field1__gte="a")
+        # FastAPI reads the values of `in` filters from the query string.
+        default = inspect.signature(model).parameters["field1__in"].default
+        assert isinstance(default, type(Query()))
+
+    def test_prefix_requires_str(self):
+        with pytest.raises(ValidationError):
+            ConfigField(name="field1", type=int, operators=["prefix"])
+
     def test_entity_model(self, model_builder):
         model = model_builder.entity
         assert issubclass(model, BaseModel)
         assert model.__name__.startswith("EntityModel")
         assert model.model_fields["field1"].annotation == int
+
+
+class TestSharedModelBuilder:
+    def test_shares_identical_models(self, configs):
+        model_builder = SharedModelBuilder.scoped()
+        first = model_builder(configs[0])
+        second = model_builder(configs[0].model_copy(update={"name": "Other"}))
+        assert first.entity is second.entity
+        assert first.path is second.path
+        assert first.query is not first.path
+        assert first.entity is not model_builder(configs[1]).entity
+
+    def test_scoped(self, configs):
+        first = SharedModelBuilder.scoped()
+        second = SharedModelBuilder.scoped()
+        assert first(configs[0]).entity is not second(configs[0]).entity
+        assert not SharedModelBuilder.models
+        assert repr(first) == repr(SharedModelBuilder)
+
+    def test_discard(self, configs):
+        model_builder = SharedModelBuilder.scoped()
+        entity = model_builder(configs[0]).entity
+        model_builder(configs[0].model_copy(update={"name": "Other"})).entity
+        model_builder(configs[1]).entity
+
+        model_builder.discard(configs[0].name)
+        assert model_builder(configs[0]).entity is entity
+        model_builder.discard(configs[0].name)
+        model_builder.discard("Other")
+        assert len(model_builder.models) == 1
+        assert model_builder(configs[0]).entity is not entity
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Product(Base):
+    __tablename__ = "product"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+class TestSQLAlchemyModelSchemaBuilder:
+    def test_filter_operators(self):
+        builder = SQLAlchemyModelSchemaBuilder(
+            Product, operators={"id": ["lt", "in"], "name": ["prefix"]}
+        )
+        assert [*builder.filter.model_fields] == [
+            "id",
+            "name",
+            "id__lt",
+            "id__in",
+            "name__prefix",
+        ]
+        assert builder.filter.model_fields["id__in"].annotation == list[int] | None
+        with pytest.raises(ValueError):
+            SQLAlchemyModelSchemaBuilder(Product, operators={"id": ["prefix"]})
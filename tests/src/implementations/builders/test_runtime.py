@@ -0,0 +1,131 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from dyapi import APIBuilder, Config, ConfigField, MemoryStorageManager
+from dyapi.implementations.builders.model import SharedModelBuilder
+from dyapi.interfaces.storages import IStorageManager
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+def item_config(name="items", key="id"):
+    return Config(
+        name=name,
+        api_tags=[],
+        fields=[
+            ConfigField(name=key, type=int, location="path"),
+            ConfigField(name="name", type=str),
+        ],
+    )
+
+
+def serve(configs, lazy=False):
+    api_builder = APIBuilder(
+        configs=configs, storage_manager=MemoryStorageManager(), lazy=lazy
+    )
+    app = FastAPI()
+    api_builder.mount(app, prefix="/api")
+
+    @app.get("/api/other/")
+    def other():
+        return "other"
+
+    return api_builder, app, TestClient(app)
+
+
+class TestRuntimeChanges:
+    def test_add(self):
+        api_builder, app, client = serve([item_config()])
+        assert (
+            client.post("/api/items/", json={"id": 1, "name": "a"}).status_code == 200
+        )
+        assert client.get("/api/other/").json() == "other"
+        document = client.get("/openapi.json").json()
+        assert "/api/items/{id}" in document["paths"]
+
+        api_builder.add(item_config("orders"))
+        assert (
+            client.post("/api/orders/", json={"id": 1, "name": "b"}).status_code == 200
+        )
+        assert client.get("/api/orders/1").json() == {"id": 1, "name": "b"}
+        assert client.get("/api/items/1").json() == {"id": 1, "name": "a"}
+        assert "/api/orders/{id}" in app.openapi_schema["paths"]
+        assert "/api/items/{id}" in app.openapi_schema["paths"]
+
+    def test_replace(self):
+        api_builder, app, client = serve([item_config()], lazy=True)
+        client.get("/openapi.json")
+        api_builder.add(item_config(key="code"))
+        assert api_builder.configs[0].fields[0].name == "code"
+        assert (
+            client.post("/api/items/", json={"code": 1, "name": "a"}).status_code == 200
+        )
+        assert client.get("/api/items/1").json() == {"code": 1, "name": "a"}
+        assert "/api/items/{code}" in app.openapi_schema["paths"]
+        assert "/api/items/{id}" not in app.openapi_schema["paths"]
+
+    def test_failed_replacement(self):
+        api_builder, app, client = serve([item_config()])
+        client.post("/api/items/", json={"id": 1, "name": "a"})
+        manager = api_builder.storage_manager
+        storage = manager.storage
+        manager.storage = MagicMock(side_effect=RuntimeError("broken"))
+        with pytest.raises(RuntimeError):
+            api_builder.add(item_config(key="code"))
+        manager.storage = storage
+        # The previous resource keeps serving its rows.
+        assert client.get("/api/items/1").json() == {"id": 1, "name": "a"}
+        assert api_builder.configs[0].fields[0].name == "id"
+
+    def test_remove(self):
+        api_builder, app, client = serve([item_config(), item_config("orders")])
+        client.get("/openapi.json")
+        api_builder.remove("items")
+        assert client.get("/api/items/").status_code == 404
+        assert client.get("/api/orders/").status_code == 200
+        assert "/api/items/" not in app.openapi_schema["paths"]
+        assert "EntityModelitems" not in app.openapi_schema["components"]["schemas"]
+        assert "HTTPValidationError" in app.openapi_schema["components"]["schemas"]
+
+    def test_remove_shared_models(self):
+        api_builder = APIBuilder(
+            configs=[item_config(), item_config("orders", key="code")],
+            storage_manager=MemoryStorageManager(),
+            model_builder=SharedModelBuilder,
+        )
+        api_builder.router
+        assert len(api_builder.model_builder.models) == 7
+
+        api_builder.add(item_config("orders", key="number"))
+        assert len(api_builder.model_builder.models) == 7
+        api_builder.remove("orders")
+        assert len(api_builder.model_builder.models) == 4
+        assert not SharedModelBuilder.models
+
+    async def test_requests_in_flight_finish(self):
+        release = asyncio.Event()
+
+        async def get(filter_, response_model):
+            await release.wait()
+            return response_model(id=filter_.id, name="old")
+
+        storage_manager = MagicMock(spec=IStorageManager)
+        storage_manager.storage.return_value.get = AsyncMock(side_effect=get)
+        api_builder = APIBuilder(
+            configs=[item_config()], storage_manager=storage_manager
+        )
+        app = FastAPI()
+        api_builder.mount(app)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://t"
+        ) as client:
+            request = asyncio.create_task(client.get("/items/1"))
+            await asyncio.sleep(0.01)
+            api_builder.remove("items")
+            release.set()
+            assert (await request).json() == {"id": 1, "name": "old"}
+            assert (await client.get("/items/1")).status_code == 404
@@ -0,0 +1,93 @@
+import json
+from unittest.mock import MagicMock
+
+from dyapi import APIBuilder
+from dyapi.implementations.builders.api import ModelAPIBuilder
+from dyapi.implementations.builders.crud import CRUDBuilder
+from dyapi.interfaces.storages import IStorageManager
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import DeclarativeBase, mapped_column
+
+
+class RecordingCRUDBuilder(CRUDBuilder):
+    built: list[str] = []
+
+    def __init__(self, config, **kwargs):
+        self.built.append(config.name)
+        super().__init__(config=config, **kwargs)
+
+
+def serve(configs, snapshot, lazy=False):
+    RecordingCRUDBuilder.built = []
+    api_builder = APIBuilder(
+        configs=configs,
+        storage_manager=MagicMock(spec=IStorageManager),
+        crud_builder=RecordingCRUDBuilder,
+        lazy=lazy,
+        snapshot=snapshot,
+    )
+    app = FastAPI()
+    app.include_router(api_builder.router, prefix="/api")
+    api_builder.extend_openapi(app, prefix="/api")
+    return TestClient(app).get("/openapi.json").json(), RecordingCRUDBuilder.built
+
+
+class TestSnapshot:
+    def test_writes_and_loads(self, configs, tmp_path):
+        path = tmp_path / "openapi.json"
+        cold, _ = serve(configs, path)
+        assert "/api/Test/{field1}" in cold["paths"]
+        assert "EntityModelTest" in cold["components"]["schemas"]
+        assert set(json.loads(path.read_text())["resources"]) == {"Test", "Test2"}
+
+        warm, built = serve(configs, path, lazy=True)
+        assert warm == cold
+        assert built == []
+
+    def test_regenerates_changed_resources(self, configs, tmp_path):
+        path = tmp_path / "openapi.json"
+        serve(configs, path)
+        configs[1] = configs[1].model_copy(update={"api_tags": ["other"]})
+        document, built = serve(configs, path, lazy=True)
+        assert built == ["Test2"]
+        assert document["paths"]["/api/Test2/"]["get"]["tags"] == ["other"]
+
+    def test_ignores_other_versions(self, configs, tmp_path):
+        path = tmp_path / "openapi.json"
+        serve(configs, path)
+        snapshot = json.loads(path.read_text())
+        path.write_text(json.dumps({**snapshot, "version": 0}))
+        _, built = serve(configs, path, lazy=True)
+        assert built == ["Test", "Test2"]
+
+    def test_lazy_without_snapshot(self, configs):
+        document, _ = serve(configs, None, lazy=True)
+        assert "/api/Test/{field1}" in document["paths"]
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+    id = mapped_column(Integer, primary_key=True)
+    name = mapped_column(String)
+
+
+def test_model_api_builder(tmp_path):
+    path = tmp_path / "openapi.json"
+    documents = []
+    for _ in range(2):
+        api_builder = ModelAPIBuilder(
+            model=Item, db_session=MagicMock(), api_prefix="/items", snapshot=path
+        )
+        app = FastAPI()
+        app.include_router(api_builder.router)
+        api_builder.extend_openapi(app)
+        documents.append(TestClient(app).get("/openapi.json").json())
+    assert "/items/{id}" in documents[0]["paths"]
+    assert documents[0] == documents[1]
+    assert set(json.loads(path.read_text())["resources"]) == {"items"}
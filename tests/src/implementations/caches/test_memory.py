@@ -0,0 +1,46 @@
+from dyapi.implementations.caches import memory
+from dyapi.implementations.caches.memory import MemoryCacheBackend
+
+
+class TestMemoryCacheBackend:
+    async def test_get_set(self):
+        cache = MemoryCacheBackend()
+        assert await cache.get("a") is None
+        await cache.set("a", 1)
+        assert await cache.get("a") == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_lru_eviction(self):
+        cache = MemoryCacheBackend(maxsize=2)
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.get("a")
+        await cache.set("c", 3)
+        assert await cache.get("b") is None
+        assert await cache.get("a") == 1
+        assert cache.evictions == 1
+        assert len(cache) == 2
+
+    async def test_ttl(self, monkeypatch):
+        cache = MemoryCacheBackend(ttl=10)
+        monkeypatch.setattr(memory.time, "monotonic", lambda: 100.0)
+        await cache.set("a", 1)
+        monkeypatch.setattr(memory.time, "monotonic", lambda: 111.0)
+        assert await cache.get("a") is None
+        assert len(cache) == 0
+
+    async def test_delete_clear(self):
+        cache = MemoryCacheBackend()
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.delete("a", "missing")
+        assert await cache.get("a") is None
+        await cache.clear()
+        assert len(cache) == 0
+
+    async def test_clear_namespace(self):
+        cache = MemoryCacheBackend()
+        await cache.set("items:[1]", 1)
+        await cache.set("items2:[1]", 2)
+        await cache.clear_namespace("items")
+        assert len(cache) == 1 and await cache.get("items2:[1]") == 2
@@ -0,0 +1,77 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from dyapi.implementations.caches import postgres
+from dyapi.implementations.caches.postgres import PostgresInvalidationBus
+
+
+@pytest.fixture
+def bus():
+    engine = MagicMock()
+    conn = MagicMock(execute=AsyncMock())
+    engine.begin.return_value.__aenter__ = AsyncMock(return_value=conn)
+    engine.begin.return_value.__aexit__ = AsyncMock(return_value=None)
+    return PostgresInvalidationBus(engine, flush_interval=0)
+
+
+def payloads(bus) -> list[dict]:
+    conn = bus.pg_engine.begin.return_value.__aenter__.return_value
+    return [
+        json.loads([*call.args[0].compile().params.values()][-1])
+        for call in conn.execute.call_args_list
+    ]
+
+
+class TestPostgresInvalidationBus:
+    async def test_publish_coalesces(self, bus):
+        await bus.publish("items", ["items:[1]", "items:[2]"])
+        await bus.publish("items", ["items:[1]"])
+        await bus.publish("orders", ["orders:[1]"])
+        await bus.flusher
+        assert bus.pg_engine.begin.call_count == 1
+        assert [(item["namespace"], item["keys"]) for item in payloads(bus)] == [
+            ("items", ["items:[1]", "items:[2]"]),
+            ("orders", ["orders:[1]"]),
+        ]
+
+    async def test_payloads_split(self, bus, monkeypatch):
+        monkeypatch.setattr(postgres, "MAX_PAYLOAD", 120)
+        keys = [f"items:[{i}]" for i in range(20)]
+        result = [json.loads(item) for item in bus.payloads({"items": set(keys)})]
+        assert len(result) > 1
+        assert sorted(key for item in result for key in item["keys"]) == sorted(keys)
+
+    async def test_dispatch(self, bus):
+        evict = AsyncMock()
+        bus.subscribe("items", evict)
+        await bus.dispatch(bus.encode("items", ["items:[1]"]))
+        evict.assert_not_awaited()
+
+        other = json.dumps(
+            {"origin": "other", "namespace": "items", "keys": ["items:[1]"]}
+        )
+        bus.on_notification(None, 1, bus.channel, other)
+        await asyncio.sleep(0)
+        evict.assert_awaited_once_with(["items:[1]"])
+
+    async def test_unsubscribe(self, bus):
+        evict = AsyncMock()
+        bus.subscribe("items", evict)
+        bus.unsubscribe("items", evict)
+        bus.unsubscribe("orders", evict)
+        other = json.dumps({"origin": "other", "namespace": "items", "keys": []})
+        await bus.dispatch(other)
+        evict.assert_not_awaited()
+
+    async def test_reconnect_evicts_everything(self, bus):
+        evict = AsyncMock()
+        bus.subscribe("items", evict)
+        bus.reconnect_interval = 0
+        bus.pg_engine.connect.side_effect = OSError
+        await bus.start()
+        await asyncio.sleep(0.01)
+        await bus.stop()
+        evict.assert_awaited_with(None)
+        assert bus.listener is None
@@ -0,0 +1,76 @@
+import pytest
+from dyapi.implementations.metrics.prometheus import PrometheusMetrics
+from dyapi.implementations.metrics.timing import instrumented, timed
+from dyapi.implementations.storages.exceptions import NotFoundError
+from fastapi import HTTPException
+
+
+class TestPrometheusMetrics:
+    def test_render_histogram(self):
+        metrics = PrometheusMetrics(buckets=[0.1, 1.0])
+        metrics.observe("endpoint", "items", "get", 0.05)
+        metrics.observe("endpoint", "items", "get", 0.5)
+        metrics.observe("endpoint", "items", "get", 5.0, error=True)
+
+        text = metrics.render()
+        labels = 'layer="endpoint",resource="items",operation="get"'
+        assert "# TYPE dyapi_operation_duration_seconds histogram" in text
+        assert f'dyapi_operation_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+        assert f'dyapi_operation_duration_seconds_bucket{{{labels},le="1.0"}} 2' in text
+        assert (
+            f'dyapi_operation_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+        )
+        assert f"dyapi_operation_duration_seconds_sum{{{labels}}} 5.55" in text
+        assert f"dyapi_operation_duration_seconds_count{{{labels}}} 3" in text
+        assert f"dyapi_operation_errors_total{{{labels}}} 1" in text
+
+    def test_render_rows(self):
+        metrics = PrometheusMetrics()
+        metrics.rows("items", "list", 10)
+        metrics.rows("items", "list", 5)
+        assert 'dyapi_rows_total{resource="items",operation="list"} 15' in (
+            metrics.render()
+        )
+
+    def test_escapes_labels(self):
+        metrics = PrometheusMetrics()
+        metrics.rows('a"b\\c', "list", 1)
+        assert 'resource="a\\"b\\\\c"' in metrics.render()
+
+    def test_timed_records_errors(self):
+        metrics = PrometheusMetrics()
+        with timed(metrics, "storage", "items", "get"):
+            pass
+        with pytest.raises(ValueError):
+            with timed(metrics, "storage", "items", "get"):
+                raise ValueError
+
+        labels = (("layer", "storage"), ("resource", "items"), ("operation", "get"))
+        assert metrics.durations[labels].count == 2
+        assert metrics.errors[labels] == 1
+
+    def test_timed_skips_client_errors(self):
+        metrics = PrometheusMetrics()
+        with pytest.raises(NotFoundError):
+            with timed(metrics, "storage", "items", "get"):
+                raise NotFoundError
+        with pytest.raises(HTTPException):
+            with timed(metrics, "endpoint", "items", "get"):
+                raise HTTPException(status_code=404)
+        with pytest.raises(HTTPException):
+            with timed(metrics, "endpoint", "items", "get"):
+                raise HTTPException(status_code=503)
+
+        labels = (("layer", "endpoint"), ("resource", "items"), ("operation", "get"))
+        assert metrics.durations[labels].count == 2
+        assert metrics.errors == {labels: 1}
+
+    async def test_instrumented_keeps_signature(self):
+        async def endpoint(path: int, flag: bool = False) -> int:
+            return path
+
+        metrics = PrometheusMetrics()
+        wrapped = instrumented(endpoint, metrics, "items", "get")
+        assert wrapped.__wrapped__ is endpoint
+        assert await wrapped(path=1) == 1
+        assert instrumented(endpoint, None, "items", "get") is endpoint
@@ -0,0 +1,213 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from dyapi import Config, ConfigField, PostgresEngineStorageManager
+from dyapi.entities.index_settings import IndexSettings
+from dyapi.entities.pagination import PaginationEntity
+from dyapi.implementations.storages.postgres.advisor import (
+    Explain,
+    FilterShape,
+    IndexAdvisor,
+)
+from pydantic import BaseModel, create_model
+from sqlalchemy import ForeignKeyConstraint, MetaData, UniqueConstraint
+from sqlalchemy.dialects.postgresql import asyncpg
+
+CONFIG = Config(
+    name="orders",
+    api_tags=[],
+    fields=[
+        ConfigField(name="id", type=int, location="path"),
+        ConfigField(name="status", type=str, filterable=True),
+        ConfigField(name="owner", type=int, filterable=True),
+    ],
+)
+
+
+class Order(BaseModel):
+    id: int
+    status: str
+    owner: int
+
+
+def engine(*plans, errors=()):
+    plans, errors = iter(plans), iter(errors)
+
+    async def execute(statement):
+        if isinstance(statement, Explain):
+            return MagicMock(scalar=MagicMock(return_value=json.dumps(next(plans))))
+        error = next(errors, None)
+        if error is not None:
+            raise error
+
+    engine = MagicMock()
+    engine.dialect = asyncpg.dialect()
+    conn = engine.connect.return_value.__aenter__.return_value
+    conn.execution_options = AsyncMock(return_value=conn)
+    conn.execute = AsyncMock(side_effect=execute)
+    return engine
+
+
+def executed(pg_engine, explain):
+    conn = pg_engine.connect.return_value.__aenter__.return_value
+    return [
+        call.args[0]
+        for call in conn.execute.await_args_list
+        if isinstance(call.args[0], Explain) == explain
+    ]
+
+
+def plan(cost, node="Seq Scan"):
+    return [
+        {"Plan": {"Node Type": node, "Relation Name": "orders", "Total Cost": cost}}
+    ]
+
+
+def advised(pg_engine, **options):
+    advisor = IndexAdvisor(pg_engine, min_count=2, **options)
+    manager = PostgresEngineStorageManager(pg_engine, MetaData(), advisor=advisor)
+    return advisor, manager.build_table(CONFIG)
+
+
+class TestIndexAdvisor:
+    async def test_storage_records_shapes(self):
+        advisor = IndexAdvisor(MagicMock())
+        manager = PostgresEngineStorageManager(MagicMock(), MetaData(), advisor=advisor)
+        storage = manager.storage(CONFIG)
+        storage.execute_query = AsyncMock(return_value=MagicMock())
+        filter_ = create_model(
+            "Filter", status=(str | None, None), owner=(int | None, None)
+        )
+        for owner in (1, 2):
+            await storage.list(
+                filter_=filter_(owner=owner, status="open"),
+                pagination=PaginationEntity(offset=0, limit=10),
+                response_model=Order,
+            )
+        storage.execute_query.return_value.fetchone.return_value = (1, "open", 2)
+        await storage.get(create_model("Key", id=(int, ...))(id=1), Order)
+
+        reports = {tuple(report.fields): report for report in advisor.report()}
+        assert reports[("owner", "status")].operation == "list"
+        assert reports[("owner", "status")].count == 2
+        assert reports[("id",)].operation == "get"
+        assert advisor.shapes[("orders", "list", ("owner", "status"))].values == {
+            "owner": 2,
+            "status": "open",
+        }
+
+    async def test_analyze_recommends(self):
+        pg_engine = engine(plan(100.0), plan(8.0, "Index Scan"))
+        advisor, table = advised(pg_engine)
+        advisor.record(table, "list", {"status": "open", "owner": 1}, 0.5)
+        advisor.record(table, "list", {"status": "open", "owner": 1}, 0.3)
+        advisor.record(table, "list", {"id": 1}, 0.1)
+        advisor.record(table, "list", {"id": 1}, 0.1)
+        # Read too rarely to be explained.
+        advisor.record(table, "list", {"status": "open"}, 2.0)
+
+        reports = await advisor.analyze()
+
+        explained = executed(pg_engine, explain=True)[0].compile(
+            dialect=asyncpg.dialect()
+        )
+        assert str(explained).startswith("EXPLAIN (FORMAT JSON) SELECT")
+        # Values are bound, never inlined.
+        assert "orders.owner = $2" in str(explained)
+        assert explained.params == {"owner_1": 1, "status_1": "open"}
+        assert [report.fields for report in reports] == [
+            ["status"],
+            ["owner", "status"],
+            ["id"],
+        ]
+        assert reports[0].seq_scan is None and reports[0].recommendation is None
+        assert reports[1].plan_cost == 100.0
+        assert reports[1].mean_seconds == 0.4
+        assert reports[1].recommendation == IndexSettings(fields=["status", "owner"])
+        # Answered by the unique constraint.
+        assert reports[2].seq_scan is False and reports[2].recommendation is None
+
+    async def test_covered_by_index(self):
+        advisor, _ = advised(engine(plan(10.0)))
+        table = PostgresEngineStorageManager(MagicMock(), MetaData()).build_table(
+            CONFIG.model_copy(
+                update={"indexes": [IndexSettings(fields=["owner", "status"])]}
+            )
+        )
+        advisor.record(table, "list", {"owner": 1}, 0.1)
+        advisor.record(table, "list", {"owner": 1}, 0.1)
+        await advisor.analyze()
+        assert advisor.report()[0].recommendation is None
+
+    async def test_auto_create(self):
+        pg_engine = engine(plan(10.0), plan(10.0))
+        advisor, table = advised(pg_engine, auto_create=3)
+        for _ in range(3):
+            advisor.record(table, "list", {"owner": 1}, 0.2)
+        advisor.record(table, "list", {"status": "open"}, 0.1)
+        advisor.record(table, "list", {"status": "open"}, 0.1)
+
+        await advisor.analyze()
+
+        conn = pg_engine.connect.return_value.__aenter__.return_value
+        conn.execution_options.assert_awaited_once_with(isolation_level="AUTOCOMMIT")
+        [statement] = map(str, executed(pg_engine, explain=False))
+        assert statement == (
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_owner "
+            "ON orders USING btree (owner)"
+        )
+        reports = advisor.report()
+        assert reports[0].created == "ix_orders_owner"
+        # Now covered by the index created.
+        assert reports[0].recommendation is None
+        assert reports[1].created is None
+
+    async def test_auto_create_failure(self):
+        pg_engine = engine(plan(10.0), errors=[Exception("timeout")])
+        advisor, table = advised(pg_engine, auto_create=2)
+        advisor.record(table, "list", {"owner": 1}, 0.2)
+        advisor.record(table, "list", {"owner": 1}, 0.2)
+
+        await advisor.analyze()
+
+        assert not table.indexes
+        assert advisor.report()[0].recommendation is not None
+
+    async def test_dump(self, tmp_path):
+        advisor, table = advised(engine())
+        advisor.record(table, "get", {"id": 1}, 0.1)
+        path = tmp_path / "indexes.json"
+        advisor.dump(path)
+        assert json.loads(path.read_text())[0]["fields"] == ["id"]
+
+    def test_discard(self):
+        advisor, table = advised(engine())
+        advisor.record(table, "get", {"id": 1}, 0.1)
+        advisor.discard("orders")
+        assert advisor.report() == []
+
+    async def test_operators(self):
+        pg_engine = engine(plan(50.0))
+        advisor, table = advised(pg_engine)
+        for owner in (1, 2):
+            advisor.record(table, "list", {"status__prefix": "op", "owner": owner}, 0.1)
+
+        [report] = await advisor.analyze()
+
+        explained = executed(pg_engine, explain=True)[0].compile(
+            dialect=asyncpg.dialect()
+        )
+        assert "orders.status LIKE $" in str(explained)
+        assert "op%" in explained.params.values()
+        assert report.fields == ["owner", "status__prefix"]
+        # Equality columns lead, ranges follow.
+        assert report.recommendation == IndexSettings(fields=["owner", "status"])
+
+    def test_covered_by_constraints(self):
+        _, table = advised(engine())
+        shape = FilterShape(table, "list", ("owner",))
+        assert not shape.covered()
+        table.append_constraint(ForeignKeyConstraint(["owner"], ["owners.id"]))
+        assert not shape.covered()
+        table.append_constraint(UniqueConstraint("owner"))
+        assert shape.covered()
@@ -1,6 +1,21 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
-from pydantic import BaseModel
+import pytest
+from dyapi import PostgresEngineStorageManager
+from dyapi.entities.pagination import (
+    CursorPaginationEntity,
+    InvalidCursorError,
+    PaginationEntity,
+)
+from dyapi.implementations.storages.exceptions import NotFoundError
+from dyapi.implementations.storages.postgres.base import (
+    SQLAlchemyStorage,
+    key_columns,
+    paginate,
+)
+from pydantic import BaseModel, create_model
+from sqlalchemy import Column, Integer, MetaData, String, Table, UniqueConstraint
+from sqlalchemy.orm import DeclarativeBase
 
 
 class TestEntity(BaseModel):
@@ -26,3 +41,297 @@ class TestPostgresStorage:
             price=1.0,
         )
         assert entity == await postgres_storage.create(entity=entity)
+
+
+class TestPostgresStorageList:
+    async def test_list_offset(self, postgres_table_storage):
+        filter_ = create_model("Filter", field1=(int | None, None))()
+        await postgres_table_storage.list(
+            filter_=filter_,
+            pagination=PaginationEntity(offset=20, limit=10),
+            response_model=TestEntity,
+        )
+        query = str(postgres_table_storage.execute_query.call_args_list[0].args[0])
+        assert "ORDER BY" in query
+        assert "OFFSET" in query
+
+    async def test_list_cursor(self, postgres_table_storage):
+        filter_ = create_model("Filter", field1=(int | None, None))()
+        await postgres_table_storage.list(
+            filter_=filter_,
+            pagination=CursorPaginationEntity(
+                cursor=CursorPaginationEntity.encode([5]), limit=10
+            ),
+            response_model=TestEntity,
+        )
+        query, params = postgres_table_storage.execute_query.call_args_list[0].args
+        assert 'WHERE "Test".field1 > :cursor_field1' in str(query)
+        assert "OFFSET" not in str(query)
+        assert params == {"cursor_field1": 5, "limit": 11}
+
+    @pytest.mark.parametrize("values", [["x"], [1, 2]])
+    async def test_list_cursor_mismatch(self, postgres_table_storage, values):
+        filter_ = create_model("Filter", field1=(int | None, None))()
+        with pytest.raises(InvalidCursorError):
+            await postgres_table_storage.list(
+                filter_=filter_,
+                pagination=CursorPaginationEntity(
+                    cursor=CursorPaginationEntity.encode(values), limit=10
+                ),
+                response_model=TestEntity,
+            )
+        postgres_table_storage.execute_query.assert_not_called()
+
+    async def test_list_reuses_statement(self, postgres_table_storage):
+        filter_ = create_model("Filter", field1=(int | None, None))
+        for field1 in (None, 1, 2):
+            await postgres_table_storage.list(
+                filter_=filter_(field1=field1),
+                pagination=PaginationEntity(offset=field1 or 0, limit=10),
+                response_model=TestEntity,
+            )
+        calls = postgres_table_storage.execute_query.call_args_list
+        pages = [call for call in calls if "LIMIT" in str(call.args[0])]
+        assert pages[1].args[0] is pages[2].args[0]
+        assert pages[2].args[1] == {"filter_field1": 2, "limit": 11, "offset": 2}
+        assert postgres_table_storage.statements.stats()["hits"] == 1
+        assert postgres_table_storage.statements.stats()["misses"] == 2
+
+    async def test_list_operators(self, postgres_table_storage):
+        filter_ = create_model(
+            "Filter",
+            field1__gte=(int | None, None),
+            field1__in=(list[int] | None, None),
+        )
+        for values in ([1, 2], [3]):
+            await postgres_table_storage.list(
+                filter_=filter_(field1__gte=2, field1__in=values),
+                pagination=PaginationEntity(limit=10),
+                response_model=TestEntity,
+            )
+        calls = postgres_table_storage.execute_query.call_args_list
+        pages = [call for call in calls if "LIMIT" in str(call.args[0])]
+        query, params = pages[1].args
+        assert pages[0].args[0] is query
+        assert (
+            'WHERE "Test".field1 >= :filter_field1__gte '
+            'AND "Test".field1 = ANY (:filter_field1__in)'
+        ) in str(query)
+        assert params["filter_field1__in"] == [3]
+        count = str(calls[-1].args[0])
+        assert "count" in count and "ANY (ARRAY[" in count
+
+    async def test_stream(self, postgres_table_storage):
+        queries = []
+
+        async def stream_query(query):
+            queries.append(query)
+            yield [(1,), (2,)]
+            yield [(3,)]
+
+        postgres_table_storage.stream_query = stream_query
+        filter_ = create_model("Filter", field1=(int | None, None))()
+        Entity = create_model("Entity", field1=(int, ...))
+        entities = [
+            entity
+            async for entity in postgres_table_storage.stream(
+                filter_=filter_, response_model=Entity
+            )
+        ]
+        assert [entity.field1 for entity in entities] == [1, 2, 3]
+        assert "ORDER BY" in str(queries[0])
+
+    def test_paginate_composite_key(self):
+        table = Table(
+            "composite",
+            MetaData(),
+            Column("a", Integer),
+            Column("b", String),
+            UniqueConstraint("a", "b"),
+        )
+        query = paginate(
+            table.select(),
+            key_columns(table),
+            CursorPaginationEntity(cursor=CursorPaginationEntity.encode([1, "x"])),
+        )
+        assert "WHERE (composite.a, composite.b) > (" in str(query)
+        assert "ORDER BY composite.a, composite.b" in str(query)
+
+
+class TestPostgresStorageWrites:
+    async def test_update_returning(self, postgres_table_storage):
+        path = create_model("Path", field1=(int, ...))(field1=1)
+        body = create_model("Body", field1=(int, ...))(field1=1)
+        postgres_table_storage.execute_query.return_value.fetchone.return_value = (1,)
+        entity = await postgres_table_storage.update(
+            filter_=path,
+            entity=body,
+            response_model=create_model("Entity", field1=(int, ...)),
+        )
+        assert entity.field1 == 1
+        assert postgres_table_storage.execute_query.await_count == 1
+        query = str(postgres_table_storage.execute_query.call_args.args[0])
+        assert query.startswith("UPDATE")
+        assert "RETURNING" in query
+
+    async def test_update_not_found(self, postgres_table_storage):
+        path = create_model("Path", field1=(int, ...))(field1=1)
+        body = create_model("Body", field1=(int, ...))(field1=1)
+        postgres_table_storage.execute_query.return_value.fetchone.return_value = None
+        with pytest.raises(NotFoundError):
+            await postgres_table_storage.update(
+                filter_=path, entity=body, response_model=TestEntity
+            )
+
+    async def test_delete(self, postgres_table_storage):
+        path = create_model("Path", field1=(int, ...))(field1=1)
+        postgres_table_storage.execute_query.return_value.rowcount = 1
+        assert await postgres_table_storage.delete(path)
+        assert postgres_table_storage.execute_query.await_count == 1
+
+        postgres_table_storage.execute_query.return_value.rowcount = 0
+        with pytest.raises(NotFoundError):
+            await postgres_table_storage.delete(path)
+
+
+class TestPostgresStorageBulk:
+    entity = create_model("Entity", field1=(int, ...))
+
+    async def test_create_many(self, postgres_table_storage):
+        postgres_table_storage.chunk_size = 2
+        postgres_table_storage.execute_query.side_effect = [[(1,)], [(3,)]]
+        created, conflicts = await postgres_table_storage.create_many(
+            [self.entity(field1=1), self.entity(field1=1), self.entity(field1=3)]
+        )
+        assert created == [self.entity(field1=1), self.entity(field1=3)]
+        assert conflicts == [self.entity(field1=1)]
+        assert postgres_table_storage.execute_query.await_count == 2
+        query = str(postgres_table_storage.execute_query.call_args.args[0])
+        assert "ON CONFLICT (field1) DO NOTHING RETURNING" in query
+
+    async def test_upsert_many(self, postgres_table_storage):
+        entities = await postgres_table_storage.upsert_many(
+            [self.entity(field1=1), self.entity(field1=1)]
+        )
+        assert entities == [self.entity(field1=1)]
+        query = postgres_table_storage.execute_query.call_args.args[0]
+        assert "ON CONFLICT (field1) DO NOTHING" in str(query)
+
+    async def test_get_many(self, postgres_table_storage):
+        path = create_model("Path", field1=(int, ...))
+        postgres_table_storage.execute_query.return_value = [(1,), (3,)]
+        found, missing = await postgres_table_storage.get_many(
+            filters=[path(field1=1), path(field1=2), path(field1=3)],
+            response_model=path,
+        )
+        assert [entity.field1 for entity in found] == [1, 3]
+        assert missing == [path(field1=2)]
+        query = str(postgres_table_storage.execute_query.call_args.args[0])
+        assert 'WHERE "Test".field1 IN' in query
+
+    async def test_delete_many(self, postgres_table_storage):
+        postgres_table_storage.execute_query.return_value = [(1,)]
+        deleted, missing = await postgres_table_storage.delete_many(
+            [self.entity(field1=1), self.entity(field1=2)]
+        )
+        assert deleted == [self.entity(field1=1)]
+        assert missing == [self.entity(field1=2)]
+        query = str(postgres_table_storage.execute_query.call_args.args[0])
+        assert 'WHERE "Test".field1 IN' in query
+
+    def test_batch_size(self, postgres_table_storage):
+        postgres_table_storage.chunk_size = 100_000
+        assert postgres_table_storage.batch_size == 32767
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Product(Base):
+    __tablename__ = "product"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+class TestSQLAlchemyStorage:
+    async def test_update_returning(self):
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+        session.execute.return_value.scalar_one_or_none.return_value = Product(id=1)
+        model = await SQLAlchemyStorage.update(
+            model_type=Product,
+            session=session,
+            filter_=create_model("Path", id=(int, ...))(id=1),
+            body=create_model("Body", name=(str, ...))(name="test"),
+        )
+        assert model.id == 1
+        assert session.execute.await_count == 1
+        assert "RETURNING" in str(session.execute.call_args.args[0])
+
+        session.execute.return_value.scalar_one_or_none.return_value = None
+        with pytest.raises(NotFoundError):
+            await SQLAlchemyStorage.update(
+                model_type=Product,
+                session=session,
+                filter_=create_model("Path", id=(int, ...))(id=1),
+                body=create_model("Body", name=(str, ...))(name="test"),
+            )
+
+    async def test_delete(self):
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+        session.execute.return_value.rowcount = 1
+        filter_ = create_model("Path", id=(int, ...))(id=1)
+        assert await SQLAlchemyStorage.delete(
+            model_type=Product, session=session, filter_=filter_
+        )
+        assert session.execute.await_count == 1
+
+        session.execute.return_value.rowcount = 0
+        with pytest.raises(NotFoundError):
+            await SQLAlchemyStorage.delete(
+                model_type=Product, session=session, filter_=filter_
+            )
+
+    async def test_get_many(self):
+        session = MagicMock()
+        session.scalars = AsyncMock(return_value=MagicMock())
+        session.scalars.return_value.all.return_value = [Product(id=1, name="a")]
+        path = create_model("Path", id=(int, ...))
+        found, missing = await SQLAlchemyStorage.get_many(
+            model_type=Product,
+            session=session,
+            filters=[path(id=1), path(id=2), path(id=1)],
+        )
+        assert [model.id for model in found] == [1]
+        assert missing == [path(id=2)]
+        assert session.scalars.await_count == 1
+        assert "WHERE product.id IN" in str(session.scalars.call_args.args[0])
+
+    async def test_list_operators(self):
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+        session.execute.return_value.fetchall.return_value = []
+        filter_ = create_model(
+            "Filter", name__prefix=(str | None, None), name=(str | None, None)
+        )
+        await SQLAlchemyStorage.list(
+            model_type=Product,
+            session=session,
+            filter_=filter_(name__prefix="a_"),
+            pagination=PaginationEntity(limit=10),
+        )
+        query, params = session.execute.call_args_list[0].args
+        assert "WHERE product.name LIKE :filter_name__prefix" in str(query)
+        assert params["filter_name__prefix"] == "a\\_%"
+
+
+def test_manager_discard(configs):
+    metadata = MetaData()
+    manager = PostgresEngineStorageManager(pg_engine=MagicMock(), metadata=metadata)
+    manager.storage(configs[0])
+    manager.discard(configs[0].name)
+    assert configs[0].name not in metadata.tables
+    manager.storage(configs[0])
+    assert configs[0].name in metadata.tables
@@ -0,0 +1,88 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from dyapi.entities.pagination import PaginationEntity
+from dyapi.implementations.storages.postgres.count import (
+    CachedCount,
+    EstimatedCount,
+    ExactCount,
+    NoCount,
+    WindowCount,
+    build_count_strategy,
+)
+from pydantic import create_model
+from sqlalchemy import Column, Integer, MetaData, Table
+
+table = Table("counted", MetaData(), Column("id", Integer))
+
+
+def executor(*values):
+    results = []
+    for value in values:
+        result = MagicMock()
+        result.fetchone.return_value = (value,)
+        results.append(result)
+    return AsyncMock(side_effect=results)
+
+
+class TestCountStrategies:
+    def test_build_count_strategy(self):
+        assert isinstance(build_count_strategy("exact"), ExactCount)
+        assert isinstance(build_count_strategy("estimated"), EstimatedCount)
+        assert isinstance(build_count_strategy("cached", ttl=1), CachedCount)
+        assert isinstance(build_count_strategy("window"), WindowCount)
+        assert isinstance(build_count_strategy("none"), NoCount)
+
+    async def test_exact(self):
+        execute = executor(5)
+        assert await ExactCount().count(execute, table, [table.c.id == 1], []) == 5
+        assert "count(*)" in str(execute.call_args.args[0])
+
+    async def test_estimated_unfiltered(self):
+        execute = executor(1000)
+        assert await EstimatedCount().count(execute, table, [], []) == 1000
+        assert "pg_class" in str(execute.call_args.args[0])
+
+    async def test_estimated_filtered(self):
+        execute = executor(json.dumps([{"Plan": {"Plan Rows": 42}}]))
+        assert await EstimatedCount().count(execute, table, [table.c.id > 1], []) == 42
+        query = execute.call_args.args[0]
+        assert str(query).startswith("EXPLAIN (FORMAT JSON) SELECT")
+        assert query.compile().params == {"id_1": 1}
+
+    async def test_estimated_not_analyzed(self):
+        execute = executor(-1, 7)
+        assert await EstimatedCount().count(execute, table, [], []) == 7
+
+    async def test_cached(self):
+        strategy = CachedCount(ttl=60)
+        execute = executor(3, 4)
+        assert await strategy.count(execute, table, [table.c.id == 1], []) == 3
+        assert await strategy.count(execute, table, [table.c.id == 1], []) == 3
+        assert await strategy.count(execute, table, [table.c.id == 2], []) == 4
+        assert execute.await_count == 2
+
+    async def test_cached_expired(self):
+        strategy = CachedCount(ttl=1e-9)
+        execute = executor(3, 4)
+        await strategy.count(execute, table, [], [])
+        assert await strategy.count(execute, table, [], []) == 4
+
+    async def test_window(self):
+        strategy = WindowCount()
+        assert "count(*) OVER ()" in str(strategy.select(table.select()))
+        execute = executor(0)
+        assert await strategy.count(execute, table, [], [(1, 9), (2, 9)]) == 9
+        assert execute.await_count == 0
+        assert await strategy.count(execute, table, [], []) == 0
+
+    async def test_none(self, postgres_table_storage):
+        postgres_table_storage.count_strategy = NoCount()
+        filter_ = create_model("Filter", field1=(int | None, None))()
+        _, total = await postgres_table_storage.list(
+            filter_=filter_,
+            pagination=PaginationEntity(),
+            response_model=create_model("Entity", field1=(int, ...)),
+        )
+        assert total is None
+        assert postgres_table_storage.execute_query.await_count == 1
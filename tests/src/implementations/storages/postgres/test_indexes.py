@@ -0,0 +1,114 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from dyapi import Config, ConfigField, PostgresEngineStorageManager
+from dyapi.entities.index_settings import IndexSettings
+from dyapi.implementations.storages.postgres.indexes import (
+    create_indexes_concurrently,
+    index_name,
+)
+from pydantic import ValidationError
+from sqlalchemy import MetaData
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+CONFIG = Config(
+    name="events",
+    api_tags=[],
+    fields=[
+        ConfigField(name="id", type=int, location="path"),
+        ConfigField(name="created", type=float, index="brin"),
+        ConfigField(name="kind", type=str, index="hash"),
+        ConfigField(name="owner", type=int),
+    ],
+    indexes=[
+        IndexSettings(fields=["owner", "kind"]),
+        IndexSettings(fields=["owner"], where="kind = 'open'"),
+    ],
+)
+
+
+def ddl(table):
+    return sorted(
+        str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        for index in table.indexes
+    )
+
+
+def engine():
+    engine = MagicMock()
+    engine.dialect = postgresql.dialect()
+    conn = engine.connect.return_value.__aenter__.return_value
+    conn.execution_options = AsyncMock(return_value=conn)
+    conn.execute = AsyncMock()
+    return engine
+
+
+class TestIndexes:
+    def test_build_table(self):
+        manager = PostgresEngineStorageManager(MagicMock(), MetaData())
+        assert ddl(manager.build_table(CONFIG)) == [
+            "CREATE INDEX ix_events_created_brin ON events USING brin (created)",
+            "CREATE INDEX ix_events_kind_hash ON events USING hash (kind)",
+            "CREATE INDEX ix_events_owner_kind ON events USING btree (owner, kind)",
+            "CREATE INDEX ix_events_owner_partial ON events USING btree (owner) "
+            "WHERE kind = 'open'",
+        ]
+
+    def test_validation(self):
+        with pytest.raises(ValidationError):
+            IndexSettings(fields=["a", "b"], method="hash")
+        with pytest.raises(ValidationError):
+            CONFIG.model_validate(
+                {**CONFIG.model_dump(), "indexes": [{"fields": ["missing"]}]}
+            )
+
+    def test_long_names(self):
+        first = index_name("t" * 60, IndexSettings(fields=["a"]))
+        second = index_name("t" * 60, IndexSettings(fields=["b"]))
+        assert len(first) == 63 and first != second
+
+    async def test_create_concurrently(self):
+        pg_engine = engine()
+        manager = PostgresEngineStorageManager(pg_engine, MetaData())
+        table = manager.build_table(CONFIG)
+        conn = pg_engine.connect.return_value.__aenter__.return_value
+        conn.execute.side_effect = [None, Exception("deadlock"), None, None, None]
+
+        created = await manager.create_indexes()
+
+        conn.execution_options.assert_awaited_once_with(isolation_level="AUTOCOMMIT")
+        statements = [str(call.args[0]) for call in conn.execute.await_args_list]
+        assert all(
+            statement.startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS")
+            for statement in statements[:2] + statements[3:]
+        )
+        assert statements[2].startswith("DROP INDEX CONCURRENTLY IF EXISTS ix_events")
+        assert len(created) == 3
+        # The option only applies to the statements above.
+        assert "CONCURRENTLY" not in "".join(ddl(table))
+
+    async def test_create_for_tables(self):
+        pg_engine = engine()
+        manager = PostgresEngineStorageManager(MagicMock(), MetaData())
+        table = manager.build_table(CONFIG)
+        assert len(await create_indexes_concurrently(pg_engine, [table])) == 4
+
+    async def test_drop_failure(self):
+        pg_engine = engine()
+        manager = PostgresEngineStorageManager(MagicMock(), MetaData(schema="audit"))
+        table = manager.build_table(CONFIG)
+        conn = pg_engine.connect.return_value.__aenter__.return_value
+        conn.execute.side_effect = [
+            Exception("deadlock"),
+            Exception("lock timeout"),
+            None,
+            None,
+            None,
+        ]
+
+        created = await create_indexes_concurrently(pg_engine, [table])
+
+        statements = [str(call.args[0]) for call in conn.execute.await_args_list]
+        assert statements[1].startswith("DROP INDEX CONCURRENTLY IF EXISTS audit.ix_")
+        assert len(statements) == 5 and len(created) == 3
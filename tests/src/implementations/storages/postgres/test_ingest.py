@@ -0,0 +1,49 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from dyapi.implementations.storages.postgres.ingest import copy_upsert, use_copy
+from pydantic import create_model
+from sqlalchemy import Column, Integer, MetaData, String, Table
+from sqlalchemy.dialects import postgresql
+
+table = Table(
+    "ingested",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("name", String),
+)
+Entity = create_model("Entity", id=(int, ...), name=(str, ...))
+
+
+class TestIngest:
+    def test_use_copy(self):
+        assert not use_copy("insert", 100, threshold=10)
+        assert use_copy("copy", 1, threshold=10)
+        assert use_copy("auto", 10, threshold=10)
+        assert not use_copy("auto", 9, threshold=10)
+
+    async def test_copy_upsert(self):
+        copied = []
+
+        async def copy_records_to_table(name, records, columns):
+            copied.extend(records)
+
+        raw = MagicMock()
+        raw.driver_connection.copy_records_to_table = copy_records_to_table
+        connection = MagicMock()
+        connection.execute = AsyncMock()
+        connection.get_raw_connection = AsyncMock(return_value=raw)
+
+        await copy_upsert(
+            connection,
+            table,
+            list(table.primary_key.columns),
+            [Entity(id=1, name="a"), Entity(id=2, name="b")],
+        )
+
+        assert copied == [(1, "a"), (2, "b")]
+        create, merge, drop = [call.args[0] for call in connection.execute.mock_calls]
+        assert str(create).startswith("CREATE TEMP TABLE dyapi_staging_ingested")
+        merge = str(merge.compile(dialect=postgresql.dialect()))
+        assert merge.startswith("INSERT INTO ingested (id, name) SELECT DISTINCT ON")
+        assert "ON CONFLICT (id) DO UPDATE SET name = excluded.name" in merge
+        assert str(drop) == "DROP TABLE dyapi_staging_ingested"
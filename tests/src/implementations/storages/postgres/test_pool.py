@@ -0,0 +1,133 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from dyapi import PostgresEngineStorageManager
+from dyapi.implementations.metrics.prometheus import PrometheusMetrics
+from dyapi.implementations.storages.postgres.pool import (
+    EnginePool,
+    PoolController,
+    PoolMonitor,
+)
+from sqlalchemy import MetaData, exc
+from sqlalchemy.pool import QueuePool
+
+
+def engine(pool_size=2, max_overflow=3):
+    engine = MagicMock()
+    engine.sync_engine.pool = QueuePool(
+        MagicMock, pool_size=pool_size, max_overflow=max_overflow
+    )
+    engine.begin.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+    engine.begin.return_value.__aexit__ = AsyncMock(return_value=None)
+    return engine
+
+
+def window(pool, checkouts, wait, latency=0.0, peak=0):
+    pool.window_checkouts = checkouts
+    pool.window_wait = wait * checkouts
+    pool.window_latency = latency * checkouts
+    pool.window_peak = peak
+
+
+class TestPoolMonitor:
+    async def test_records_checkouts(self):
+        metrics = PrometheusMetrics()
+        monitor = PoolMonitor(metrics=metrics)
+        primary = engine()
+        monitor.watch(primary, "primary")
+
+        async with monitor.begin(primary):
+            pass
+
+        assert monitor.stats()["primary"] == {
+            "size": 2,
+            "checked_out": 0,
+            "overflow": 0,
+            "max_overflow": 3,
+            "checkouts": 1,
+            "timeouts": 0,
+        }
+        assert monitor.pools[primary].window_checkouts == 1
+        text = metrics.render()
+        assert 'dyapi_pool_checkout_seconds_count{engine="primary"} 1' in text
+        assert 'dyapi_pool_max_overflow{engine="primary"} 3' in text
+
+    async def test_records_timeouts(self):
+        metrics = PrometheusMetrics()
+        monitor = PoolMonitor(metrics=metrics)
+        primary = engine()
+        primary.begin.return_value.__aenter__.side_effect = exc.TimeoutError
+        monitor.watch(primary, "primary")
+
+        with pytest.raises(exc.TimeoutError):
+            async with monitor.begin(primary):
+                pass
+
+        assert monitor.pools[primary].timeouts == 1
+        assert 'dyapi_pool_timeouts_total{engine="primary"} 1' in metrics.render()
+
+    async def test_unwatched_engine(self):
+        other = engine()
+        async with PoolMonitor().begin(other):
+            pass
+        assert other.begin.called
+
+    def test_manager_watches_engines(self):
+        manager = PostgresEngineStorageManager(
+            engine(), MetaData(), replicas=[engine()]
+        )
+        assert set(manager.pool_stats()) == {"primary", "replica0"}
+        assert not manager.controllers
+
+
+class TestPoolController:
+    def test_grows_while_checkouts_wait(self):
+        pool = EnginePool(engine(), "primary")
+        controller = PoolController(pool, min_size=2, max_size=4, target_wait=0.01)
+        assert controller.limit == 4
+        controller.limit = 2
+        controller.apply()
+
+        window(pool, 10, wait=0.05)
+        assert controller.adjust() == 3
+        assert pool.pool._max_overflow == 1
+        window(pool, 10, wait=0.05)
+        assert controller.adjust() == 4
+        window(pool, 10, wait=0.05)
+        assert controller.adjust() == 4
+
+    def test_holds_when_database_is_slow(self):
+        pool = EnginePool(engine(), "primary")
+        controller = PoolController(
+            pool, min_size=2, max_size=6, target_wait=0.01, max_latency=0.1
+        )
+        window(pool, 10, wait=0.05, latency=0.5, peak=5)
+        assert controller.adjust() == 5
+
+    def test_shrinks_when_idle(self):
+        pool = EnginePool(engine(), "primary")
+        controller = PoolController(pool, min_size=3, max_size=5)
+        window(pool, 10, wait=0.0, peak=1)
+        assert controller.adjust() == 4
+        assert controller.adjust() == 4
+        window(pool, 10, wait=0.0, peak=1)
+        assert controller.adjust() == 3
+        window(pool, 10, wait=0.0, peak=1)
+        assert controller.adjust() == 3
+
+    def test_bounds(self):
+        with pytest.raises(ValueError):
+            PoolController(EnginePool(engine(pool_size=5), "primary"), 2, 10)
+        with pytest.raises(ValueError):
+            PoolController(EnginePool(engine(), "primary"), 4, 3)
+
+    def test_manager_builds_controllers(self):
+        manager = PostgresEngineStorageManager(engine(), MetaData(), pool_bounds=(2, 8))
+        assert [controller.max_size for controller in manager.controllers] == [8]
+
+    def test_apply_without_limit(self):
+        pool = EnginePool(engine(), "primary")
+        controller = PoolController(pool, min_size=2, max_size=4)
+        del pool.pool._max_overflow
+        with pytest.raises(RuntimeError):
+            controller.apply()
@@ -0,0 +1,91 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from dyapi import PostgresEngineStorageManager
+from dyapi.entities.pagination import PaginationEntity
+from dyapi.implementations.storages.postgres import replicas
+from dyapi.implementations.storages.postgres.replicas import ReplicaRouter
+from pydantic import create_model
+from sqlalchemy import MetaData
+
+
+def engine(lag=0.0):
+    engine = MagicMock()
+    engine.sync_engine.pool.checkedout.return_value = 0
+    conn = MagicMock(execute=AsyncMock(return_value=MagicMock()))
+    conn.execute.return_value.scalar.return_value = lag
+    for method in (engine.connect, engine.begin):
+        method.return_value.__aenter__ = AsyncMock(return_value=conn)
+        method.return_value.__aexit__ = AsyncMock(return_value=None)
+    return engine
+
+
+async def read(router, table="items"):
+    async with router.reading(table) as engine:
+        return engine
+
+
+class TestReplicaRouter:
+    async def test_round_robin(self):
+        primary, first, second = engine(), engine(), engine()
+        router = ReplicaRouter(primary, [first, second])
+        assert [await read(router) for _ in range(3)] == [first, second, first]
+
+    async def test_least_connections(self):
+        first, second = engine(), engine()
+        router = ReplicaRouter(engine(), [first, second], "least_connections")
+        async with router.reading("items") as busy:
+            assert await read(router) is not busy
+
+    async def test_read_your_writes(self, monkeypatch):
+        primary, replica = engine(), engine()
+        router = ReplicaRouter(primary, [replica], read_your_writes=1.0)
+        monkeypatch.setattr(replicas.time, "monotonic", lambda: 100.0)
+        router.mark_write("items")
+        assert await read(router) is primary
+        assert await read(router, "orders") is replica
+        monkeypatch.setattr(replicas.time, "monotonic", lambda: 101.5)
+        assert await read(router) is replica
+
+    async def test_lagging_replica_is_skipped(self):
+        primary, fresh, lagging = engine(0.0), engine(0.0), engine(30.0)
+        router = ReplicaRouter(primary, [fresh, lagging], max_lag=5.0)
+        await router.check_all()
+        assert [await read(router) for _ in range(2)] == [fresh, fresh]
+
+    async def test_unreachable_replica_falls_back_to_primary(self):
+        primary, replica = engine(), engine()
+        replica.connect.side_effect = OSError
+        router = ReplicaRouter(primary, [replica])
+        await router.check_all()
+        assert await read(router) is primary
+
+    async def test_failed_read_takes_replica_out(self):
+        primary, replica = engine(), engine()
+        router = ReplicaRouter(primary, [replica])
+        with pytest.raises(OSError):
+            async with router.reading("items"):
+                raise OSError
+        assert await read(router) is primary
+
+
+class TestReplicaStorage:
+    async def test_reads_go_to_replica(self, configs):
+        primary, replica = engine(), engine()
+        manager = PostgresEngineStorageManager(
+            primary, MetaData(), replicas=[replica], read_your_writes=10
+        )
+        storage = manager.storage(configs[0])
+        filter_ = create_model("Filter", field1=(int | None, None))()
+        entity = create_model("Entity", field1=(int, ...))
+
+        await storage.list(filter_, PaginationEntity(), entity)
+        assert replica.begin.called
+        assert not primary.begin.called
+
+        await storage.delete_many([])
+        await storage.delete(create_model("Path", field1=(int, ...))(field1=1))
+        replica.begin.reset_mock()
+        await storage.list(filter_, PaginationEntity(), entity)
+        assert primary.begin.called
+        assert not replica.begin.called
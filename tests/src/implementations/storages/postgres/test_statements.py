@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock
+
+from dyapi.implementations.storages.postgres.statements import (
+    StatementCache,
+    filter_criteria,
+    filter_params,
+    filter_shape,
+    filter_values,
+)
+from sqlalchemy import Column, Integer, MetaData, String, Table
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine.interfaces import CacheStats
+
+
+class TestStatementCache:
+    def test_get(self):
+        cache = StatementCache()
+        build = MagicMock(side_effect=object)
+        first = cache.get(("get", "id"), build)
+        assert cache.get(("get", "id"), build) is first
+        assert cache.get(("delete", "id"), build) is not first
+        assert build.call_count == 2
+        assert cache.stats()["hit_rate"] == 1 / 3
+
+    def test_maxsize(self):
+        cache = StatementCache(maxsize=1)
+        cache.get("a", object)
+        cache.get("b", object)
+        assert list(cache.statements) == ["b"]
+
+    def test_record(self):
+        cache = StatementCache()
+        cache.record(MagicMock(context=MagicMock(cache_hit=CacheStats.CACHE_MISS)))
+        cache.record(MagicMock(context=MagicMock(cache_hit=CacheStats.CACHE_HIT)))
+        cache.record(MagicMock(context=MagicMock(cache_hit=CacheStats.CACHE_HIT)))
+        cache.record(object())
+        assert (cache.compiled_hits, cache.compiled_misses) == (2, 1)
+
+
+def test_filter_criteria():
+    table = Table("items", MetaData(), Column("id", Integer))
+    query = table.select().where(*filter_criteria(table, ["id"]))
+    assert "WHERE items.id = :filter_id" in str(query)
+    assert filter_params({"id": 1}) == {"filter_id": 1}
+
+
+def test_filter_operators():
+    table = Table("items", MetaData(), Column("id", Integer), Column("name", String))
+    filters = {
+        "id__gte": 2,
+        "id__in": [1, 2],
+        "name__prefix": "50%_a",
+        "name__is_null": False,
+    }
+    query = table.select().where(*filter_criteria(table, filters))
+    assert str(query.compile(dialect=postgresql.dialect())).endswith(
+        "WHERE items.id >= %(filter_id__gte)s "
+        "AND items.id = ANY (%(filter_id__in)s::INTEGER[]) "
+        "AND items.name LIKE %(filter_name__prefix)s "
+        "AND items.name IS NOT NULL"
+    )
+    assert filter_params(filters) == {
+        "filter_id__gte": 2,
+        "filter_id__in": [1, 2],
+        "filter_name__prefix": "50\\%\\_a%",
+    }
+    assert filter_shape(filters) == (
+        "id__gte",
+        "id__in",
+        "name__prefix",
+        "name__is_null=False",
+    )
+
+
+def test_filter_values():
+    table = Table("items", MetaData(), Column("id", Integer))
+    query = table.select().where(*filter_values(table, {"id__in": [1, 2], "id": 1}))
+    assert str(
+        query.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    ).endswith("WHERE items.id = ANY (ARRAY[1, 2]) AND items.id = 1")
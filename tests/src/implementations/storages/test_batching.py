@@ -0,0 +1,98 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from dyapi import Config, ConfigField, PostgresEngineStorageManager
+from dyapi.entities.batch_settings import BatchSettings
+from dyapi.implementations.storages.batching import BatchingStorage
+from dyapi.implementations.storages.exceptions import NotFoundError
+from dyapi.interfaces.storages import IStorage
+from pydantic import BaseModel
+from sqlalchemy import MetaData
+
+
+class Path(BaseModel):
+    id: int
+
+
+class Entity(BaseModel):
+    id: int
+    name: str
+
+
+async def get_many(filters, response_model):
+    found = [Entity(id=item.id, name=f"{item.id}") for item in filters if item.id]
+    return found, [item for item in filters if not item.id]
+
+
+@pytest.fixture
+def storage():
+    storage = BatchingStorage(storage=MagicMock(spec=IStorage), keys=["id"])
+    storage.storage.get_many = AsyncMock(side_effect=get_many)
+    return storage
+
+
+class TestBatchingStorage:
+    async def test_coalesces_concurrent_gets(self, storage):
+        results = await asyncio.gather(
+            storage.get(Path(id=1), Entity),
+            storage.get(Path(id=2), Entity),
+            storage.get(Path(id=1), Entity),
+        )
+        assert [item.name for item in results] == ["1", "2", "1"]
+        storage.storage.get_many.assert_awaited_once()
+        filters = storage.storage.get_many.call_args.kwargs["filters"]
+        assert filters == [Path(id=1), Path(id=2)]
+
+    async def test_not_found(self, storage):
+        results = await asyncio.gather(
+            storage.get(Path(id=0), Entity),
+            storage.get(Path(id=1), Entity),
+            return_exceptions=True,
+        )
+        assert isinstance(results[0], NotFoundError)
+        assert results[1] == Entity(id=1, name="1")
+
+    async def test_max_size(self, storage):
+        storage.max_size = 2
+        await asyncio.gather(*[storage.get(Path(id=i), Entity) for i in range(1, 6)])
+        assert storage.storage.get_many.await_count == 3
+
+    async def test_window(self, storage):
+        storage.window = 0.01
+
+        async def later():
+            await asyncio.sleep(0)
+            return await storage.get(Path(id=2), Entity)
+
+        await asyncio.gather(storage.get(Path(id=1), Entity), later())
+        storage.storage.get_many.assert_awaited_once()
+
+    async def test_error_reaches_every_caller(self, storage):
+        storage.storage.get_many.side_effect = RuntimeError
+        results = await asyncio.gather(
+            storage.get(Path(id=1), Entity),
+            storage.get(Path(id=2), Entity),
+            return_exceptions=True,
+        )
+        assert all(isinstance(item, RuntimeError) for item in results)
+
+    async def test_cancelled_caller_does_not_cancel_others(self, storage):
+        first = asyncio.ensure_future(storage.get(Path(id=1), Entity))
+        second = asyncio.ensure_future(storage.get(Path(id=1), Entity))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == Entity(id=1, name="1")
+
+
+def test_manager_wraps_storage():
+    manager = PostgresEngineStorageManager(MagicMock(), MetaData())
+    config = Config(
+        name="items",
+        api_tags=[],
+        fields=[ConfigField(name="id", type=int, location="path")],
+        batching=BatchSettings(window=0.005, max_size=50),
+    )
+    storage = manager.storage(config)
+    assert isinstance(storage, BatchingStorage)
+    assert (storage.window, storage.max_size) == (0.005, 50)
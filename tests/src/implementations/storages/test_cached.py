@@ -0,0 +1,188 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from dyapi import Config, ConfigField, PostgresEngineStorageManager
+from dyapi.entities.cache_settings import CacheSettings
+from dyapi.implementations.caches.memory import MemoryCacheBackend
+from dyapi.implementations.storages.cached import CachedStorage
+from dyapi.implementations.storages.exceptions import NotFoundError
+from dyapi.implementations.storages.memory import MemoryStorage
+from dyapi.interfaces.storages import IStorage
+from pydantic import BaseModel
+from sqlalchemy import MetaData
+
+
+class Path(BaseModel):
+    id: int
+
+
+class Entity(BaseModel):
+    id: int
+    name: str
+
+
+@pytest.fixture
+def storage():
+    return CachedStorage(
+        storage=MagicMock(spec=IStorage),
+        backend=MemoryCacheBackend(),
+        namespace="items",
+        keys=["id"],
+    )
+
+
+class TestCachedStorage:
+    async def test_get_reads_through(self, storage):
+        storage.storage.get = AsyncMock(return_value=Entity(id=1, name="a"))
+        assert await storage.get(Path(id=1), Entity) == Entity(id=1, name="a")
+        assert await storage.get(Path(id=1), Entity) == Entity(id=1, name="a")
+        assert storage.storage.get.await_count == 1
+        assert storage.backend.hits == 1
+
+    async def test_get_many_uses_cache(self, storage):
+        storage.storage.get = AsyncMock(return_value=Entity(id=1, name="a"))
+        storage.storage.get_many = AsyncMock(
+            return_value=([Entity(id=2, name="b")], [Path(id=3)])
+        )
+        await storage.get(Path(id=1), Entity)
+        found, missing = await storage.get_many(
+            [Path(id=1), Path(id=2), Path(id=3)], Entity
+        )
+        assert found == [Entity(id=1, name="a"), Entity(id=2, name="b")]
+        assert missing == [Path(id=3)]
+        assert storage.storage.get_many.call_args.kwargs["filters"] == [
+            Path(id=2),
+            Path(id=3),
+        ]
+        assert await storage.get(Path(id=2), Entity) == Entity(id=2, name="b")
+
+    async def test_not_found_is_not_cached(self, storage):
+        storage.storage.get = AsyncMock(side_effect=NotFoundError)
+        for _ in range(2):
+            with pytest.raises(NotFoundError):
+                await storage.get(Path(id=1), Entity)
+        assert storage.storage.get.await_count == 2
+
+    async def test_update_refreshes(self, storage):
+        storage.storage.get = AsyncMock(return_value=Entity(id=1, name="a"))
+        storage.storage.update = AsyncMock(return_value=Entity(id=1, name="b"))
+        await storage.get(Path(id=1), Entity)
+        await storage.update(Path(id=1), Entity(id=1, name="b"), Entity)
+        assert await storage.get(Path(id=1), Entity) == Entity(id=1, name="b")
+        assert storage.storage.get.await_count == 1
+
+    async def test_concurrent_updates(self):
+        rows = MemoryStorage(fields=["id", "name"], keys=["id"])
+        await rows.create(Entity(id=1, name="old"))
+        storage = CachedStorage(
+            storage=rows, backend=MemoryCacheBackend(), namespace="items", keys=["id"]
+        )
+        first_published = asyncio.Event()
+        second_done = asyncio.Event()
+
+        async def publish(namespace, keys):
+            # The first update is held after invalidating, until the second
+            # one wrote, invalidated and cached its row.
+            if not first_published.is_set():
+                first_published.set()
+                await second_done.wait()
+
+        storage.bus = MagicMock(publish=AsyncMock(side_effect=publish))
+        first = asyncio.create_task(
+            storage.update(Path(id=1), Entity(id=1, name="a"), Entity)
+        )
+        await first_published.wait()
+        await storage.update(Path(id=1), Entity(id=1, name="b"), Entity)
+        second_done.set()
+        await first
+
+        assert await rows.get(Path(id=1), Entity) == Entity(id=1, name="b")
+        assert await storage.get(Path(id=1), Entity) == Entity(id=1, name="b")
+
+    async def test_writes_invalidate(self, storage):
+        storage.storage.get = AsyncMock(return_value=Entity(id=1, name="a"))
+        storage.storage.delete = AsyncMock(return_value=True)
+        storage.storage.upsert_many = AsyncMock(return_value=[])
+        await storage.get(Path(id=1), Entity)
+        await storage.delete(Path(id=1))
+        await storage.get(Path(id=1), Entity)
+        await storage.upsert_many([Entity(id=1, name="c")])
+        await storage.get(Path(id=1), Entity)
+        assert storage.storage.get.await_count == 3
+
+    async def test_write_during_read_is_not_overwritten(self, storage):
+        async def get(*args, **kwargs):
+            await storage.delete(Path(id=1))
+            return Entity(id=1, name="stale")
+
+        storage.storage.get = get
+        storage.storage.delete = AsyncMock(return_value=True)
+        await storage.get(Path(id=1), Entity)
+        assert len(storage.backend) == 0
+
+    async def test_writes_are_published(self, storage):
+        storage.bus = MagicMock(publish=AsyncMock())
+        storage.storage.delete = AsyncMock(return_value=True)
+        await storage.delete(Path(id=1))
+        storage.bus.publish.assert_awaited_once_with("items", ["items:[1]"])
+
+
+class TestStorageManagerCache:
+    def test_cache_enabled_by_config(self):
+        manager = PostgresEngineStorageManager(MagicMock(), MetaData())
+        config = Config(
+            name="items",
+            api_tags=[],
+            fields=[ConfigField(name="id", type=int, location="path")],
+            cache=CacheSettings(maxsize=10),
+        )
+        storage = manager.storage(config)
+        assert isinstance(storage, CachedStorage)
+        assert storage.backend.maxsize == 10
+        assert storage.keys == ["id"]
+
+    def test_cache_disabled_by_default(self, configs):
+        manager = PostgresEngineStorageManager(MagicMock(), MetaData())
+        assert not isinstance(manager.storage(configs[0]), CachedStorage)
+
+    def test_cache_subscribes_to_bus(self):
+        bus = MagicMock()
+        manager = PostgresEngineStorageManager(
+            MagicMock(), MetaData(), invalidation_bus=bus
+        )
+        config = Config(
+            name="items",
+            api_tags=[],
+            fields=[ConfigField(name="id", type=int, location="path")],
+            cache=CacheSettings(),
+        )
+        storage = manager.storage(config)
+        assert storage.bus is bus
+        bus.subscribe.assert_called_once_with("items", storage.evict)
+
+    async def test_discard_retires_replaced_cache(self):
+        bus = MagicMock()
+        backend = MemoryCacheBackend()
+        manager = PostgresEngineStorageManager(
+            MagicMock(), MetaData(), cache_backend=backend, invalidation_bus=bus
+        )
+        config = Config(
+            name="items",
+            api_tags=[],
+            fields=[ConfigField(name="id", type=int, location="path")],
+            cache=CacheSettings(),
+        )
+        old = manager.storage(config)
+        await backend.set("items:[1]", 1)
+        await backend.set("orders:[1]", 1)
+        new = manager.storage(config)
+
+        manager.discard("items", keep_latest=True)
+        await asyncio.gather(*manager.clearing)
+
+        bus.unsubscribe.assert_called_once_with("items", old.evict)
+        assert manager.caches["items"] == [new]
+        assert "items" in manager.metadata.tables
+        assert await backend.get("items:[1]") is None
+        assert await backend.get("orders:[1]") == 1
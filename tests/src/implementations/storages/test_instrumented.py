@@ -0,0 +1,88 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from dyapi import Config, ConfigField, PostgresEngineStorageManager
+from dyapi.implementations.metrics.prometheus import PrometheusMetrics
+from dyapi.implementations.storages.exceptions import NotFoundError
+from dyapi.implementations.storages.instrumented import InstrumentedStorage
+from dyapi.interfaces.storages import IStorage
+from pydantic import BaseModel
+from sqlalchemy import MetaData
+
+
+class Path(BaseModel):
+    id: int
+
+
+class Entity(BaseModel):
+    id: int
+    name: str
+
+
+def labels(operation: str) -> tuple[tuple[str, str], ...]:
+    return (("layer", "storage"), ("resource", "items"), ("operation", operation))
+
+
+@pytest.fixture
+def storage():
+    return InstrumentedStorage(
+        storage=MagicMock(spec=IStorage),
+        metrics=PrometheusMetrics(),
+        resource="items",
+    )
+
+
+class TestInstrumentedStorage:
+    async def test_list_records_rows(self, storage):
+        entities = [Entity(id=1, name="a"), Entity(id=2, name="b")]
+        storage.storage.list = AsyncMock(return_value=(entities, 2))
+        assert await storage.list(Path(id=1), MagicMock(), Entity) == (entities, 2)
+
+        assert storage.metrics.durations[labels("list")].count == 1
+        assert (
+            storage.metrics.row_counts[(("resource", "items"), ("operation", "list"))]
+            == 2
+        )
+
+    async def test_get_records_errors(self, storage):
+        storage.storage.get = AsyncMock(side_effect=ConnectionError)
+        with pytest.raises(ConnectionError):
+            await storage.get(Path(id=1), Entity)
+
+        assert storage.metrics.errors[labels("get")] == 1
+        assert not storage.metrics.row_counts
+
+    async def test_get_not_found_is_not_an_error(self, storage):
+        storage.storage.get = AsyncMock(side_effect=NotFoundError)
+        with pytest.raises(NotFoundError):
+            await storage.get(Path(id=1), Entity)
+
+        assert storage.metrics.durations[labels("get")].count == 1
+        assert not storage.metrics.errors
+
+    async def test_stream_counts_rows(self, storage):
+        async def stream(filter_, response_model):
+            for row in [{"id": 1}, {"id": 2}, {"id": 3}]:
+                yield row
+
+        storage.storage.stream = stream
+        rows = [row async for row in storage.stream(Path(id=1), Entity)]
+        assert len(rows) == 3
+        assert (
+            storage.metrics.row_counts[(("resource", "items"), ("operation", "export"))]
+            == 3
+        )
+
+    def test_manager_instruments_storage(self):
+        config = Config(
+            name="items",
+            api_tags=[],
+            fields=[ConfigField(name="id", type=int, location="path")],
+        )
+        metrics = PrometheusMetrics()
+        manager = PostgresEngineStorageManager(
+            pg_engine=MagicMock(), metadata=MetaData(), metrics=metrics
+        )
+        storage = manager.storage(config)
+        assert isinstance(storage, InstrumentedStorage)
+        assert storage.metrics is metrics
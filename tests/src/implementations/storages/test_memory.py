@@ -0,0 +1,185 @@
+import asyncio
+
+import pytest
+from dyapi import APIBuilder, Config, ConfigField, MemoryStorageManager
+from dyapi.entities.pagination import (
+    CursorPaginationEntity,
+    InvalidCursorError,
+    PaginationEntity,
+)
+from dyapi.implementations.builders.model import ModelBuilder
+from dyapi.implementations.storages.exceptions import AlreadyExistsError, NotFoundError
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+CONFIG = Config(
+    name="items",
+    api_tags=[],
+    fields=[
+        ConfigField(
+            name="id", type=int, location="path", operators=["gte", "lt", "in"]
+        ),
+        ConfigField(name="name", type=str, operators=["prefix"]),
+        ConfigField(name="color", type=str, filterable=True, operators=["in"]),
+    ],
+)
+
+MODEL = ModelBuilder(CONFIG)
+
+
+def entity(id, name="name", color="red"):
+    return MODEL.entity(id=id, name=name, color=color)
+
+
+@pytest.fixture
+def storage():
+    return MemoryStorageManager().storage(CONFIG)
+
+
+class TestMemoryStorage:
+    async def test_crud(self, storage):
+        await storage.create(entity(1))
+        with pytest.raises(AlreadyExistsError):
+            await storage.create(entity(1))
+        assert await storage.get(MODEL.path(id=1), MODEL.entity) == entity(1)
+
+        updated = await storage.update(
+            MODEL.path(id=1), MODEL.body(name="other", color="blue"), MODEL.entity
+        )
+        assert updated == entity(1, "other", "blue")
+        assert storage.indexes["color"] == {"blue": {(1,)}}
+
+        assert await storage.delete(MODEL.path(id=1))
+        with pytest.raises(NotFoundError):
+            await storage.get(MODEL.path(id=1), MODEL.entity)
+        assert storage.order == [] and storage.indexes["color"] == {}
+
+    async def test_bulk(self, storage):
+        created, conflicts = await storage.create_many([entity(1), entity(2)])
+        assert len(created) == 2 and conflicts == []
+        created, conflicts = await storage.create_many([entity(2), entity(3)])
+        assert created == [entity(3)] and conflicts == [entity(2)]
+
+        await storage.upsert_many([entity(1, color="blue"), entity(4)])
+        found, missing = await storage.get_many(
+            [MODEL.path(id=1), MODEL.path(id=5)], MODEL.entity
+        )
+        assert found == [entity(1, color="blue")] and missing == [MODEL.path(id=5)]
+
+        deleted, missing = await storage.delete_many(
+            [MODEL.path(id=1), MODEL.path(id=1), MODEL.path(id=5)]
+        )
+        assert len(deleted) == 2 and missing == [MODEL.path(id=5)]
+        assert storage.order == [(2,), (3,), (4,)]
+
+    async def test_bulk_keeps_order(self, storage):
+        await storage.create_many([entity(i) for i in (5, 1, 3)])
+        await storage.upsert_many([entity(4), entity(3, color="blue"), entity(0)])
+        assert storage.order == [(0,), (1,), (3,), (4,), (5,)]
+        await storage.delete_many([MODEL.path(id=3), MODEL.path(id=0)])
+        assert storage.order == [(1,), (4,), (5,)]
+        assert storage.indexes["color"] == {"red": {(1,), (4,), (5,)}}
+
+    async def test_list_uses_index(self, storage):
+        await storage.create_many(
+            [entity(i, color="red" if i % 2 else "blue") for i in range(10, 0, -1)]
+        )
+        storage.order = None  # a scan would fail
+        page, total = await storage.list(
+            MODEL.query(color="red"), PaginationEntity(offset=1, limit=2), MODEL.entity
+        )
+        assert [item.id for item in page] == [3, 5, 7]
+        assert total == 5
+
+    async def test_list_cursor(self, storage):
+        await storage.create_many([entity(i) for i in range(1, 6)])
+        page, total = await storage.list(
+            MODEL.query(),
+            CursorPaginationEntity(cursor=CursorPaginationEntity.encode([2]), limit=2),
+            MODEL.entity,
+        )
+        assert [item.id for item in page] == [3, 4, 5]
+        assert total == 5
+
+    @pytest.mark.parametrize("values", [["x"], [1, 2]])
+    async def test_list_cursor_mismatch(self, storage, values):
+        await storage.create_many([entity(1)])
+        with pytest.raises(InvalidCursorError):
+            await storage.list(
+                MODEL.query(),
+                CursorPaginationEntity(cursor=CursorPaginationEntity.encode(values)),
+                MODEL.entity,
+            )
+
+    async def test_list_without_index(self, storage):
+        await storage.create_many([entity(1, "a"), entity(2, "b")])
+        page, _ = await storage.list(
+            MODEL.query(id=2), PaginationEntity(), MODEL.entity
+        )
+        assert page == [entity(2, "b")]
+
+    async def test_list_operators(self, storage):
+        await storage.create_many(
+            [entity(i, name=f"item{i % 3}_") for i in range(1, 10)]
+        )
+        page, total = await storage.list(
+            MODEL.query(id__gte=3, id__lt=8, name__prefix="item1"),
+            PaginationEntity(),
+            MODEL.entity,
+        )
+        assert [item.id for item in page] == [4, 7]
+        assert total == 2
+        page, _ = await storage.list(
+            MODEL.query(id__in=[9, 2, 20]), PaginationEntity(), MODEL.entity
+        )
+        assert [item.id for item in page] == [2, 9]
+
+    async def test_list_in_uses_index(self, storage):
+        colors = ["red", "blue", "green"]
+        await storage.create_many([entity(i, color=colors[i % 3]) for i in range(9)])
+        storage.order = None  # a scan would fail
+        page, _ = await storage.list(
+            MODEL.query(color__in=["red", "green"], id__gte=3),
+            PaginationEntity(),
+            MODEL.entity,
+        )
+        assert [item.id for item in page] == [3, 5, 6, 8]
+
+    async def test_stream_skips_deleted_rows(self, storage):
+        storage.stream_batch_size = 2
+        await storage.create_many([entity(i) for i in range(1, 6)])
+        ids = []
+        async for item in storage.stream(MODEL.query(), MODEL.entity):
+            ids.append(item.id)
+            if item.id == 1:
+                await storage.delete(MODEL.path(id=4))
+        assert ids == [1, 2, 3, 5]
+
+    async def test_concurrent_writes(self, storage):
+        await asyncio.gather(
+            *[storage.upsert_many([entity(i % 7, color=str(i))]) for i in range(50)]
+        )
+        assert len(storage.rows) == len(storage.order) == 7
+        assert sum(len(keys) for keys in storage.indexes["color"].values()) == 7
+
+
+def test_manager_keeps_rows_by_name():
+    manager = MemoryStorageManager()
+    assert manager.storage(CONFIG) is manager.storage(CONFIG)
+
+
+def test_api():
+    app = FastAPI()
+    app.include_router(
+        APIBuilder(configs=[CONFIG], storage_manager=MemoryStorageManager()).router
+    )
+    client = TestClient(app)
+    for i in range(1, 4):
+        item = {"id": i, "name": "name", "color": "red" if i < 3 else "blue"}
+        assert client.post("/items/", json=item).status_code == 200
+    response = client.get("/items/", params={"color": "red", "limit": 1})
+    assert [item["id"] for item in response.json()["data"]] == [1]
+    assert response.json()["total"] == 2
+    response = client.get("/items/", params={"id__in": [1, 3], "id__gte": 2})
+    assert [item["id"] for item in response.json()["data"]] == [3]
+    assert client.get("/items/", params={"id__gte": "a"}).status_code == 422
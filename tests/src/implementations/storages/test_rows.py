@@ -0,0 +1,48 @@
+import pytest
+from dyapi.implementations.storages.rows import (
+    MAPPERS,
+    object_mapper,
+    row_mapper,
+)
+from pydantic import BaseModel, ValidationError
+
+
+class Entity(BaseModel):
+    id: int
+    name: str
+
+
+class Item:
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+
+class TestRowMapper:
+    def test_validates_by_default(self):
+        assert row_mapper(Entity)((1, "a")) == Entity(id=1, name="a")
+        with pytest.raises(ValidationError):
+            row_mapper(Entity)(("x", "a"))
+
+    def test_trusted_skips_validation(self):
+        entity = row_mapper(Entity, True)(("x", "a", 10))
+        assert entity.id == "x"
+        assert entity.model_dump() == {"id": "x", "name": "a"}
+
+    def test_cached(self):
+        assert row_mapper(Entity, True) is row_mapper(Entity, True)
+        assert row_mapper.cache_info().maxsize == MAPPERS
+        assert object_mapper.cache_info().maxsize == MAPPERS
+
+
+class TestObjectMapper:
+    def test_trusted(self):
+        assert object_mapper(Entity, True)(Item(1, "a")) == Entity(id=1, name="a")
+
+    def test_single_field(self):
+        Path = type("Path", (BaseModel,), {"__annotations__": {"id": int}})
+        assert object_mapper(Path, True)(Item(1, "a")).id == 1
+
+    def test_untrusted(self):
+        with pytest.raises(ValidationError):
+            object_mapper(Entity)(Item("x", "a"))
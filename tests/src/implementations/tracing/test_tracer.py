@@ -0,0 +1,98 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from dyapi import APIBuilder
+from dyapi.implementations.storages.instrumented import InstrumentedStorage
+from dyapi.implementations.tracing.exporters import (
+    JSONFileSpanExporter,
+    MemorySpanExporter,
+)
+from dyapi.implementations.tracing.tracer import Tracer, fingerprint, span
+from dyapi.interfaces.storages import IStorageManager
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+
+@pytest.fixture
+def tracer():
+    return Tracer(MemorySpanExporter())
+
+
+class TestTracer:
+    def test_nests_spans(self, tracer):
+        with tracer.span("request", path="/items"):
+            with span("storage", operation="get"):
+                with span("row_mapping", rows=2):
+                    pass
+
+        (trace,) = tracer.exporter.traces
+        storage = trace.find("storage")
+        assert storage.parent_id == trace.span_id
+        assert storage.attributes == {"operation": "get"}
+        assert trace.find("row_mapping").parent_id == storage.span_id
+        assert {child.trace_id for child in storage.children} == {trace.trace_id}
+        assert trace.duration >= storage.duration
+
+    def test_records_errors(self, tracer):
+        with pytest.raises(ValueError):
+            with tracer.span("request"):
+                raise ValueError("boom")
+        assert tracer.exporter.traces[0].error == "ValueError: boom"
+
+    def test_span_outside_trace(self):
+        with span("storage") as current:
+            assert current is None
+
+    def test_statement_spans(self, tracer):
+        engine = create_engine("sqlite://")
+        with tracer.span("request"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        execute = tracer.exporter.traces[0].find("execute")
+        assert execute.attributes == {"statement": fingerprint("SELECT 1")}
+        assert execute.end is not None
+
+    def test_json_file_exporter(self, tmp_path):
+        tracer = Tracer(JSONFileSpanExporter(tmp_path / "traces.jsonl"))
+        with tracer.span("request"):
+            with span("storage"):
+                pass
+
+        (line,) = (tmp_path / "traces.jsonl").read_text().splitlines()
+        trace = json.loads(line)
+        assert trace["name"] == "request"
+        assert trace["children"][0]["name"] == "storage"
+
+
+class TestTracedRoutes:
+    def test_request_spans(self, configs, tracer):
+        storage_manager = MagicMock(spec=IStorageManager)
+        storage = MagicMock()
+        storage.get = AsyncMock(return_value={"field1": 1})
+        storage_manager.storage.return_value = InstrumentedStorage(
+            storage=storage, resource="Test", tracer=tracer
+        )
+        app = FastAPI()
+        app.include_router(
+            APIBuilder(
+                configs=configs, storage_manager=storage_manager, tracer=tracer
+            ).router
+        )
+
+        TestClient(app).get("/Test/1")
+
+        (trace,) = tracer.exporter.traces
+        assert trace.name == "request"
+        assert trace.attributes["operation"] == "get"
+        assert [child.name for child in trace.children] == [
+            "endpoint",
+            "validation",
+            "serialization",
+        ]
+        assert trace.find("storage").attributes == {
+            "resource": "Test",
+            "operation": "get",
+        }
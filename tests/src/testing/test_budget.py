@@ -0,0 +1,104 @@
+from typing import get_args
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from dyapi import Config, ConfigField, PostgresEngineStorageManager
+from dyapi.entities.config import CountStrategyName
+from dyapi.entities.pagination import PaginationEntity
+from dyapi.implementations.storages.postgres.base import PostgresEngineStorage
+from dyapi.implementations.storages.postgres.count import build_count_strategy
+from dyapi.testing import (
+    QueryBudget,
+    QueryBudgetExceeded,
+    QueryCounter,
+    engine_budgets,
+)
+from pydantic import BaseModel, create_model
+from sqlalchemy import MetaData, create_engine, text
+
+
+@pytest.fixture
+def engine():
+    return create_engine("sqlite://")
+
+
+class TestQueryCounter:
+    def test_counts(self, engine):
+        with QueryCounter(engine) as counter:
+            with engine.begin() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+        assert counter.statements == ["SELECT 1", "SELECT 2"]
+        assert counter.transactions == 1
+        assert counter.checkouts == 1
+
+    def test_stops_listening(self, engine):
+        with QueryCounter(engine) as counter:
+            pass
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert counter.statements == []
+
+    def test_within_budget(self, engine):
+        counter = QueryCounter(engine)
+        with counter.budget(QueryBudget(statements=1, transactions=1, checkouts=1)):
+            with engine.begin() as conn:
+                conn.execute(text("SELECT 1"))
+        counter.stop()
+
+    def test_budget_exceeded(self, engine):
+        counter = QueryCounter(engine)
+        with pytest.raises(QueryBudgetExceeded) as info:
+            with counter.budget(route="GET /items/{id}", statements=1, checkouts=1):
+                for _ in range(2):
+                    with engine.begin() as conn:
+                        conn.execute(text("SELECT 1"))
+        counter.stop()
+
+        message = str(info.value)
+        assert message.startswith("GET /items/{id} exceeded its query budget")
+        assert "statements: 2 > 1" in message
+        assert "checkouts: 2 > 1" in message
+        assert "transactions" not in message.splitlines()[0]
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+@pytest.mark.parametrize("count_strategy", get_args(CountStrategyName))
+async def test_list_budgets(count_strategy):
+    # Each query of the engine storage takes a transaction of its own.
+    pg_engine = MagicMock()
+    conn = MagicMock()
+    conn.execute = AsyncMock(
+        return_value=MagicMock(
+            fetchall=MagicMock(return_value=[(1, "a", 1)]),
+            fetchone=MagicMock(return_value=(1,)),
+        )
+    )
+    pg_engine.begin.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pg_engine.begin.return_value.__aexit__ = AsyncMock(return_value=None)
+    config = Config(
+        name="items",
+        api_tags=[],
+        fields=[
+            ConfigField(name="id", type=int, location="path"),
+            ConfigField(name="name", type=str),
+        ],
+    )
+    storage = PostgresEngineStorage(
+        pg_engine,
+        PostgresEngineStorageManager(MagicMock(), MetaData()).build_table(config),
+        count_strategy=build_count_strategy(count_strategy),
+    )
+
+    await storage.list(create_model("Filter")(), PaginationEntity(), Item)
+
+    budget = engine_budgets(count_strategy)["list"]
+    assert conn.execute.await_count <= budget.statements
+    assert pg_engine.begin.call_count <= budget.transactions
+    if count_strategy in ("window", "none"):
+        assert budget.statements == conn.execute.await_count == 1